@@ -7,6 +7,8 @@ import json
 import os
 from pathlib import Path
 
+from pairs_io import find_pairs_file, iter_pairs
+
 def analyze_results():
     """Analyze GA optimization results"""
     
@@ -63,13 +65,10 @@ def analyze_results():
                     tmt_before += -dt
         
         # Calculate TMT after optimization using optimized pairs
-        optimized_pairs_file = processed_dir / f"automation_results_{scenario_id}_optimized_20251008_114243.json"
+        optimized_pairs_file = find_pairs_file(processed_dir, f"automation_results_{scenario_id}_optimized_20251008_114243")
         tmt_after = 0.0
-        if optimized_pairs_file.exists():
-            with open(optimized_pairs_file, 'r', encoding='utf-8') as f:
-                opt_pairs = json.load(f)
-            
-            for pair in opt_pairs:
+        if optimized_pairs_file is not None:
+            for pair in iter_pairs(optimized_pairs_file):
                 main_time = pair.get('main_relay', {}).get('Time_out', 0)
                 backup_time = pair.get('backup_relay', {}).get('Time_out', 0)
                 if main_time > 0 and backup_time > 0:
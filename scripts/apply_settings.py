@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Bulk application of optimized relay settings to pair records
+Pair records are compiled once into columnar arrays (relay keys and
+short-circuit currents per side); optimized settings are then gathered onto
+every pair side and all Time_out values are computed in one vectorized curve
+evaluation. Output records are new dicts, the input records are not modified
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from relay_curves import CURVE_NAMES, CURVE_INDEX, DEFAULT_CURVE, CURVE_A, CURVE_B, CURVE_P
+
+SHC_FIELDS = ("Ishc", "I_shc", "Isc", "fault_current")
+SIDES = ("main_relay", "backup_relay")
+
+def numeric_field(dct: Dict, names: Tuple[str, ...] = SHC_FIELDS) -> float:
+    """First numeric value among the candidate keys (NaN when there is none)"""
+    for n in names:
+        if n in dct:
+            try:
+                return float(dct[n])
+            except (ValueError, TypeError):
+                pass
+    return float("nan")
+
+def pair_columns(pairs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Columnar view of pair records
+
+    ``relay_code`` and ``Ishc`` have shape (2, n_pairs), main side first;
+    codes index ``keys``, the distinct (scenario_id, relay) of the records.
+    """
+    codes: Dict[Tuple[Any, Any], int] = {}
+    relay_code = []
+    ishc = []
+    for side in SIDES:
+        side_codes = []
+        side_ishc = []
+        for pair in pairs:
+            info = pair.get(side) or {}
+            side_codes.append(codes.setdefault((pair.get("scenario_id"), info.get("relay")), len(codes)))
+            side_ishc.append(numeric_field(info))
+        relay_code.append(side_codes)
+        ishc.append(side_ishc)
+    return {
+        'n_pairs': len(pairs),
+        'keys': list(codes),
+        'relay_code': np.array(relay_code, dtype=np.intp).reshape(2, len(pairs)),
+        'Ishc': np.array(ishc, dtype=np.float64).reshape(2, len(pairs))
+    }
+
+def settings_columns(columns: Dict[str, Any], settings: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, np.ndarray]:
+    """Pickup, TDS and curve index per relay key from {scenario_id: {relay: {"TDS", "pickup", "curve"?}}}"""
+    default_curve = CURVE_INDEX[DEFAULT_CURVE]
+    values = [settings.get(sid, {}).get(relay) for sid, relay in columns['keys']]
+    has = np.array([v is not None for v in values], dtype=bool)
+    pu = np.array([v["pickup"] if v is not None else np.nan for v in values], dtype=np.float64)
+    tds = np.array([v["TDS"] if v is not None else np.nan for v in values], dtype=np.float64)
+    curve = np.array([CURVE_INDEX[v.get("curve", DEFAULT_CURVE)] if v is not None else default_curve
+                      for v in values], dtype=np.intp)
+    return {'has_setting': has, 'pick_up': pu, 'TDS': tds, 'curve': curve}
+
+def curve_times(I: np.ndarray, PU: np.ndarray, TDS: np.ndarray, curve: np.ndarray) -> np.ndarray:
+    """Vectorized ``time_iec`` over per-element registry curves
+
+    Same results as the scalar path: inf at or below pickup, NaN where the
+    time is undefined (zero pickup, overflow).
+    """
+    A, B, p = CURVE_A[curve], CURVE_B[curve], CURVE_P[curve]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        Mp = (I / PU) ** p
+        denom = Mp - 1.0
+        t = (A * TDS) / denom + B * TDS
+    t = np.where(denom <= 0, np.inf, t)
+    return np.where((PU == 0) | ~np.isfinite(Mp), np.nan, t)
+
+def apply_settings(columns: Dict[str, Any], settings: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, np.ndarray]:
+    """Settings gathered onto every pair side, with all Time_out values in one curve evaluation
+
+    Every array has shape (2, n_pairs). ``has_time`` marks the sides whose
+    Time_out is recomputed (a setting and a nonzero short-circuit current).
+    """
+    by_key = settings_columns(columns, settings)
+    code = columns['relay_code']
+    applied = {name: values[code] for name, values in by_key.items()}
+    I = columns['Ishc']
+    applied['Time_out'] = curve_times(I, applied['pick_up'], applied['TDS'], applied['curve'])
+    applied['has_time'] = applied['has_setting'] & ~np.isnan(I) & (I != 0)
+    return applied
+
+def updated_records(pairs: List[Dict[str, Any]], applied: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """New pair records carrying the applied settings (non-default curves are written as ``curve``)"""
+    has, has_time = applied['has_setting'].tolist(), applied['has_time'].tolist()
+    pu, tds, time_out = applied['pick_up'].tolist(), applied['TDS'].tolist(), applied['Time_out'].tolist()
+    curve = applied['curve'].tolist()
+    default_curve = CURVE_INDEX[DEFAULT_CURVE]
+
+    records = []
+    for i, pair in enumerate(pairs):
+        record = dict(pair)
+        for s, side in enumerate(SIDES):
+            if not has[s][i]:
+                continue
+            relay = dict(pair.get(side) or {})
+            relay["pick_up"] = pu[s][i]
+            relay["TDS"] = tds[s][i]
+            if curve[s][i] != default_curve:
+                relay["curve"] = CURVE_NAMES[curve[s][i]]
+            if has_time[s][i]:
+                relay["Time_out"] = time_out[s][i]
+            record[side] = relay
+        records.append(record)
+    return records
+
+def apply_optimized_settings(pairs: List[Dict[str, Any]],
+                             settings: Dict[str, Dict[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """New pair records with optimized settings applied ({scenario_id: relay_values})"""
+    return updated_records(pairs, apply_settings(pair_columns(pairs), settings))
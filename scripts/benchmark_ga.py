@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+GA benchmark harness
+Runs the GA engines (reference, float32 compact, JIT kernels, discrete steps,
+NSGA-II) over fixed seeds on the real scenarios and on a synthetic sweep of
+relay and pair counts. Measures evaluations/s, generations and wall time to
+TMT thresholds, the final TMT distribution and each engine's peak allocation,
+emits scaling curves, writes a versioned JSON result and compares two results,
+flagging regressions beyond a tolerance. Every engine records the backend that
+actually ran; "jit" is skipped without Numba (it would run the reference GA)
+
+Usage:
+    python benchmark_ga.py [scenario_limit] [engine,engine,...]
+    python benchmark_ga.py compare <baseline.json> <current.json> [tolerance]
+"""
+
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, run_genetic_algorithm,
+    GA_Ni, GA_maxGen, GA_iterno, GA_CROSSOVER, GA_MUTATION
+)
+from benchmark_sparse import synthetic_network
+from compact_storage import peak_memory
+
+BENCHMARK_SCHEMA_VERSION = 3
+BENCHMARK_ENGINES = ["reference", "compact", "jit", "discrete", "nsga2"]
+BENCHMARK_SEEDS = [1, 2, 3]
+BENCHMARK_SCENARIOS = 5            # First valid scenarios benchmarked by default
+TMT_THRESHOLDS = [50.0, 20.0, 10.0, 5.0]
+REGRESSION_TOLERANCE = 0.10        # Relative change that counts as a regression
+
+# Synthetic scaling sweep (meshed networks from synthetic_scenarios)
+SWEEP_RELAYS = [20, 40, 80, 160]
+SWEEP_PAIRS_PER_RELAY = [1, 2, 4]
+SWEEP_SEEDS = [1, 2]
+SWEEP_MAXGEN = 200
+
+# Summary metrics and whether higher values are better
+METRIC_DIRECTIONS = {
+    'evals_per_sec': True,
+    'mean_final_tmt': False,
+    'median_final_tmt': False,
+    'worst_final_tmt': False,
+    'peak_alloc_mb': False
+}
+
+def engine_backend(engine: str) -> str:
+    """Implementation an engine actually runs on here ("jit" falls back to the reference GA without Numba)"""
+    if engine == "jit":
+        from ga_jit import NUMBA_AVAILABLE
+        fixed = GA_CROSSOVER == "single_point" and GA_MUTATION == "uniform"
+        return "numba" if NUMBA_AVAILABLE and fixed else "reference"
+    return {'reference': "python", 'compact': "numpy-float32", 'discrete': "python", 'nsga2': "numpy"}[engine]
+
+def git_revision(paths: Dict) -> Optional[str]:
+    """Current commit of the project, if it is a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=paths['project_root'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def threshold_hits(history: List[tuple], thresholds: List[float]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Generation and wall time at which the best TMT first reached each threshold"""
+    hits = {}
+    for threshold in thresholds:
+        hit = next(((gen, seconds) for gen, tmt, seconds in history if tmt <= threshold), None)
+        hits[str(threshold)] = {
+            'generation': hit[0] if hit else None,
+            'seconds': hit[1] if hit else None
+        }
+    return hits
+
+def run_engine(engine: str, scenario_id: str, scenario_data: Dict, max_generations: int = GA_maxGen) -> Dict[str, Any]:
+    """One run of a GA engine as a state with best_tmt, generations, evaluations, elapsed and history"""
+    if engine == "reference":
+        return run_genetic_algorithm(scenario_id, scenario_data, max_generations=max_generations)
+    if engine == "compact":
+        from compact_storage import compact_genetic_algorithm
+        return compact_genetic_algorithm(scenario_id, scenario_data, max_generations=max_generations)
+    if engine == "jit":
+        from ga_jit import jit_genetic_algorithm
+        return jit_genetic_algorithm(scenario_id, scenario_data, max_generations=max_generations)
+    if engine == "discrete":
+        from discrete_settings import discrete_optimization
+        return discrete_optimization(scenario_id, scenario_data, max_generations=max_generations)
+    if engine == "nsga2":
+        from nsga2_optimization import nsga2_optimization, NSGA_POP
+        start = time.perf_counter()
+        state = nsga2_optimization(scenario_id, scenario_data, generations=max_generations)
+        if not state:
+            return {}
+        seconds = time.perf_counter() - start
+        best_tmt = float(state['objectives'][0, 0])
+        # No per-generation history: thresholds are only checked on the final front
+        return {'best_tmt': best_tmt, 'generations': max_generations, 'elapsed': seconds,
+                'evaluations': NSGA_POP * (max_generations + 1), 'history': [(max_generations, best_tmt, seconds)]}
+    raise ValueError(f"Unknown engine '{engine}', expected one of {BENCHMARK_ENGINES}")
+
+def benchmark_run(scenario_id: str, scenario_data: Dict, seed: int, engine: str = "reference",
+                  thresholds: List[float] = TMT_THRESHOLDS, max_generations: int = GA_maxGen) -> Dict[str, Any]:
+    """One seeded engine run with its throughput and threshold metrics"""
+    random.seed(seed)
+    state = run_engine(engine, scenario_id, scenario_data, max_generations)
+    return {
+        'scenario_id': scenario_id,
+        'engine': engine,
+        'seed': seed,
+        'final_tmt': state['best_tmt'],
+        'generations': state['generations'],
+        'evaluations': state['evaluations'],
+        'seconds': state['elapsed'],
+        'evals_per_sec': state['evaluations'] / state['elapsed'] if state['elapsed'] > 0 else None,
+        'thresholds': threshold_hits(state['history'], thresholds)
+    }
+
+def summarize(runs: List[Dict[str, Any]], peaks: List[int]) -> Dict[str, Any]:
+    """Aggregate metrics over the runs of one engine (``peaks``: bytes allocated by its memory runs)"""
+    final = [r['final_tmt'] for r in runs]
+    total_evals = sum(r['evaluations'] for r in runs)
+    total_seconds = sum(r['seconds'] for r in runs)
+    summary = {
+        'runs': len(runs),
+        'evals_per_sec': total_evals / total_seconds if total_seconds > 0 else None,
+        'mean_final_tmt': statistics.fmean(final),
+        'median_final_tmt': statistics.median(final),
+        'worst_final_tmt': max(final),
+        'best_final_tmt': min(final),
+        'stdev_final_tmt': statistics.stdev(final) if len(final) > 1 else 0.0,
+        'peak_alloc_mb': max(peaks) / (1024.0 * 1024.0) if peaks else None,
+        'thresholds': {}
+    }
+    for threshold in TMT_THRESHOLDS:
+        hits = [r['thresholds'][str(threshold)] for r in runs]
+        reached = [h for h in hits if h['generation'] is not None]
+        summary['thresholds'][str(threshold)] = {
+            'hit_rate': len(reached) / len(runs),
+            'mean_generations': statistics.fmean(h['generation'] for h in reached) if reached else None,
+            'mean_seconds': statistics.fmean(h['seconds'] for h in reached) if reached else None
+        }
+    return summary
+
+def scaling_sweep(engines: List[str], relay_counts: List[int] = SWEEP_RELAYS,
+                  pairs_per_relay: List[int] = SWEEP_PAIRS_PER_RELAY, seeds: List[int] = SWEEP_SEEDS,
+                  max_generations: int = SWEEP_MAXGEN) -> Dict[str, List[Dict[str, Any]]]:
+    """Scaling curves: per engine one point per synthetic network size"""
+    curves: Dict[str, List[Dict[str, Any]]] = {engine: [] for engine in engines}
+    for n_relays in relay_counts:
+        for ppr in pairs_per_relay:
+            data = synthetic_network(n_relays, ppr)
+            for engine in engines:
+                print(f"📐 {engine}: {len(data['relays'])} relays, {len(data['pairs'])} pairs")
+                runs = [benchmark_run(f"synthetic_{n_relays}x{ppr}", data, seed, engine, max_generations=max_generations)
+                        for seed in seeds]
+                seconds = sum(r['seconds'] for r in runs)
+                curves[engine].append({
+                    'n_relays': len(data['relays']),
+                    'n_pairs': len(data['pairs']),
+                    'pairs_per_relay': ppr,
+                    'evals_per_sec': sum(r['evaluations'] for r in runs) / seconds if seconds > 0 else None,
+                    'seconds_per_generation': seconds / sum(r['generations'] for r in runs),
+                    'mean_final_tmt': statistics.fmean(r['final_tmt'] for r in runs)
+                })
+    return curves
+
+def plot_scaling(curves: Dict[str, List[Dict[str, Any]]], output_file: Path) -> Optional[Path]:
+    """Time per generation and evaluations/s against pair count, one line per engine"""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("   ⚠️  matplotlib not installed, scaling plot skipped")
+        return None
+
+    fig, axes = plt.subplots(1, 2, figsize=(12, 4.5))
+    for engine, points in curves.items():
+        points = sorted(points, key=lambda p: p['n_pairs'])
+        n_pairs = [p['n_pairs'] for p in points]
+        axes[0].plot(n_pairs, [p['seconds_per_generation'] * 1e3 for p in points], marker="o", label=engine)
+        axes[1].plot(n_pairs, [p['evals_per_sec'] for p in points], marker="o", label=engine)
+    axes[0].set_ylabel("ms per generation")
+    axes[0].set_yscale("log")
+    axes[1].set_ylabel("Evaluations/s")
+    for ax in axes:
+        ax.set_xlabel("Relay pairs")
+        ax.set_xscale("log")
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+    fig.suptitle("GA engine scaling on synthetic meshed networks")
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=150)
+    plt.close(fig)
+    return output_file
+
+def run_benchmark(scenario_limit: Optional[int] = BENCHMARK_SCENARIOS, seeds: List[int] = BENCHMARK_SEEDS,
+                  engines: List[str] = BENCHMARK_ENGINES, sweep: bool = True) -> Path:
+    """Benchmark the engines on the first valid scenarios (and the synthetic sweep) and write the result file"""
+    unknown = [e for e in engines if e not in BENCHMARK_ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown engine(s) {unknown}, expected {BENCHMARK_ENGINES}")
+    backends = {engine: engine_backend(engine) for engine in engines}
+    if backends.get("jit") == "reference":
+        print("   ⚠️  Numba not available (or non-fixed operators): 'jit' would run the reference GA, skipped")
+        engines = [e for e in engines if e != "jit"]
+        del backends["jit"]
+    paths = setup_paths()
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = [
+        sid for sid in sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+        if validate_scenario_data(scenario_map[sid])[0]
+    ][:scenario_limit]
+
+    runs = []
+    peaks: Dict[str, List[int]] = {}
+    for engine in engines:
+        for sid in scenario_ids:
+            for seed in seeds:
+                print(f"🎯 {sid} ({engine}, seed {seed})")
+                runs.append(benchmark_run(sid, scenario_map[sid], seed, engine))
+        # Peak allocation per engine from separate runs (tracemalloc would distort the timed ones)
+        for sid in scenario_ids:
+            random.seed(seeds[0])
+            peaks.setdefault(engine, []).append(peak_memory(run_engine, engine, sid, scenario_map[sid])[1])
+    summary = {engine: summarize([r for r in runs if r['engine'] == engine], peaks[engine]) for engine in engines}
+    curves = scaling_sweep(engines) if sweep else {}
+
+    print(f"\n{'='*60}")
+    print("🏁 GA BENCHMARK")
+    for engine, stats in summary.items():
+        print(f"   • {engine:10s} [{backends[engine]}] {stats['evals_per_sec']:9.0f} evaluations/s  final TMT mean "
+              f"{stats['mean_final_tmt']:.3f}, median {stats['median_final_tmt']:.3f}, worst {stats['worst_final_tmt']:.3f}, "
+              f"peak {stats['peak_alloc_mb']:.2f} MB")
+    for engine, points in curves.items():
+        print(f"   📐 {engine}: " + ", ".join(f"{p['n_pairs']} pairs {p['seconds_per_generation'] * 1e3:.2f} ms/gen"
+                                           for p in sorted(points, key=lambda p: p['n_pairs'])))
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['tables'] / f"ga_benchmark_{timestamp}.json"
+    plot_file = plot_scaling(curves, paths['figures'] / f"ga_scaling_{timestamp}.png") if curves else None
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'schema_version': BENCHMARK_SCHEMA_VERSION,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(paths),
+            'python': sys.version.split()[0],
+            'ga_params': {'population': GA_Ni, 'max_generations': GA_maxGen, 'stall_generations': GA_iterno},
+            'engines': engines,
+            'backends': backends,
+            'numba_available': engine_backend("jit") == "numba",
+            'scenarios': scenario_ids,
+            'seeds': seeds,
+            'tmt_thresholds': TMT_THRESHOLDS,
+            'summary': summary,
+            'scaling': {
+                'relay_counts': SWEEP_RELAYS,
+                'pairs_per_relay': SWEEP_PAIRS_PER_RELAY,
+                'seeds': SWEEP_SEEDS,
+                'max_generations': SWEEP_MAXGEN,
+                'curves': curves,
+                'plot': str(plot_file) if plot_file else None
+            },
+            'runs': runs
+        }, f, indent=2, ensure_ascii=False)
+    print(f"   📄 Benchmark results: {output_file}")
+    if plot_file:
+        print(f"   📈 Scaling curves: {plot_file}")
+    return output_file
+
+def compare_benchmarks(baseline_file: Path, current_file: Path,
+                       tolerance: float = REGRESSION_TOLERANCE) -> List[Dict[str, Any]]:
+    """Regressions of the current result against the baseline beyond the relative tolerance"""
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(current_file, "r", encoding="utf-8") as f:
+        current = json.load(f)
+    if baseline.get('schema_version') != current.get('schema_version'):
+        raise ValueError(f"Schema version mismatch: {baseline.get('schema_version')} vs {current.get('schema_version')}")
+
+    # (name, baseline value, current value, higher is better), per engine present in both results
+    metrics = []
+    for engine in [e for e in baseline['summary'] if e in current['summary']]:
+        old_backend, new_backend = baseline['backends'].get(engine), current['backends'].get(engine)
+        if old_backend != new_backend:
+            print(f"   ⚠️  {engine}: backend {old_backend} vs {new_backend}, not compared")
+            continue
+        old_summary, new_summary = baseline['summary'][engine], current['summary'][engine]
+        metrics += [(f"{engine}.{name}", old_summary.get(name), new_summary.get(name), higher)
+                    for name, higher in METRIC_DIRECTIONS.items()]
+        for threshold in baseline['tmt_thresholds']:
+            key = str(threshold)
+            old = old_summary['thresholds'].get(key, {})
+            new = new_summary['thresholds'].get(key, {})
+            metrics.append((f"{engine}.hit_rate@{key}", old.get('hit_rate'), new.get('hit_rate'), True))
+            metrics.append((f"{engine}.seconds_to@{key}", old.get('mean_seconds'), new.get('mean_seconds'), False))
+
+    regressions = []
+    for name, old, new, higher_is_better in metrics:
+        if old is None or new is None:
+            continue
+        change = (new - old) / abs(old) if old else (0.0 if new == old else float("inf"))
+        worse = -change if higher_is_better else change
+        status = "❌" if worse > tolerance else "✅"
+        print(f"   {status} {name:32s} {old:12.4f} → {new:12.4f} ({change * 100:+.1f}%)")
+        if worse > tolerance:
+            regressions.append({'metric': name, 'baseline': old, 'current': new, 'relative_change': change})
+
+    print(f"   {'⚠️  ' + str(len(regressions)) + ' regression(s)' if regressions else '✅ No regressions'} "
+          f"(tolerance {tolerance * 100:.0f}%)")
+    return regressions
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "compare":
+        if len(args) < 3:
+            print(__doc__.split("Usage:")[1].rstrip())
+            sys.exit(2)
+        tol = float(args[3]) if len(args) > 3 else REGRESSION_TOLERANCE
+        sys.exit(1 if compare_benchmarks(Path(args[1]), Path(args[2]), tol) else 0)
+    if args and not args[0].isdigit():
+        print(__doc__.split("Usage:")[1].rstrip())
+        sys.exit(2)
+    run_benchmark(int(args[0]) if args else BENCHMARK_SCENARIOS,
+                  engines=args[1].split(",") if len(args) > 1 else BENCHMARK_ENGINES)
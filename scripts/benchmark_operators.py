@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark of GA variation operators
+Compares the fixed Chu & Beasley operators (single-point crossover, uniform
+mutation) with SBX / blend crossover, Gaussian / polynomial mutation and
+adaptive operator selection by time-to-target on every valid scenario
+"""
+
+import json
+import random
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, run_genetic_algorithm
+)
+from benchmark_initialization import generations_to_target, BENCHMARK_SEEDS, BENCHMARK_MAXGEN
+
+# name -> (crossover, mutation); "fixed" is the reference configuration
+OPERATOR_CONFIGS = {
+    "fixed": ("single_point", "uniform"),
+    "sbx_polynomial": ("sbx", "polynomial"),
+    "blend_gaussian": ("blend", "gaussian"),
+    "adaptive": ("adaptive", "adaptive")
+}
+
+def seconds_to_target(history: List[Tuple[int, float, float]], target: float) -> Optional[float]:
+    """Wall time (s) until the best TMT is at or below the target"""
+    for _, tmt, seconds in history:
+        if tmt <= target:
+            return float(seconds)
+    return None
+
+def mean(values: List[Optional[float]]) -> Optional[float]:
+    """Mean of the values that are not None"""
+    hits = [v for v in values if v is not None]
+    return (sum(hits) / len(hits)) if hits else None
+
+def benchmark_scenario(scenario_id: str, scenario_data: Dict, configs: Dict[str, Tuple[str, str]] = OPERATOR_CONFIGS,
+                       seeds: List[int] = BENCHMARK_SEEDS, max_generations: int = BENCHMARK_MAXGEN) -> Dict[str, Any]:
+    """Run every operator configuration and seed on one scenario
+
+    The target TMT is the worst final TMT of the fixed-operator runs.
+    """
+    runs = {}
+    for name, (crossover, mutation) in configs.items():
+        runs[name] = []
+        for seed in seeds:
+            random.seed(seed)
+            state = run_genetic_algorithm(scenario_id, scenario_data, max_generations=max_generations,
+                                          stall_generations=max_generations,
+                                          crossover=crossover, mutation=mutation)
+            runs[name].append({
+                'seed': seed,
+                'final_tmt': state['best_tmt'],
+                'history': state['history'],
+                'operator_stats': state['operator_stats']
+            })
+
+    reference = runs.get("fixed") or next(iter(runs.values()))
+    target = max(r['final_tmt'] for r in reference)
+
+    summary = {'target_tmt': target, 'configs': {}}
+    for name, config_runs in runs.items():
+        generations = [generations_to_target(r['history'], target) for r in config_runs]
+        seconds = [seconds_to_target(r['history'], target) for r in config_runs]
+        summary['configs'][name] = {
+            'mean_final_tmt': sum(r['final_tmt'] for r in config_runs) / len(config_runs),
+            'generations_to_target': generations,
+            'seconds_to_target': seconds,
+            'mean_generations_to_target': mean(generations),
+            'mean_seconds_to_target': mean(seconds),
+            'target_hit_rate': sum(g is not None for g in generations) / len(config_runs),
+            'operator_stats': [r['operator_stats'] for r in config_runs]
+        }
+    return summary
+
+def main(scenario_limit: Optional[int] = None):
+    """Benchmark the operator configurations on the scenarios of the input file"""
+    paths = setup_paths()
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = [
+        sid for sid in sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+        if validate_scenario_data(scenario_map[sid])[0]
+    ][:scenario_limit]
+
+    results = {}
+    for sid in scenario_ids:
+        print(f"🎯 {sid}")
+        results[sid] = benchmark_scenario(sid, scenario_map[sid])
+
+    print(f"\n{'='*60}")
+    print("🏁 OPERATOR BENCHMARK")
+    for name in OPERATOR_CONFIGS:
+        stats = [r['configs'][name] for r in results.values()]
+        hit_rate = sum(s['target_hit_rate'] for s in stats) / len(stats)
+        final_tmt = sum(s['mean_final_tmt'] for s in stats) / len(stats)
+        secs = mean([s['mean_seconds_to_target'] for s in stats])
+        print(f"   • {name:15s} final TMT {final_tmt:9.3f}  target hit rate {hit_rate * 100:5.1f}%  "
+              f"time to target {f'{secs:.2f}s' if secs is not None else 'n/a'}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['tables'] / f"ga_operator_benchmark_{timestamp}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'configs': {name: {'crossover': c, 'mutation': m} for name, (c, m) in OPERATOR_CONFIGS.items()},
+            'seeds': BENCHMARK_SEEDS,
+            'max_generations': BENCHMARK_MAXGEN,
+            'scenarios': results
+        }, f, indent=2, ensure_ascii=False)
+    print(f"   📄 Benchmark results: {output_file}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark of sparse incidence kernels on large synthetic networks
+Compares index gathers with CSR incidence gathers for per-pair times, and
+bincount with the transposed CSR product for relay-level penalty aggregation
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Callable
+
+import numpy as np
+
+from ga_optimization_fast import setup_paths, group_data_by_scenario, MIN_TDS, MAX_TDS
+from relay_kernels import compile_scenario, pair_times, pair_penalties, relay_penalties
+from synthetic_scenarios import generate_scenarios
+
+BENCHMARK_RELAYS = [1000, 10000]
+PAIRS_PER_RELAY = 3
+BATCH_SIZE = 80
+REPEATS = 5
+SEED = 42
+
+def synthetic_network(n_relays: int, pairs_per_relay: int = PAIRS_PER_RELAY, seed: int = SEED) -> Dict[str, Any]:
+    """Grouped single scenario of a synthetic meshed network with about n_relays relays"""
+    records = generate_scenarios(1, n_relays, "meshed", pairs_per_relay, seed=seed)
+    return group_data_by_scenario(records)["scenario_1"]
+
+def best_time(func: Callable[[], Any], repeats: int = REPEATS) -> float:
+    """Best wall time of several calls (s)"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def benchmark_network(n_relays: int) -> Dict[str, Any]:
+    """Time index vs sparse gathers and bincount vs CSR aggregation on one synthetic network"""
+    data = synthetic_network(n_relays)
+    index = compile_scenario(data)
+    csr = compile_scenario(data, gather="sparse")
+    n_relays = index['n_relays']
+    rng = np.random.default_rng(SEED)
+    tds = rng.uniform(MIN_TDS, MAX_TDS, size=(BATCH_SIZE, n_relays))
+    pu = rng.uniform(0.05, 0.5, size=(BATCH_SIZE, n_relays))
+    batch = np.concatenate([tds, pu], axis=1)
+
+    # Both gathers must give identical times
+    assert np.array_equal(pair_times(tds, pu, index)[0], pair_times(tds, pu, csr)[0])
+
+    def bincount_aggregation():
+        penalties = pair_penalties(tds, pu, index)
+        offsets = (np.arange(BATCH_SIZE)[:, None] * n_relays + index['main_idx'][None, :]).ravel()
+        return np.bincount(offsets, weights=penalties.ravel(), minlength=BATCH_SIZE * n_relays)
+
+    results = {
+        'relays': n_relays,
+        'pairs': len(data['pairs']),
+        'batch_size': BATCH_SIZE,
+        'seconds': {
+            'pair_times_index_single': best_time(lambda: pair_times(tds[0], pu[0], index)),
+            'pair_times_sparse_single': best_time(lambda: pair_times(tds[0], pu[0], csr)),
+            'pair_times_index_batch': best_time(lambda: pair_times(tds, pu, index)),
+            'pair_times_sparse_batch': best_time(lambda: pair_times(tds, pu, csr)),
+            'relay_penalties_bincount_batch': best_time(bincount_aggregation),
+            'relay_penalties_sparse_batch': best_time(lambda: relay_penalties(batch, csr))
+        }
+    }
+    as_main, _ = relay_penalties(batch, csr)
+    assert np.allclose(as_main.ravel(), bincount_aggregation())
+    return results
+
+def main(sizes: List[int] = BENCHMARK_RELAYS):
+    """Run the sparse-kernel benchmark on synthetic networks of the given relay counts"""
+    paths = setup_paths()
+    results = []
+    for n in sizes:
+        result = benchmark_network(n)
+        print(f"🎯 Synthetic network: {result['relays']} relays, {result['pairs']} pairs")
+        for name, seconds in result['seconds'].items():
+            print(f"   • {name:32s} {seconds * 1e3:9.3f} ms")
+        results.append(result)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['tables'] / f"sparse_kernel_benchmark_{timestamp}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'pairs_per_relay': PAIRS_PER_RELAY,
+            'repeats': REPEATS,
+            'networks': results
+        }, f, indent=2, ensure_ascii=False)
+    print(f"   📄 Benchmark results: {output_file}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,14 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+from relay_curves import DEFAULT_CURVE, curve_time
+from run_manifest import resolve_artifact
+
 def calculate_tmt_from_optimized_settings(scenario_id, optimized_relays, raw_pairs_data):
     """Calculate TMT using optimized relay settings"""
     
     # Constants
     CTI = 0.20
-    K = 0.14
-    N = 0.02
     
     total_tmt = 0
     
@@ -29,20 +30,22 @@ def calculate_tmt_from_optimized_settings(scenario_id, optimized_relays, raw_pai
         main_pickup = optimized_relays.get(main_relay_id, {}).get('pickup', 0.1)
         backup_tds = optimized_relays.get(backup_relay_id, {}).get('TDS', 0.05)
         backup_pickup = optimized_relays.get(backup_relay_id, {}).get('pickup', 0.1)
+        main_curve = optimized_relays.get(main_relay_id, {}).get('curve', DEFAULT_CURVE)
+        backup_curve = optimized_relays.get(backup_relay_id, {}).get('curve', DEFAULT_CURVE)
         
         # Get fault current (using Ishc from main relay)
         fault_current = pair['main_relay']['Ishc']
         
-        # Calculate operating times using IEC standard formula
-        # T = K * TDS / ((I/Ipickup)^N - 1)
+        # Calculate operating times with each relay's curve (IEC standard inverse by default)
+        # T = TDS * (A / ((I/Ipickup)^p - 1) + B)
         
         if fault_current > main_pickup:
-            main_time = K * main_tds / ((fault_current / main_pickup) ** N - 1)
+            main_time = curve_time(fault_current, main_pickup, main_tds, main_curve)
         else:
             main_time = 10.0  # Maximum time
         
         if fault_current > backup_pickup:
-            backup_time = K * backup_tds / ((fault_current / backup_pickup) ** N - 1)
+            backup_time = curve_time(fault_current, backup_pickup, backup_tds, backup_curve)
         else:
             backup_time = 10.0  # Maximum time
         
@@ -80,9 +83,11 @@ def create_correct_tmt_comparison():
     
     print(f"📂 Raw pairs data loaded: {len(raw_pairs_data)} pairs")
     
-    # Load latest GA optimization results
-    ga_files = list(processed_dir.glob("ga_optimization_all_scenarios_comprehensive_*.json"))
-    latest_ga_file = max(ga_files, key=lambda x: x.stat().st_mtime)
+    # Load latest GA optimization results (from the run manifest, newest file for pre-manifest outputs)
+    latest_ga_file = resolve_artifact(processed_dir, 'comprehensive_results',
+                                      fallback_glob="ga_optimization_all_scenarios_comprehensive_*.json")
+    if latest_ga_file is None:
+        raise FileNotFoundError(f"No GA optimization results found in {processed_dir}")
     print(f"📂 Loading GA results from: {latest_ga_file.name}")
     
     with open(latest_ga_file, 'r') as f:
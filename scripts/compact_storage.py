@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Compact float32 storage for GA populations and relay pairs
+The GA evolves a contiguous float32 population matrix (fitness in the last
+column) over scenarios compiled to float32 pair arrays, halving memory and
+bandwidth; the final elite is re-scored in float64 so reported TMT keeps
+full precision
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, compute_bounds, scenario_curves,
+    run_genetic_algorithm, GA_Ni, GA_nMut, GA_maxGen, GA_iterno, GA_PROGRESS_EVERY
+)
+from instrumentation import log
+from relay_kernels import compile_scenario, tmt_vec
+
+COMPACT_DTYPE = np.float32
+ELITE_SIZE = 10   # Best individuals re-scored in float64 after a float32 run
+SEED = 42         # random seed of both runs compared in main()
+
+def population_matrix(population: List[List[float]], n_genes: Optional[int] = None,
+                      dtype: Any = COMPACT_DTYPE) -> np.ndarray:
+    """Contiguous (n_individuals, n_genes) gene matrix, dropping any fitness column"""
+    matrix = np.asarray(population, dtype=dtype)
+    if n_genes is not None:
+        matrix = matrix[:, :n_genes]
+    return np.ascontiguousarray(matrix)
+
+def compact_state(ga_state: Dict[str, Any]) -> Dict[str, Any]:
+    """GA state with its population as a float32 matrix (store_state hook of optimize_all_scenarios)"""
+    n_genes = 2 * len(ga_state['relays'])
+    return {**ga_state, 'population': population_matrix(ga_state['population'], n_genes)}
+
+def deep_sizeof(obj: Any) -> int:
+    """Approximate memory of nested lists/dicts/arrays in bytes"""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(v) for v in obj)
+    return size
+
+def compiled_nbytes(compiled: Dict[str, Any]) -> int:
+    """Bytes of the pair arrays of a compiled scenario"""
+    return sum(compiled[k].nbytes for k in ('main_idx', 'backup_idx', 'Ishc_main', 'Ishc_backup'))
+
+def rescore_elite(population: np.ndarray, compiled64: Dict[str, Any],
+                  n_elite: int = ELITE_SIZE) -> Tuple[np.ndarray, float, float]:
+    """Re-score the first n_elite rows in float64
+
+    Returns the best elite individual (float64), its TMT and the largest
+    absolute difference between float32 and float64 TMT over the elite.
+    """
+    elite = population[:n_elite]
+    tmt32 = tmt_vec(elite, {**compiled64, 'Ishc_main': compiled64['Ishc_main'].astype(elite.dtype),
+                            'Ishc_backup': compiled64['Ishc_backup'].astype(elite.dtype)})
+    tmt64 = tmt_vec(elite.astype(np.float64), compiled64)
+    best = int(np.argmin(tmt64))
+    return elite[best].astype(np.float64), float(tmt64[best]), float(np.max(np.abs(tmt64 - tmt32)))
+
+def evolve_matrix(compiled: Dict[str, Any], xmin: List[float], xmax: List[float],
+                  initial_population: Optional[List[List[float]]] = None,
+                  max_generations: int = GA_maxGen, stall_generations: int = GA_iterno,
+                  progress: Optional[Callable[[int, float, float], None]] = None) -> Dict[str, Any]:
+    """Chu & Beasley steady-state GA on one contiguous (GA_Ni, Nv + 1) matrix, fitness in the last column
+
+    Same operators and ``random`` draws as evolve_population's fixed path,
+    but the population lives in the dtype of the compiled pair arrays for the
+    whole run: children are written into a preallocated (2, Nv) buffer,
+    scored as one batch and inserted in sorted position.
+    """
+    start = time.perf_counter()
+    dtype = compiled['Ishc_main'].dtype
+    Nv = len(xmin)
+    X = np.empty((GA_Ni, Nv + 1), dtype=dtype)
+    seeds = list(initial_population or [])[:GA_Ni]
+    for k in range(GA_Ni):
+        if k < len(seeds):
+            X[k, :Nv] = np.clip(np.asarray(seeds[k], dtype=np.float64)[:Nv], xmin, xmax)
+        else:
+            X[k, :Nv] = [xmin[j] + random.random() * (xmax[j] - xmin[j]) for j in range(Nv)]
+    X[:, Nv] = tmt_vec(X[:, :Nv], compiled)
+    X = X[np.argsort(X[:, Nv], kind='stable')]
+
+    children = np.empty((2, Nv), dtype=dtype)
+    best_tmt = float(X[0, Nv])
+    history = [(0, best_tmt, 0.0)]
+    if progress:
+        progress(0, best_tmt, time.perf_counter() - start)
+    stall = 0
+    accepted = 0
+    gen = 0
+    for gen in range(1, max_generations + 1):
+        s1, s2 = random.sample(range(GA_Ni), 2)
+        cp = random.randint(1, Nv - 1)
+        children[0, :cp], children[0, cp:] = X[s1, :cp], X[s2, cp:Nv]
+        children[1, :cp], children[1, cp:] = X[s2, :cp], X[s1, cp:Nv]
+        for child in children:
+            for m in random.sample(range(Nv), GA_nMut):
+                child[m] = xmin[m] + random.random() * (xmax[m] - xmin[m])
+
+        scores = tmt_vec(children, compiled)
+        c = 0 if scores[0] <= scores[1] else 1
+        if scores[c] < X[-1, Nv] and not np.any(np.all(np.abs(X[:, :Nv] - children[c]) < 1e-12, axis=1)):
+            # Insert after equal fitness, dropping the worst individual
+            pos = int(np.searchsorted(X[:, Nv], scores[c], side='right'))
+            X[pos + 1:] = X[pos:-1]
+            X[pos, :Nv] = children[c]
+            X[pos, Nv] = scores[c]
+            accepted += 1
+
+        if X[0, Nv] < best_tmt:
+            best_tmt = float(X[0, Nv])
+            history.append((gen, best_tmt, time.perf_counter() - start))
+            stall = 0
+        else:
+            stall += 1
+        if gen % GA_PROGRESS_EVERY == 0 and progress:
+            progress(gen, best_tmt, time.perf_counter() - start)
+        if best_tmt == 0.0 or stall >= stall_generations:
+            break
+
+    return {
+        'population': X,
+        'best_tmt': best_tmt,
+        'generations': gen,
+        'history': history,
+        'operator_stats': {'single_point': {'uses': gen, 'successes': accepted},
+                           'uniform': {'uses': gen, 'successes': accepted}},
+        'evaluations': GA_Ni + 2 * gen,
+        'elapsed': time.perf_counter() - start
+    }
+
+def compact_genetic_algorithm(scenario_id: str, scenario_data: Dict,
+                              initial_population: Optional[List[List[float]]] = None,
+                              max_generations: int = GA_maxGen,
+                              stall_generations: int = GA_iterno,
+                              progress: Optional[Callable[[int, float, float], None]] = None) -> Dict[str, Any]:
+    """GA on a float32 population matrix and float32 pair arrays, final elite re-scored in float64
+
+    Returns the run_genetic_algorithm state, with the population as a float32
+    gene matrix plus the float32 best TMT and the elite's float32/float64 deviation.
+    """
+    compiled32 = compile_scenario(scenario_data, dtype=COMPACT_DTYPE)
+    relays = compiled32['relays']
+    nR = compiled32['n_relays']
+    if nR == 0:
+        log(f'    ❌ Scenario "{scenario_id}" has no valid relays.', 0)
+        return {}
+
+    xmin, xmax = compute_bounds(relays, scenario_data["pairs"])
+    evolved = evolve_matrix(compiled32, xmin, xmax, initial_population, max_generations, stall_generations, progress)
+    population = np.ascontiguousarray(evolved['population'][:, :2 * nR])
+    best, best_tmt, deviation = rescore_elite(population, compile_scenario(scenario_data, relays))
+    log(f'    🏁 GA (float32) finished. Generations: {evolved["generations"]}  – Best TMT = {best_tmt:.6f}')
+
+    curves = scenario_curves(scenario_data, relays)
+    return {
+        'scenario_id': scenario_id,
+        'relays': relays,
+        'relay_values': {
+            relays[r]: {"TDS": round(float(best[r]), 5), "pickup": round(float(best[nR + r]), 5),
+                        **({"curve": curves[r]} if curves else {})}
+            for r in range(nR)
+        },
+        'best_tmt': best_tmt,
+        'float32_best_tmt': evolved['best_tmt'],
+        'max_tmt_deviation': deviation,
+        'generations': evolved['generations'],
+        'history': evolved['history'],
+        'operator_stats': evolved['operator_stats'],
+        'evaluations': evolved['evaluations'],
+        'elapsed': evolved['elapsed'],
+        'population': population
+    }
+
+def peak_memory(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, int]:
+    """Result of func and the peak bytes it allocated while running (tracemalloc)"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+def main():
+    """Run the compact and reference GAs on every valid scenario and report peak memory and TMT deviation"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+
+    report = {}
+    totals = {'population_list': 0, 'population_float32': 0, 'pair_records': 0,
+              'pairs_float64': 0, 'pairs_float32': 0}
+    peaks = {'reference': 0, 'float32': 0}
+    for sid in scenario_ids:
+        data = scenario_map[sid]
+        if not validate_scenario_data(data)[0]:
+            continue
+        print(f"🎯 {sid}")
+        random.seed(SEED)
+        reference, peak_reference = peak_memory(run_genetic_algorithm, sid, data)
+        random.seed(SEED)
+        state, peak_float32 = peak_memory(compact_genetic_algorithm, sid, data)
+        if not state or not reference:
+            continue
+
+        peaks['reference'] = max(peaks['reference'], peak_reference)
+        peaks['float32'] = max(peaks['float32'], peak_float32)
+        memory = {
+            'peak_reference_run': peak_reference,
+            'peak_float32_run': peak_float32,
+            'population_list': deep_sizeof(reference['population']),
+            'population_float32': state['population'].nbytes,
+            'pair_records': deep_sizeof(data['pairs']),
+            'pairs_float64': compiled_nbytes(compile_scenario(data)),
+            'pairs_float32': compiled_nbytes(compile_scenario(data, dtype=COMPACT_DTYPE))
+        }
+        for k in totals:
+            totals[k] += memory[k]
+        report[sid] = {
+            'best_tmt': state['best_tmt'],
+            'reference_best_tmt': reference['best_tmt'],
+            'float32_best_tmt': state['float32_best_tmt'],
+            'max_tmt_deviation': state['max_tmt_deviation'],
+            'memory_bytes': memory
+        }
+
+    max_deviation = max((r['max_tmt_deviation'] for r in report.values()), default=0.0)
+    print(f"\n{'='*60}")
+    print("🏁 COMPACT STORAGE")
+    print(f"   💾 Peak allocation during a GA run (largest scenario): {peaks['reference'] / 1e6:.2f} MB "
+          f"(reference) → {peaks['float32'] / 1e6:.2f} MB (float32 matrix)")
+    print(f"   💾 Final populations: {totals['population_list'] / 1e6:.2f} MB (lists) → "
+          f"{totals['population_float32'] / 1e6:.2f} MB (float32)")
+    print(f"   💾 Pairs: {totals['pair_records'] / 1e6:.2f} MB (records), {totals['pairs_float64'] / 1e6:.2f} MB "
+          f"(float64 arrays) → {totals['pairs_float32'] / 1e6:.2f} MB (float32 arrays)")
+    print(f"   📏 Max float32 vs float64 elite TMT deviation: {max_deviation:.3e}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = paths['tables'] / f"compact_storage_report_{timestamp}.json"
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'dtype': np.dtype(COMPACT_DTYPE).name,
+            'elite_size': ELITE_SIZE,
+            'seed': SEED,
+            'peak_bytes': peaks,
+            'memory_bytes': totals,
+            'max_tmt_deviation': max_deviation,
+            'scenarios': report
+        }, f, indent=2, ensure_ascii=False)
+    print(f"   📄 Compact storage report: {report_file}")
+    return report
+
+if __name__ == "__main__":
+    main()
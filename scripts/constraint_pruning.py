@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Dominated-constraint pruning for the zero-violation feasibility check
+For a fixed (main, backup) relay pair, operating times fall as fault current
+rises, so a record with larger Ishc_backup and smaller Ishc_main is at least as
+tight as one with the opposite ordering; only the Pareto-tight records decide
+whether a setting is fully coordinated
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Any
+
+import numpy as np
+
+from ga_optimization_fast import setup_paths, group_data_by_scenario
+from relay_kernels import compile_scenario, pair_penalties
+
+def prune_dominated_pairs(pairs: List[Dict]) -> Dict[str, Any]:
+    """Split pair records into Pareto-tight, exact-duplicate and dominated records
+
+    Only valid for feasibility (zero total violation): a dominated record can
+    still contribute to TMT when its dominating record is violated.
+    """
+    groups: Dict[tuple, List[Dict]] = {}
+    for p in pairs:
+        groups.setdefault((p["main_relay"], p["backup_relay"]), []).append(p)
+
+    tight, duplicates, dominated = [], [], []
+    for records in groups.values():
+        # Smallest Ishc_main first, largest Ishc_backup first on ties
+        records = sorted(records, key=lambda p: (p["Ishc_main"], -p["Ishc_backup"]))
+        best_backup = -np.inf
+        last_kept = None
+        for p in records:
+            if last_kept is not None and p["Ishc_main"] == last_kept["Ishc_main"] and p["Ishc_backup"] == last_kept["Ishc_backup"]:
+                duplicates.append(p)
+            elif p["Ishc_backup"] <= best_backup:
+                dominated.append(p)
+            else:
+                tight.append(p)
+                last_kept = p
+                best_backup = p["Ishc_backup"]
+
+    total = len(pairs)
+    return {
+        'tight_pairs': tight,
+        'duplicate_pairs': duplicates,
+        'dominated_pairs': dominated,
+        'total_pairs': total,
+        'reduction_ratio': (1.0 - len(tight) / total) if total else 0.0
+    }
+
+def add_feasibility_constraints(scenario_map: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Preprocessing stage after group_data_by_scenario: attach the tight pair set to each scenario"""
+    for data in scenario_map.values():
+        pruned = prune_dominated_pairs(data["pairs"])
+        data["feasibility_pairs"] = pruned['tight_pairs']
+        data["pruning"] = {
+            'total_pairs': pruned['total_pairs'],
+            'tight_pairs': len(pruned['tight_pairs']),
+            'duplicate_pairs': len(pruned['duplicate_pairs']),
+            'dominated_pairs': len(pruned['dominated_pairs']),
+            'reduction_ratio': pruned['reduction_ratio']
+        }
+    return scenario_map
+
+def compile_feasibility(scenario_data: Dict) -> Dict[str, Any]:
+    """Compiled kernel arrays over the tight pairs only (same relay order as the full scenario)"""
+    tight = scenario_data.get("feasibility_pairs")
+    if tight is None:
+        tight = prune_dominated_pairs(scenario_data["pairs"])['tight_pairs']
+    return compile_scenario({**scenario_data, "pairs": tight})
+
+def is_fully_coordinated(individual: List[float], feasibility: Dict[str, Any]) -> bool:
+    """Fast zero-violation check of [TDS..., pickup...] on the Pareto-tight constraints"""
+    individual = np.asarray(individual, dtype=np.float64)
+    nR = feasibility['n_relays']
+    return not np.any(pair_penalties(individual[:nR], individual[nR:2 * nR], feasibility) > 0.0)
+
+def settings_coordinated(relay_values: Dict[str, Dict], feasibility: Dict[str, Any]) -> bool:
+    """Zero-violation check of optimized relay values ({relay: {"TDS", "pickup"}})"""
+    relays = feasibility['relays']
+    individual = [relay_values[r]["TDS"] for r in relays] + [relay_values[r]["pickup"] for r in relays]
+    return is_fully_coordinated(individual, feasibility)
+
+def main():
+    """Report the constraint reduction for every scenario of the input file"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = add_feasibility_constraints(group_data_by_scenario(raw_data))
+    report = {sid: data["pruning"] for sid, data in scenario_map.items()}
+
+    total = sum(r['total_pairs'] for r in report.values())
+    tight = sum(r['tight_pairs'] for r in report.values())
+    ratio = (1.0 - tight / total) if total else 0.0
+    print(f"   ✂️  Tight constraints: {tight}/{total} (reduction {ratio * 100:.1f}%)")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = paths['tables'] / f"constraint_pruning_{timestamp}.json"
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'total_pairs': total,
+            'tight_pairs': tight,
+            'reduction_ratio': ratio,
+            'scenarios': report
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"   📄 Pruning report: {report_file}")
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+GA optimization with the relay curve as a categorical gene
+Each relay gets TDS, pickup and a curve chosen from the selectable curves of
+the registry; fitness uses the vectorized per-curve kernels
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, compute_bounds,
+    evolve_population, GA_maxGen, GA_iterno
+)
+from relay_curves import CURVE_NAMES, CURVE_INDEX
+from relay_kernels import compile_scenario, pair_penalties
+
+# Curves the optimizer may assign to any relay
+SELECTABLE_CURVES = ["IEC_SI", "IEC_VI", "IEC_EI"]
+
+def curve_selection_optimization(scenario_id: str, scenario_data: Dict,
+                                 selectable_curves: Optional[List[str]] = None,
+                                 initial_population: Optional[List[List[float]]] = None,
+                                 max_generations: int = GA_maxGen,
+                                 stall_generations: int = GA_iterno) -> Dict[str, Any]:
+    """GA over [TDS..., pickup..., curve...] with integer curve genes"""
+    selectable = selectable_curves or SELECTABLE_CURVES
+    selectable_idx = np.array([CURVE_INDEX[c] for c in selectable], dtype=np.intp)
+
+    compiled = compile_scenario(scenario_data)
+    relays = compiled['relays']
+    nR = compiled['n_relays']
+    if nR == 0:
+        print(f'    ❌ Scenario "{scenario_id}" has no valid relays.')
+        return {}
+
+    xmin, xmax = compute_bounds(relays, scenario_data["pairs"])
+    xmin = xmin + [0] * nR
+    xmax = xmax + [len(selectable) - 1] * nR
+    integer_genes = [False] * (2 * nR) + [True] * nR
+
+    def fitness(individual: List[float]) -> float:
+        """TMT with the curves encoded in the individual"""
+        genes = np.asarray(individual, dtype=np.float64)
+        curve_genes = selectable_idx[genes[2 * nR:].astype(np.intp)]
+        return float(pair_penalties(genes[:nR], genes[nR:2 * nR], compiled, curve_genes).sum())
+
+    evolved = evolve_population(fitness, xmin, xmax, initial_population, max_generations, stall_generations,
+                                integer_genes=integer_genes)
+
+    best = evolved['best']
+    return {
+        'scenario_id': scenario_id,
+        'relays': relays,
+        'relay_values': {
+            relays[r]: {
+                "TDS": round(best[r], 5),
+                "pickup": round(best[nR + r], 5),
+                "curve": CURVE_NAMES[selectable_idx[int(best[2 * nR + r])]]
+            }
+            for r in range(nR)
+        },
+        'best_tmt': evolved['best_tmt'],
+        'generations': evolved['generations'],
+        'population': [ind[:3 * nR] for ind in evolved['population']]
+    }
+
+def main():
+    """Optimize every valid scenario choosing each relay's curve"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+
+    results = {}
+    start_time = datetime.now()
+    for sid in scenario_ids:
+        data = scenario_map[sid]
+        if not validate_scenario_data(data)[0]:
+            continue
+        print(f"🎯 {sid} (curve selection: {', '.join(SELECTABLE_CURVES)})")
+        state = curve_selection_optimization(sid, data)
+        if state:
+            results[sid] = {
+                'relay_values': state['relay_values'],
+                'best_tmt': state['best_tmt'],
+                'generations': state['generations']
+            }
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['data_processed'] / f"ga_curve_selection_{timestamp}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'selectable_curves': SELECTABLE_CURVES,
+            'processing_time': (datetime.now() - start_time).total_seconds(),
+            'optimization_results': results
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"   📄 Curve-selection settings: {output_file}")
+    return results
+
+if __name__ == "__main__":
+    main()
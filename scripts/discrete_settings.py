@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Discrete relay setting grids with precomputed operating-time lookup tables
+Physical relays only accept TDS and pickup in fixed steps, so the GA searches
+integer step indices and every relay time is a table gather times a TDS value
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, compute_bounds,
+    evolve_population, CTI, MAX_TIME, MIN_TDS, MAX_TDS, MIN_PICKUP, GA_maxGen, GA_iterno
+)
+from relay_curves import CURVE_A, CURVE_B, CURVE_P
+from relay_kernels import compile_scenario
+
+DEFAULT_TDS_STEP = 0.01
+DEFAULT_PICKUP_STEP = 0.01
+
+# Optional per-relay overrides: {"R1": {"TDS_step": 0.05, "pickup_step": 0.02,
+#                                       "TDS_range": [0.05, 1.0], "pickup_range": [0.1, 2.0]}}
+RELAY_STEPS_FILE = "relay_setting_steps.json"
+
+def setting_grid(low: float, high: float, step: float) -> np.ndarray:
+    """All settings low, low+step, ... not above high (at least one value)"""
+    n = int(np.floor((high - low) / step + 1e-9)) + 1
+    return np.round(low + step * np.arange(max(n, 1)), 10)
+
+def build_setting_grids(relays: List[str], pairs: List[Dict],
+                        relay_steps: Optional[Dict[str, Dict]] = None) -> Dict[str, List[np.ndarray]]:
+    """Per-relay TDS and pickup grids within the GA bounds and each relay's step/range"""
+    relay_steps = relay_steps or {}
+    nR = len(relays)
+    xmin, xmax = compute_bounds(relays, pairs)
+
+    tds_grids = []
+    pickup_grids = []
+    for r, relay in enumerate(relays):
+        cfg = relay_steps.get(relay, {})
+        tds_low, tds_high = cfg.get("TDS_range", (xmin[r], xmax[r]))
+        pu_low, pu_high = cfg.get("pickup_range", (xmin[nR + r], xmax[nR + r]))
+        pu_high = min(pu_high, xmax[nR + r])
+        tds_grids.append(setting_grid(max(tds_low, MIN_TDS), min(tds_high, MAX_TDS), cfg.get("TDS_step", DEFAULT_TDS_STEP)))
+        pickup_grids.append(setting_grid(max(pu_low, MIN_PICKUP), pu_high, cfg.get("pickup_step", DEFAULT_PICKUP_STEP)))
+
+    return {'tds': tds_grids, 'pickup': pickup_grids}
+
+def padded(grids: List[np.ndarray], fill: float) -> np.ndarray:
+    """Stack ragged per-relay grids into a (n_relays, max_steps) array"""
+    table = np.full((len(grids), max(len(g) for g in grids)), fill)
+    for r, g in enumerate(grids):
+        table[r, :len(g)] = g
+    return table
+
+def build_time_luts(compiled: Dict[str, Any], grids: Dict[str, List[np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Precompute A / ((I/PU)^p - 1) + B for every pair side and pickup step of its relay
+
+    Operating time is then ``TDS * lut`` (clipped at MAX_TIME*10), with the
+    constants of each relay's curve; pickups at or above the fault current are
+    stored as inf so they hit the penalty.
+    """
+    pickup_table = padded(grids['pickup'], np.inf)
+
+    def side_lut(I: np.ndarray, relay_idx: np.ndarray) -> np.ndarray:
+        PU = pickup_table[relay_idx]
+        c = compiled['relay_curve'][relay_idx][:, None]
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            lut = CURVE_A[c] / ((I[:, None] / PU) ** CURVE_P[c] - 1.0) + CURVE_B[c]
+        lut[~(I[:, None] > PU) | ~np.isfinite(lut)] = np.inf
+        return lut
+
+    return {
+        'tds_table': padded(grids['tds'], MAX_TDS),
+        'pickup_table': pickup_table,
+        'main_lut': side_lut(compiled['Ishc_main'], compiled['main_idx']),
+        'backup_lut': side_lut(compiled['Ishc_backup'], compiled['backup_idx']),
+        'tds_steps': np.array([len(g) for g in grids['tds']]),
+        'pickup_steps': np.array([len(g) for g in grids['pickup']])
+    }
+
+def discrete_pair_penalties(indices: np.ndarray, compiled: Dict[str, Any], luts: Dict[str, np.ndarray]) -> np.ndarray:
+    """Per-pair penalties for step indices [TDS idx..., pickup idx...] (batch dims allowed)"""
+    indices = np.asarray(indices, dtype=np.intp)
+    nR = compiled['n_relays']
+    relay_range = np.arange(nR)
+    pair_range = np.arange(len(compiled['main_idx']))
+    mi = compiled['main_idx']
+    bi = compiled['backup_idx']
+
+    tds = luts['tds_table'][relay_range, indices[..., :nR]]
+    pu_idx = indices[..., nR:]
+    tM = np.minimum(tds[..., mi] * luts['main_lut'][pair_range, pu_idx[..., mi]], MAX_TIME * 10.0)
+    tB = np.minimum(tds[..., bi] * luts['backup_lut'][pair_range, pu_idx[..., bi]], MAX_TIME * 10.0)
+    return np.maximum(CTI - (tB - tM), 0.0) + np.maximum(tM - MAX_TIME, 0.0)
+
+def discrete_tmt(indices: np.ndarray, compiled: Dict[str, Any], luts: Dict[str, np.ndarray]) -> np.ndarray:
+    """TMT of step indices, scalar or per batch row"""
+    return discrete_pair_penalties(indices, compiled, luts).sum(axis=-1)
+
+def decode_settings(indices: List[int], relays: List[str], luts: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+    """Deployable relay values for step indices"""
+    nR = len(relays)
+    return {
+        relays[r]: {
+            "TDS": float(luts['tds_table'][r, int(indices[r])]),
+            "pickup": float(luts['pickup_table'][r, int(indices[nR + r])]),
+            "TDS_step_index": int(indices[r]),
+            "pickup_step_index": int(indices[nR + r])
+        }
+        for r in range(nR)
+    }
+
+def discrete_optimization(scenario_id: str, scenario_data: Dict, relay_steps: Optional[Dict[str, Dict]] = None,
+                          initial_population: Optional[List[List[float]]] = None,
+                          max_generations: int = GA_maxGen, stall_generations: int = GA_iterno) -> Dict[str, Any]:
+    """GA over integer setting-step indices using the precomputed time tables"""
+    compiled = compile_scenario(scenario_data)
+    relays = compiled['relays']
+    nR = compiled['n_relays']
+    if nR == 0:
+        print(f'    ❌ Scenario "{scenario_id}" has no valid relays.')
+        return {}
+
+    grids = build_setting_grids(relays, scenario_data["pairs"], relay_steps)
+    luts = build_time_luts(compiled, grids)
+    xmin = [0] * (2 * nR)
+    xmax = [int(n) - 1 for n in luts['tds_steps']] + [int(n) - 1 for n in luts['pickup_steps']]
+
+    def fitness(individual: List[int]) -> float:
+        """TMT of a step-index individual"""
+        return float(discrete_tmt(individual, compiled, luts))
+
+    evolved = evolve_population(fitness, xmin, xmax, initial_population, max_generations, stall_generations,
+                                integer_genes=True)
+
+    return {
+        'scenario_id': scenario_id,
+        'relays': relays,
+        'relay_values': decode_settings(evolved['best'], relays, luts),
+        'best_tmt': evolved['best_tmt'],
+        'generations': evolved['generations'],
+        'history': evolved['history'],
+        'operator_stats': evolved['operator_stats'],
+        'evaluations': evolved['evaluations'],
+        'elapsed': evolved['elapsed'],
+        'population': [ind[:2 * nR] for ind in evolved['population']]
+    }
+
+def load_relay_steps(paths: Dict) -> Dict[str, Dict]:
+    """Per-relay step/range overrides from data/raw, if provided"""
+    steps_file = paths['data_raw'] / RELAY_STEPS_FILE
+    if not steps_file.exists():
+        return {}
+    with open(steps_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def main():
+    """Optimize every valid scenario on discrete setting grids"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    relay_steps = load_relay_steps(paths)
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+
+    results = {}
+    start_time = datetime.now()
+    for sid in scenario_ids:
+        data = scenario_map[sid]
+        if not validate_scenario_data(data)[0]:
+            continue
+        print(f"🎯 {sid} (discrete settings)")
+        state = discrete_optimization(sid, data, relay_steps)
+        if state:
+            results[sid] = {
+                'relay_values': state['relay_values'],
+                'best_tmt': state['best_tmt'],
+                'generations': state['generations']
+            }
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['data_processed'] / f"ga_discrete_settings_{timestamp}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'default_steps': {'TDS': DEFAULT_TDS_STEP, 'pickup': DEFAULT_PICKUP_STEP},
+            'relay_steps': relay_steps,
+            'processing_time': (datetime.now() - start_time).total_seconds(),
+            'optimization_results': results
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"   📄 Discrete settings: {output_file}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Optional Numba JIT backend for the single-objective GA
+relay_time, the TMT fitness and the steady-state generation step run as
+compiled kernels over preallocated arrays, drawing from a np.random.Generator
+in the same order as the reference GA. Without Numba the kernels stay plain
+Python (used for verification only) and optimization falls back to the
+reference run_genetic_algorithm
+"""
+
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Any
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (bare or with options)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+import ga_optimization_fast as ga
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, compute_bounds,
+    pair_penalty, scenario_curves, constraint_aware_population, run_genetic_algorithm,
+    CTI, MAX_TIME, GA_Ni, GA_nMut, GA_maxGen, GA_iterno, GA_INIT, GA_CROSSOVER, GA_MUTATION,
+    GA_PROGRESS_EVERY
+)
+from instrumentation import log
+from relay_curves import CURVE_A, CURVE_B, CURVE_P
+from relay_kernels import compile_scenario
+
+VERIFY_INDIVIDUALS = 20   # Random individuals per scenario checked against the reference fitness
+VERIFY_TOLERANCE = 1e-9
+EQUIVALENCE_SEED = 2024   # Generator seed of the whole-GA equivalence runs
+EQUIVALENCE_MAXGEN = 300
+EQUIVALENCE_SCENARIOS = 5 # Scenarios checked with a full reference vs kernel GA run
+
+@njit(cache=True)
+def relay_time_kernel(I, PU, TDS, A, B, p):
+    """Compiled relay_time on curve constants (A, B, p)"""
+    if I <= PU:
+        return MAX_TIME * 10.0
+    denom = (I / PU) ** p - 1.0
+    if denom == 0.0:
+        return MAX_TIME * 10.0
+    t = TDS * (A / denom + B)
+    if not np.isfinite(t):
+        return MAX_TIME * 10.0
+    return min(max(t, 0.0), MAX_TIME * 10.0)
+
+@njit(cache=True)
+def fitness_kernel(x, n_relays, main_idx, backup_idx, Ishc_main, Ishc_backup, A, B, p):
+    """TMT of x = [TDS..., pickup...] with per-relay curve constants (summed per pair like pair_penalty)"""
+    total = 0.0
+    for k in range(main_idx.shape[0]):
+        mi = main_idx[k]
+        bi = backup_idx[k]
+        tM = relay_time_kernel(Ishc_main[k], x[n_relays + mi], x[mi], A[mi], B[mi], p[mi])
+        tB = relay_time_kernel(Ishc_backup[k], x[n_relays + bi], x[bi], A[bi], B[bi], p[bi])
+        penalty = 0.0
+        if tB - tM < CTI:
+            penalty += CTI - (tB - tM)
+        if tM > MAX_TIME:
+            penalty += tM - MAX_TIME
+        total += penalty
+    return total
+
+@njit(cache=True)
+def sample_kernel(rng, perm, k):
+    """k distinct entries of perm (partial Fisher-Yates from its identity order), in perm[:k]"""
+    n = perm.shape[0]
+    for m in range(n):
+        perm[m] = m
+    for m in range(k):
+        r = m + rng.integers(0, n - m)
+        perm[m], perm[r] = perm[r], perm[m]
+
+@njit(cache=True)
+def generation_step(X, xmin, xmax, n_mut, n_relays, main_idx, backup_idx, Ishc_main, Ishc_backup,
+                    A, B, p, rng, H1, H2, perm):
+    """One Chu & Beasley generation on the sorted population X (fitness in the last column)
+
+    Draws from ``rng`` in the same order as evolve_population with the fixed
+    operators: two distinct parents, the single-point cut, then per child the
+    n_mut mutated genes followed by their uniform resamples. The better child
+    replaces the worst individual if it is better and not a duplicate; X
+    stays sorted by fitness. Returns True on replacement.
+    """
+    Ni, Nv = X.shape[0], X.shape[1] - 1
+    s1 = rng.integers(0, Ni)
+    s2 = 1 + rng.integers(0, Ni - 1)
+    if s2 == s1:
+        s2 = 0
+    cp = rng.integers(1, Nv)
+    for j in range(Nv):
+        if j < cp:
+            H1[j] = X[s1, j]
+            H2[j] = X[s2, j]
+        else:
+            H1[j] = X[s2, j]
+            H2[j] = X[s1, j]
+
+    for H in (H1, H2):
+        sample_kernel(rng, perm, n_mut)
+        for m in range(n_mut):
+            g = perm[m]
+            H[g] = xmin[g] + rng.random() * (xmax[g] - xmin[g])
+
+    f1 = fitness_kernel(H1, n_relays, main_idx, backup_idx, Ishc_main, Ishc_backup, A, B, p)
+    f2 = fitness_kernel(H2, n_relays, main_idx, backup_idx, Ishc_main, Ishc_backup, A, B, p)
+    child, fchild = (H1, f1) if f1 <= f2 else (H2, f2)
+
+    if fchild >= X[Ni - 1, Nv]:
+        return False
+    for k in range(Ni):
+        same = True
+        for j in range(Nv):
+            if abs(child[j] - X[k, j]) >= 1e-12:
+                same = False
+                break
+        if same:
+            return False
+
+    # Insert the child in sorted position (after equal fitness), dropping the worst individual
+    k = Ni - 1
+    while k > 0 and X[k - 1, Nv] > fchild:
+        X[k, :] = X[k - 1, :]
+        k -= 1
+    X[k, :Nv] = child
+    X[k, Nv] = fchild
+    return True
+
+@njit(cache=True)
+def evolve_kernel(X, xmin, xmax, n_mut, n_relays, main_idx, backup_idx, Ishc_main, Ishc_backup,
+                  A, B, p, rng, first_generation, last_generation, stall, stall_generations,
+                  history_gen, history_tmt, n_history):
+    """Run generations first..last until a perfect solution or stagnation
+
+    Improvements are appended to the preallocated history arrays. Returns
+    (last generation run, history entries, stall count, accepted children, stopped).
+    """
+    Nv = X.shape[1] - 1
+    H1 = np.empty(Nv)
+    H2 = np.empty(Nv)
+    perm = np.empty(max(Nv, 1), dtype=np.int64)
+    accepted = 0
+    gen = first_generation - 1
+    for gen in range(first_generation, last_generation + 1):
+        if generation_step(X, xmin, xmax, n_mut, n_relays, main_idx, backup_idx, Ishc_main, Ishc_backup,
+                           A, B, p, rng, H1, H2, perm):
+            accepted += 1
+        if X[0, Nv] < history_tmt[n_history - 1]:
+            history_gen[n_history] = gen
+            history_tmt[n_history] = X[0, Nv]
+            n_history += 1
+            stall = 0
+        else:
+            stall += 1
+        if X[0, Nv] == 0.0 or stall >= stall_generations:
+            return gen, n_history, stall, accepted, True
+    return gen, n_history, stall, accepted, False
+
+def kernel_arrays(scenario_data: Dict, relays: List[str]) -> Dict[str, Any]:
+    """Flat arrays the kernels take for one scenario"""
+    compiled = compile_scenario(scenario_data, relays)
+    curve = compiled['relay_curve']
+    return {
+        'n_relays': compiled['n_relays'],
+        'main_idx': compiled['main_idx'].astype(np.int64),
+        'backup_idx': compiled['backup_idx'].astype(np.int64),
+        'Ishc_main': compiled['Ishc_main'],
+        'Ishc_backup': compiled['Ishc_backup'],
+        'A': CURVE_A[curve],
+        'B': CURVE_B[curve],
+        'p': CURVE_P[curve]
+    }
+
+def kernel_fitness(individual: np.ndarray, arrays: Dict[str, Any]) -> float:
+    """fitness_kernel on the arrays of kernel_arrays"""
+    return fitness_kernel(np.asarray(individual, dtype=np.float64), arrays['n_relays'], arrays['main_idx'],
+                          arrays['backup_idx'], arrays['Ishc_main'], arrays['Ishc_backup'],
+                          arrays['A'], arrays['B'], arrays['p'])
+
+def kernel_genetic_algorithm(scenario_id: str, scenario_data: Dict,
+                             initial_population: Optional[List[List[float]]] = None,
+                             max_generations: int = GA_maxGen, stall_generations: int = GA_iterno,
+                             init: str = GA_INIT,
+                             progress: Optional[Callable[[int, float, float], None]] = None,
+                             rng: Optional[np.random.Generator] = None) -> Dict[str, Any]:
+    """Fixed-operator GA on the kernels (compiled with Numba, interpreted otherwise)
+
+    Returns the run_genetic_algorithm state. All randomness comes from
+    ``rng`` (by default seeded from the ``random`` module, so random.seed
+    keeps runs reproducible). The kernels run GA_PROGRESS_EVERY generations
+    per call, which is also the resolution of the history timestamps.
+    """
+    rng = rng if rng is not None else np.random.default_rng(random.getrandbits(63))
+    start = time.perf_counter()
+    relays = [r for r in scenario_data["relays"] if str(r).strip()]
+    nR = len(relays)
+    if nR == 0:
+        log(f'    ❌ Scenario "{scenario_id}" has no valid relays.', 0)
+        return {}
+
+    pairs = scenario_data["pairs"]
+    arrays = kernel_arrays(scenario_data, relays)
+    curves = scenario_curves(scenario_data, relays)
+    lo, hi = compute_bounds(relays, pairs)
+    xmin, xmax = np.array(lo), np.array(hi)
+    Nv = 2 * nR
+    if init != "uniform":
+        seeds = list(initial_population or [])[:GA_Ni]
+        initial_population = seeds + constraint_aware_population(relays, pairs, lo, hi, GA_Ni - len(seeds), init, curves)
+
+    # Preallocated population with fitness in the last column, filled in evolve_population's draw order
+    X = np.empty((GA_Ni, Nv + 1))
+    seeds = list(initial_population or [])[:GA_Ni]
+    for k in range(GA_Ni):
+        if k < len(seeds):
+            X[k, :Nv] = np.clip(np.asarray(seeds[k], dtype=np.float64)[:Nv], xmin, xmax)
+        else:
+            for j in range(Nv):
+                X[k, j] = xmin[j] + rng.random() * (xmax[j] - xmin[j])
+        X[k, Nv] = kernel_fitness(X[k, :Nv], arrays)
+    X = X[np.argsort(X[:, Nv], kind='stable')]
+
+    history_gen = np.zeros(max_generations + 1, dtype=np.int64)
+    history_tmt = np.zeros(max_generations + 1)
+    history_tmt[0] = X[0, Nv]
+    history = [(0, float(X[0, Nv]), 0.0)]
+    n_history, stall, accepted, gen = 1, 0, 0, 0
+    log(f'    🔄 GA (kernels): generation 0  – TMT = {X[0, Nv]:.6f}', 2)
+    if progress:
+        progress(0, float(X[0, Nv]), time.perf_counter() - start)
+
+    while gen < max_generations:
+        last = min(gen + GA_PROGRESS_EVERY, max_generations)
+        gen, n_new, stall, chunk_accepted, stopped = evolve_kernel(
+            X, xmin, xmax, GA_nMut, nR, arrays['main_idx'], arrays['backup_idx'],
+            arrays['Ishc_main'], arrays['Ishc_backup'], arrays['A'], arrays['B'], arrays['p'],
+            rng, gen + 1, last, stall, stall_generations, history_gen, history_tmt, n_history
+        )
+        seconds = time.perf_counter() - start
+        history.extend((int(g), float(t), seconds)
+                       for g, t in zip(history_gen[n_history:n_new], history_tmt[n_history:n_new]))
+        n_history = n_new
+        accepted += chunk_accepted
+        if gen % GA_PROGRESS_EVERY == 0:
+            log(f'    🔄 GA (kernels): generation {gen} – TMT = {X[0, Nv]:.6f}', 2)
+            if progress:
+                progress(gen, float(X[0, Nv]), seconds)
+        if stopped:
+            break
+    log(f'    🏁 GA (kernels) finished. Generations: {gen}  – Best TMT = {X[0, Nv]:.6f}')
+
+    best = X[0, :Nv]
+    return {
+        'scenario_id': scenario_id,
+        'relays': relays,
+        'relay_values': {
+            relays[r]: {"TDS": round(float(best[r]), 5), "pickup": round(float(best[nR + r]), 5),
+                        **({"curve": curves[r]} if curves else {})}
+            for r in range(nR)
+        },
+        'best_tmt': float(X[0, Nv]),
+        'generations': int(gen),
+        'history': history,
+        'operator_stats': {'single_point': {'uses': int(gen), 'successes': accepted},
+                           'uniform': {'uses': int(gen), 'successes': accepted}},
+        'evaluations': GA_Ni + 2 * int(gen),
+        'elapsed': time.perf_counter() - start,
+        'population': X[:, :Nv].tolist()
+    }
+
+def jit_genetic_algorithm(scenario_id: str, scenario_data: Dict,
+                          initial_population: Optional[List[List[float]]] = None,
+                          max_generations: int = GA_maxGen,
+                          stall_generations: int = GA_iterno,
+                          init: str = GA_INIT,
+                          crossover: Optional[str] = None,
+                          mutation: Optional[str] = None,
+                          progress: Optional[Callable[[int, float, float], None]] = None,
+                          rng: Optional[np.random.Generator] = None) -> Dict[str, Any]:
+    """run_genetic_algorithm on the compiled kernels (same signature and state)
+
+    The kernels implement the fixed operators only; other operators, or a
+    missing Numba, fall back to the reference run_genetic_algorithm.
+    """
+    fixed = (crossover or GA_CROSSOVER) == "single_point" and (mutation or GA_MUTATION) == "uniform"
+    if not NUMBA_AVAILABLE or not fixed:
+        return run_genetic_algorithm(scenario_id, scenario_data, initial_population, max_generations,
+                                     stall_generations, init, crossover, mutation, progress)
+    return kernel_genetic_algorithm(scenario_id, scenario_data, initial_population, max_generations,
+                                    stall_generations, init, progress, rng)
+
+class GeneratorRandom:
+    """Stand-in for the ``random`` module that draws from a np.random.Generator like the kernels do"""
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+
+    def random(self) -> float:
+        return self.rng.random()
+
+    def randint(self, a: int, b: int) -> int:
+        return int(self.rng.integers(a, b + 1))
+
+    def sample(self, population, k: int) -> List[Any]:
+        pool = list(population)
+        for m in range(k):
+            r = m + int(self.rng.integers(0, len(pool) - m))
+            pool[m], pool[r] = pool[r], pool[m]
+        return pool[:k]
+
+def verify_ga_equivalence(scenario_id: str, scenario_data: Dict, seed: int = EQUIVALENCE_SEED,
+                          max_generations: int = EQUIVALENCE_MAXGEN) -> Dict[str, Any]:
+    """Run the reference GA and the kernel GA from the same Generator seed and compare their states
+
+    The reference evolve_population draws through GeneratorRandom, so both
+    runs consume the same random stream and must agree exactly: generations,
+    accepted children, improvement history, best TMT and final population.
+    """
+    reference_random = ga.random
+    ga.random = GeneratorRandom(np.random.default_rng(seed))
+    try:
+        reference = run_genetic_algorithm(scenario_id, scenario_data, max_generations=max_generations,
+                                          stall_generations=max_generations, init="uniform",
+                                          crossover="single_point", mutation="uniform")
+    finally:
+        ga.random = reference_random
+    kernel = kernel_genetic_algorithm(scenario_id, scenario_data, max_generations=max_generations,
+                                      stall_generations=max_generations, init="uniform",
+                                      rng=np.random.default_rng(seed))
+    checks = {
+        'generations': reference['generations'] == kernel['generations'],
+        'accepted': reference['operator_stats']['single_point'] == kernel['operator_stats']['single_point'],
+        'history': [h[:2] for h in reference['history']] == [h[:2] for h in kernel['history']],
+        'best_tmt': reference['best_tmt'] == kernel['best_tmt'],
+        'relay_values': reference['relay_values'] == kernel['relay_values'],
+        'population': reference['population'] == kernel['population']
+    }
+    return {
+        'passed': all(checks.values()),
+        'checks': checks,
+        'best_tmt': kernel['best_tmt'],
+        'generations': kernel['generations'],
+        'reference_seconds': reference['elapsed'],
+        'kernel_seconds': kernel['elapsed']
+    }
+
+def verify_scenario(scenario_data: Dict, n_individuals: int = VERIFY_INDIVIDUALS) -> float:
+    """Largest |kernel - reference| fitness difference over random individuals"""
+    relays = [r for r in scenario_data["relays"] if str(r).strip()]
+    nR = len(relays)
+    idx = {relays[i]: i for i in range(nR)}
+    curves = scenario_curves(scenario_data, relays)
+    arrays = kernel_arrays(scenario_data, relays)
+    lo, hi = compute_bounds(relays, scenario_data["pairs"])
+
+    worst = 0.0
+    for _ in range(n_individuals):
+        x = [lo[j] + random.random() * (hi[j] - lo[j]) for j in range(2 * nR)]
+        reference = sum(pair_penalty(p, x[:nR], x[nR:], idx, curves) for p in scenario_data["pairs"])
+        worst = max(worst, abs(kernel_fitness(x, arrays) - reference))
+    return worst
+
+def main():
+    """Verify the kernel fitness on every valid scenario and the whole kernel GA on a fixed seed"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    print(f"⚙️  Numba available: {NUMBA_AVAILABLE}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+    valid_ids = [sid for sid in scenario_ids if validate_scenario_data(scenario_map[sid])[0]]
+
+    random.seed(0)
+    deviations = {sid: verify_scenario(scenario_map[sid]) for sid in valid_ids}
+    worst = max(deviations.values()) if deviations else 0.0
+    fitness_passed = worst <= VERIFY_TOLERANCE
+    print(f"   {'✅' if fitness_passed else '❌'} Max fitness deviation over {len(deviations)} scenarios: {worst:.3e}")
+
+    equivalence = {}
+    for sid in valid_ids[:EQUIVALENCE_SCENARIOS]:
+        equivalence[sid] = result = verify_ga_equivalence(sid, scenario_map[sid])
+        failed = [name for name, ok in result['checks'].items() if not ok]
+        print(f"   {'✅' if not failed else '❌'} {sid}: reference and kernel GA "
+              f"{'identical' if not failed else 'differ in ' + ', '.join(failed)} "
+              f"({result['generations']} generations, TMT {result['best_tmt']:.6f}, "
+              f"{result['reference_seconds']:.2f}s vs {result['kernel_seconds']:.2f}s)")
+    passed = fitness_passed and all(e['passed'] for e in equivalence.values())
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = paths['tables'] / f"ga_jit_verification_{timestamp}.json"
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'numba_available': NUMBA_AVAILABLE,
+            'individuals_per_scenario': VERIFY_INDIVIDUALS,
+            'max_deviation': worst,
+            'equivalence_seed': EQUIVALENCE_SEED,
+            'equivalence_max_generations': EQUIVALENCE_MAXGEN,
+            'equivalence': equivalence,
+            'passed': passed,
+            'scenarios': deviations
+        }, f, indent=2, ensure_ascii=False)
+    print(f"   📄 Verification report: {report_file}")
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -8,16 +8,27 @@ import os
 import json
 import math
 import random
+import sys
+import time
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any, Union
+
+from relay_curves import CURVES, DEFAULT_CURVE, curve_constants, curve_time, relay_curve
+from results_store import open_store, record_run
+from run_manifest import write_run_manifest
+from pairs_io import PairWriter, pairs_path
+from apply_settings import pair_columns, apply_settings, updated_records
+from instrumentation import Tracer, log, set_verbosity
 
 # Set random seeds for reproducibility
 random.seed(42)
 
 # =============== CONSTANTS (aligned with MATLAB) ===============
-K = 0.14
-N = 0.02
+# Default curve constants (IEC standard inverse); see relay_curves.CURVES for the others
+K = CURVES[DEFAULT_CURVE]["A"]
+N = CURVES[DEFAULT_CURVE]["p"]
 
 CTI = 0.20
 MIN_TDS = 0.05
@@ -32,10 +43,46 @@ GA_iterno = 1000  # Reduced for faster execution
 GA_maxGen = 1000  # Reduced for faster execution
 GA_nMut = 2
 
-print("🚀 FAST GA OPTIMIZATION - 1,000 GENERATIONS")
-print("="*60)
-print(f"📊 GA Parameters: Population={GA_Ni}, Max Generations={GA_maxGen} (FAST MODE)")
-print(f"⚙️  Coordination: CTI={CTI}s, MIN_TDS={MIN_TDS}, MAX_TDS={MAX_TDS}")
+# Variation operators: crossover "single_point" | "sbx" | "blend", mutation "uniform" |
+# "gaussian" | "polynomial"; "adaptive" selects per generation by recent success rate
+GA_CROSSOVER = "single_point"
+GA_MUTATION = "uniform"
+CROSSOVER_OPERATORS = ["single_point", "sbx", "blend"]
+MUTATION_OPERATORS = ["uniform", "gaussian", "polynomial"]
+GA_SBX_ETA = 15.0
+GA_BLEND_ALPHA = 0.5
+GA_POLY_ETA = 20.0
+GA_SIGMA0 = 0.1          # Initial mutation step (fraction of each gene's range)
+GA_SIGMA_MIN = 0.001
+GA_SIGMA_SHRINK = 0.5    # Step multiplier after every GA_SIGMA_STALL stalled generations
+GA_SIGMA_STALL = 50
+GA_ADAPT_WINDOW = 50     # Recent outcomes used for adaptive operator selection
+GA_ADAPT_PMIN = 0.1      # Minimum selection probability per operator
+GA_PROGRESS_EVERY = 100  # Generations between progress reports
+
+# Optimized pair files: "json" (legacy array) | "jsonl" | "jsonl.gz" | "jsonl.zst" (needs zstandard)
+PAIRS_FORMAT = "jsonl.gz"
+
+# Legacy per-scenario optimized_relay_values_*_GA_<ts>.json files; results live in the results
+# database and `python results_store.py scenarios` exports them on demand
+EXPORT_SCENARIO_FILES = False
+
+# Initial population: "uniform" (Chu & Beasley), or constraint-aware "coordinated" / "lhs"
+GA_INIT = "uniform"
+INIT_TDS_SPREAD = 0.25  # Fraction of the TDS range used for the starting TDS before the CTI pass
+
+# GA engine: "reference" (run_genetic_algorithm) | "jit" (ga_jit kernels, needs Numba)
+GA_BACKEND = "reference"
+GA_BACKENDS = ["reference", "jit"]
+
+TRACE_CHROME = False    # Also export each run's spans as a Chrome trace (chrome://tracing, Perfetto)
+
+def print_banner() -> None:
+    """GA configuration banner"""
+    log("🚀 FAST GA OPTIMIZATION - 1,000 GENERATIONS")
+    log("="*60)
+    log(f"📊 GA Parameters: Population={GA_Ni}, Max Generations={GA_maxGen} (FAST MODE)")
+    log(f"⚙️  Coordination: CTI={CTI}s, MIN_TDS={MIN_TDS}, MAX_TDS={MAX_TDS}")
 
 def setup_paths():
     """Setup all necessary paths for the project"""
@@ -49,6 +96,7 @@ def setup_paths():
         'figures': project_root / "results" / "figures",
         'reports': project_root / "results" / "reports",
         'tables': project_root / "results" / "tables",
+        'ga_state': project_root / "data" / "processed" / "ga_state",
         'input_file': project_root / "data" / "raw" / "automation_results.json"
     }
     
@@ -69,16 +117,12 @@ def get_numeric_field(dct: Dict, names: List[str]) -> Optional[float]:
                 pass
     return None
 
-def time_iec(I: float, PU: float, TDS: float) -> float:
-    """Calculate IEC relay operating time"""
+def time_iec(I: float, PU: float, TDS: float, curve: str = DEFAULT_CURVE) -> float:
+    """Calculate relay operating time (IEC standard inverse unless another curve is given)"""
     if I is None or PU is None or TDS is None:
         return float("nan")
     try:
-        M = I / PU
-        denom = (M**N) - 1.0
-        if denom <= 0:
-            return float("inf")
-        return (K * TDS) / denom
+        return curve_time(I, PU, TDS, curve)
     except (ZeroDivisionError, OverflowError):
         return float("nan")
 
@@ -123,6 +167,7 @@ def group_data_by_scenario(data_array: List[Dict]) -> Dict[str, Dict]:
                 "pairs": [],
                 "relays": [],
                 "initial_settings": {},
+                "relay_curves": {},
                 "fault_types": set()
             }
             
@@ -145,6 +190,12 @@ def group_data_by_scenario(data_array: List[Dict]) -> Dict[str, Dict]:
         store_initial_setting(scenario_map[sid]["initial_settings"], main_relay)
         store_initial_setting(scenario_map[sid]["initial_settings"], backup_relay)
         
+        # Track relay curve types when the records carry them
+        for name, info in ((mname, main_relay), (bname, backup_relay)):
+            curve = relay_curve(info)
+            if curve and name not in scenario_map[sid]["relay_curves"]:
+                scenario_map[sid]["relay_curves"][name] = curve
+        
         # Track fault types
         scenario_map[sid]["fault_types"].add(entry.get("fault", "unknown"))
     
@@ -175,19 +226,53 @@ def validate_scenario_data(scenario_data: Dict) -> Tuple[bool, List[str]]:
         
     return len(issues) == 0, issues
 
-def genetic_algorithm_optimization(scenario_id: str, scenario_data: Dict) -> Dict[str, Dict]:
-    """Genetic Algorithm optimization for relay coordination"""
-    pairs = scenario_data["pairs"]
-    relays = [r for r in scenario_data["relays"] if str(r).strip()]
-    nR = len(relays)
+def relay_time(I: float, PU: float, TDS: float, curve: str = DEFAULT_CURVE) -> float:
+    """Calculate relay operating time with penalty for invalid conditions"""
+    if I <= PU:
+        return MAX_TIME * 10.0  # penalty
+    c = CURVES[curve]
+    try:
+        t = TDS * (c["A"] / ((I / PU) ** c["p"] - 1.0) + c["B"])
+        return min(max(t, 0.0), MAX_TIME * 10.0)
+    except (ZeroDivisionError, OverflowError):
+        return MAX_TIME * 10.0
+
+def pair_penalty(pair: Dict, tds: List[float], pu: List[float], idx: Dict[str, int],
+                 curves: Optional[List[str]] = None) -> float:
+    """Miscoordination penalty contributed by a single relay pair
     
-    if nR == 0:
-        print(f'    ❌ Scenario "{scenario_id}" has no valid relays.')
-        return {}
+    ``curves`` gives the curve of each relay by index (default curve if None).
+    Used for spot re-checks of a few pairs; the GA fitness inlines this loop.
+    """
+    mi = idx[pair["main_relay"]]
+    bi = idx[pair["backup_relay"]]
+    
+    tM = relay_time(pair["Ishc_main"], pu[mi], tds[mi], curves[mi] if curves else DEFAULT_CURVE)
+    tB = relay_time(pair["Ishc_backup"], pu[bi], tds[bi], curves[bi] if curves else DEFAULT_CURVE)
+    
+    penalty = 0.0
+    # CTI violation penalty
+    if (tB - tM) < CTI:
+        penalty += (CTI - (tB - tM))
+    
+    # Time limit penalty
+    if tM > MAX_TIME:
+        penalty += (tM - MAX_TIME)
+        
+    return penalty
 
-    # Create relay index mapping
-    idx = {relays[i]: i for i in range(nR)}
+def scenario_curves(scenario_data: Dict, relays: List[str]) -> Optional[List[str]]:
+    """Curve of each relay by index, or None when the scenario uses only the default curve"""
+    relay_curves = scenario_data.get("relay_curves") or {}
+    if not relay_curves:
+        return None
+    return [relay_curves.get(r, DEFAULT_CURVE) for r in relays]
 
+def compute_bounds(relays: List[str], pairs: List[Dict]) -> Tuple[List[float], List[float]]:
+    """Build GA search bounds [TDS..., pickup...] from the minimum Isc seen by each relay"""
+    nR = len(relays)
+    idx = {relays[i]: i for i in range(nR)}
+    
     # Calculate minimum Isc per relay for bounds
     IscMin = [float("inf")] * nR
     for p in pairs:
@@ -195,75 +280,231 @@ def genetic_algorithm_optimization(scenario_id: str, scenario_data: Dict) -> Dic
         backup_idx = idx[p["backup_relay"]]
         IscMin[main_idx] = min(IscMin[main_idx], p["Ishc_main"])
         IscMin[backup_idx] = min(IscMin[backup_idx], p["Ishc_backup"])
-
-    # Define bounds
+    
     xmin = ([MIN_TDS] * nR) + ([MIN_PICKUP] * nR)
     xmax = ([MAX_TDS] * nR) + ([MAX_PICKUP_FACTOR * IscMin[i] for i in range(nR)])
-    Nv = 2 * nR  # Number of variables (TDS + pickup for each relay)
+    return xmin, xmax
 
-    def relay_time(I: float, PU: float, TDS: float) -> float:
-        """Calculate relay operating time with penalty for invalid conditions"""
-        if I <= PU:
-            return MAX_TIME * 10.0  # penalty
-        try:
-            t = TDS * (K / ((I / PU) ** N - 1.0))
-            return min(max(t, 0.0), MAX_TIME * 10.0)
-        except (ZeroDivisionError, OverflowError):
-            return MAX_TIME * 10.0
-
-    def fitness(individual: List[float]) -> float:
-        """Calculate fitness function (TMT - Total Miscoordination Time)"""
-        tds = individual[:nR]
-        pu = individual[nR:]
-        tmt = 0.0
-        
-        for p in pairs:
+def latin_hypercube(n: int, d: int) -> List[List[float]]:
+    """n Latin-hypercube samples in [0, 1)^d (one sample per stratum and dimension)"""
+    columns = []
+    for _ in range(d):
+        strata = list(range(n))
+        random.shuffle(strata)
+        columns.append([(s + random.random()) / n for s in strata])
+    return [[columns[j][i] for j in range(d)] for i in range(n)]
+
+def relay_order(relays: List[str], pairs: List[Dict]) -> List[int]:
+    """Topological order of the main→backup graph (cycles broken at the lowest in-degree)"""
+    nR = len(relays)
+    idx = {relays[i]: i for i in range(nR)}
+    backups = [set() for _ in range(nR)]
+    for p in pairs:
+        backups[idx[p["main_relay"]]].add(idx[p["backup_relay"]])
+    indegree = [0] * nR
+    for r in range(nR):
+        for b in backups[r]:
+            indegree[b] += 1
+
+    order = []
+    remaining = set(range(nR))
+    while remaining:
+        r = min(remaining, key=lambda i: (indegree[i], i))
+        order.append(r)
+        remaining.discard(r)
+        for b in backups[r]:
+            indegree[b] -= 1
+    return order
+
+def coordinated_tds(relays: List[str], pairs: List[Dict], order: List[int], tds: List[float], pu: List[float],
+                    curves: Optional[List[str]] = None) -> List[float]:
+    """One pass over the main→backup order raising backup TDS until each pair roughly meets CTI"""
+    nR = len(relays)
+    idx = {relays[i]: i for i in range(nR)}
+    by_backup = [[] for _ in range(nR)]
+    for p in pairs:
+        by_backup[idx[p["backup_relay"]]].append(p)
+
+    tds = list(tds)
+    for b in order:
+        for p in by_backup[b]:
             mi = idx[p["main_relay"]]
-            bi = idx[p["backup_relay"]]
-            
-            tM = relay_time(p["Ishc_main"], pu[mi], tds[mi])
-            tB = relay_time(p["Ishc_backup"], pu[bi], tds[bi])
-            
-            # CTI violation penalty
-            if (tB - tM) < CTI:
-                tmt += (CTI - (tB - tM))
-            
-            # Time limit penalty
-            if tM > MAX_TIME:
-                tmt += (tM - MAX_TIME)
-                
-        return tmt
+            if p["Ishc_backup"] <= pu[b]:
+                continue
+            tM = relay_time(p["Ishc_main"], pu[mi], tds[mi], curves[mi] if curves else DEFAULT_CURVE)
+            unit = curve_time(p["Ishc_backup"], pu[b], 1.0, curves[b] if curves else DEFAULT_CURVE)
+            if 0.0 < unit < float("inf"):
+                tds[b] = max(tds[b], (tM + CTI) / unit)
+        tds[b] = min(tds[b], MAX_TDS)
+    return tds
 
+def constraint_aware_population(relays: List[str], pairs: List[Dict], xmin: List[float], xmax: List[float],
+                                size: int = GA_Ni, method: str = "coordinated",
+                                curves: Optional[List[str]] = None) -> List[List[float]]:
+    """Initial individuals with log-space pickups below IscMin and CTI-aware TDS
+    
+    Pickups are sampled log-uniformly in [MIN_PICKUP, MAX_PICKUP_FACTOR*IscMin],
+    which keeps most of them far from the fault currents; TDS starts in the
+    lower INIT_TDS_SPREAD of its range and a topological pass over the
+    main→backup graph raises backups to meet CTI. ``method="lhs"`` draws the
+    underlying unit samples from a Latin hypercube instead of independently.
+    """
+    nR = len(relays)
+    order = relay_order(relays, pairs)
+    if method == "lhs":
+        unit = latin_hypercube(size, 2 * nR)
+    else:
+        unit = [[random.random() for _ in range(2 * nR)] for _ in range(size)]
+
+    population = []
+    for u in unit:
+        pu = [
+            math.exp(math.log(xmin[nR + r]) + u[nR + r] * (math.log(xmax[nR + r]) - math.log(xmin[nR + r])))
+            if xmax[nR + r] > xmin[nR + r] > 0 else xmin[nR + r]
+            for r in range(nR)
+        ]
+        tds = [xmin[r] + u[r] * INIT_TDS_SPREAD * (xmax[r] - xmin[r]) for r in range(nR)]
+        tds = coordinated_tds(relays, pairs, order, tds, pu, curves)
+        population.append(tds + pu)
+    return population
+
+def crossover_children(operator: str, P1: List[float], P2: List[float]) -> Tuple[List[float], List[float]]:
+    """Two children of P1 and P2 with the named crossover operator"""
+    Nv = len(P1)
+    if operator == "sbx":
+        H1, H2 = P1[:], P2[:]
+        for j in range(Nv):
+            if random.random() < 0.5:
+                u = random.random()
+                if u <= 0.5:
+                    beta = (2.0 * u) ** (1.0 / (GA_SBX_ETA + 1.0))
+                else:
+                    beta = (1.0 / (2.0 * (1.0 - u))) ** (1.0 / (GA_SBX_ETA + 1.0))
+                H1[j] = 0.5 * ((1.0 + beta) * P1[j] + (1.0 - beta) * P2[j])
+                H2[j] = 0.5 * ((1.0 - beta) * P1[j] + (1.0 + beta) * P2[j])
+        return H1, H2
+    if operator == "blend":
+        H1, H2 = [], []
+        for a, b in zip(P1, P2):
+            lo, hi = min(a, b), max(a, b)
+            d = GA_BLEND_ALPHA * (hi - lo)
+            H1.append(random.uniform(lo - d, hi + d))
+            H2.append(random.uniform(lo - d, hi + d))
+        return H1, H2
+    # Single-point crossover (Chu & Beasley)
+    cp = random.randint(1, Nv - 1)
+    return P1[:cp] + P2[cp:], P2[:cp] + P1[cp:]
+
+def mutation_step(operator: str, value: float, low: float, high: float, sigma: float) -> float:
+    """Perturbed gene value for the Gaussian / polynomial mutation operators"""
+    span = high - low
+    if operator == "gaussian":
+        return value + random.gauss(0.0, sigma * span)
+    # Polynomial mutation, with its spread scaled by the current step size
+    u = random.random()
+    if u < 0.5:
+        delta = (2.0 * u) ** (1.0 / (GA_POLY_ETA + 1.0)) - 1.0
+    else:
+        delta = 1.0 - (2.0 * (1.0 - u)) ** (1.0 / (GA_POLY_ETA + 1.0))
+    return value + delta * span * (sigma / GA_SIGMA0)
+
+def evolve_population(fitness: Callable[[List[float]], float], xmin: List[float], xmax: List[float],
+                      initial_population: Optional[List[List[float]]] = None,
+                      max_generations: int = GA_maxGen, stall_generations: int = GA_iterno,
+                      integer_genes: Union[bool, List[bool]] = False,
+                      crossover: Optional[str] = None, mutation: Optional[str] = None,
+                      progress: Optional[Callable[[int, float, float], None]] = None) -> Dict[str, Any]:
+    """Steady-state GA loop (Chu & Beasley) over generic bounded gene vectors
+    
+    ``initial_population`` seeds the first individuals (clipped to bounds); the
+    rest of the GA_Ni slots are sampled uniformly as usual. ``integer_genes``
+    (for all genes, or a per-gene list) makes genes integer indices in
+    [xmin, xmax], e.g. setting steps or categorical choices. ``crossover`` and
+    ``mutation`` default to GA_CROSSOVER / GA_MUTATION; "adaptive" picks an
+    operator each generation by its recent success rate. ``progress`` is called
+    as (generation, best TMT, seconds) every GA_PROGRESS_EVERY generations.
+    """
+    Nv = len(xmin)
+    is_int = list(integer_genes) if isinstance(integer_genes, (list, tuple)) else [integer_genes] * Nv
+    crossover = crossover or GA_CROSSOVER
+    mutation = mutation or GA_MUTATION
+    start = time.perf_counter()
+    
+    def sample_gene(j: int) -> float:
+        """Uniform sample of gene j within its bounds"""
+        if is_int[j]:
+            return random.randint(int(xmin[j]), int(xmax[j]))
+        return xmin[j] + random.random() * (xmax[j] - xmin[j])
+    
+    def repair(child: List[float]) -> List[float]:
+        """Clip genes to bounds and round integer genes"""
+        child = [min(max(child[j], xmin[j]), xmax[j]) for j in range(Nv)]
+        return [int(round(v)) if is_int[j] else v for j, v in enumerate(child)]
+    
+    # Operator bookkeeping (uses/successes overall and over a sliding window)
+    pools = {
+        'crossover': CROSSOVER_OPERATORS if crossover == "adaptive" else [crossover],
+        'mutation': MUTATION_OPERATORS if mutation == "adaptive" else [mutation]
+    }
+    operator_stats = {op: {'uses': 0, 'successes': 0} for pool in pools.values() for op in pool}
+    recent = {op: deque(maxlen=GA_ADAPT_WINDOW) for op in operator_stats}
+    
+    def pick_operator(kind: str) -> str:
+        """Fixed operator, or probability matching on recent success rates"""
+        pool = pools[kind]
+        if len(pool) == 1:
+            return pool[0]
+        quality = [(sum(recent[op]) + 1.0) / (len(recent[op]) + 2.0) for op in pool]
+        total = sum(quality)
+        weights = [GA_ADAPT_PMIN + (1.0 - len(pool) * GA_ADAPT_PMIN) * q / total for q in quality]
+        return random.choices(pool, weights)[0]
+    
     # Initialize population
     X = []
-    for _ in range(GA_Ni):
-        individual = [xmin[j] + random.random() * (xmax[j] - xmin[j]) for j in range(Nv)]
+    for seed in (initial_population or [])[:GA_Ni]:
+        individual = [min(max(float(seed[j]), xmin[j]), xmax[j]) for j in range(Nv)]
+        individual = [int(round(v)) if is_int[j] else v for j, v in enumerate(individual)]
+        X.append(individual + [fitness(individual)])
+    while len(X) < GA_Ni:
+        individual = [sample_gene(j) for j in range(Nv)]
         X.append(individual + [fitness(individual)])
     
     X.sort(key=lambda r: r[Nv])  # Sort by fitness
     X_best = X[0][:]
+    history = [(0, X_best[Nv], 0.0)]  # (generation, best TMT, seconds) at every improvement
     
-    print(f'    🔄 GA: generation 0  – TMT = {X_best[Nv]:.6f}')
+    log(f'    🔄 GA: generation 0  – TMT = {X_best[Nv]:.6f}', 2)
+    if progress:
+        progress(0, X_best[Nv], time.perf_counter() - start)
 
     # Evolution loop
     stall = 0
-    for gen in range(1, GA_maxGen + 1):
+    gen = 0
+    sigma = GA_SIGMA0
+    for gen in range(1, max_generations + 1):
         # Selection and crossover
         s1, s2 = random.sample(range(GA_Ni), 2)
         P1 = X[s1][:Nv]
         P2 = X[s2][:Nv]
-        cp = random.randint(1, Nv - 1)
-        H1 = P1[:cp] + P2[cp:]
-        H2 = P2[:cp] + P1[cp:]
+        cx = pick_operator('crossover')
+        H1, H2 = crossover_children(cx, P1, P2)
+
+        mut = pick_operator('mutation')
 
         def mutate(child: List[float]) -> List[float]:
             """Apply mutation to child"""
             for m in random.sample(range(Nv), GA_nMut):
-                child[m] = xmin[m] + random.random() * (xmax[m] - xmin[m])
+                if mut == "uniform":
+                    child[m] = sample_gene(m)
+                else:
+                    child[m] = mutation_step(mut, child[m], xmin[m], xmax[m], sigma)
             return child
 
         H1 = mutate(H1)
         H2 = mutate(H2)
+        if cx != "single_point" or mut != "uniform":
+            H1 = repair(H1)
+            H2 = repair(H2)
         f1 = fitness(H1)
         f2 = fitness(H2)
 
@@ -272,6 +513,7 @@ def genetic_algorithm_optimization(scenario_id: str, scenario_data: Dict) -> Dic
         candidates.sort(key=lambda t: t[1])
         child, fchild = candidates[0]
         
+        accepted = False
         if fchild < X[-1][Nv]:
             # Check for duplicates
             duplicate = any(
@@ -280,32 +522,176 @@ def genetic_algorithm_optimization(scenario_id: str, scenario_data: Dict) -> Dic
             )
             if not duplicate:
                 X[-1] = child + [fchild]
+                accepted = True
+
+        for op in (cx, mut):
+            operator_stats[op]['uses'] += 1
+            operator_stats[op]['successes'] += int(accepted)
+            recent[op].append(int(accepted))
 
         X.sort(key=lambda r: r[Nv])
         
         # Update best solution
         if X[0][Nv] < X_best[Nv]:
             X_best = X[0][:]
+            history.append((gen, X_best[Nv], time.perf_counter() - start))
             stall = 0
         else:
             stall += 1
+            # Shrink mutation steps while the search stalls
+            if stall % GA_SIGMA_STALL == 0:
+                sigma = max(sigma * GA_SIGMA_SHRINK, GA_SIGMA_MIN)
 
         # Progress reporting (every 100 generations for fast mode)
-        if gen % 100 == 0:
-            print(f'    🔄 GA: generation {gen} – TMT = {X_best[Nv]:.6f}')
+        if gen % GA_PROGRESS_EVERY == 0:
+            log(f'    🔄 GA: generation {gen} – TMT = {X_best[Nv]:.6f}', 2)
+            if progress:
+                progress(gen, X_best[Nv], time.perf_counter() - start)
             
         # Stopping criteria
         if X_best[Nv] == 0.0:
-            print(f'    ✅ Perfect solution found at generation {gen}')
+            log(f'    ✅ Perfect solution found at generation {gen}', 2)
             break
-        if stall >= GA_iterno:
-            print(f'    ⚠️  Stagnation ({GA_iterno} generations without improvement)')
+        if stall >= stall_generations:
+            log(f'    ⚠️  Stagnation ({stall_generations} generations without improvement)', 2)
             break
 
-    print(f'    🏁 GA finished. Generations: {gen}  – Best TMT = {X_best[Nv]:.6f}')
+    log(f'    🏁 GA finished. Generations: {gen}  – Best TMT = {X_best[Nv]:.6f}')
+    if len(operator_stats) > 2 or crossover != "single_point" or mutation != "uniform":
+        log('    🧪 Operators: ' + ', '.join(
+            f"{op} {st['successes']}/{st['uses']}" for op, st in operator_stats.items()
+        ) + f' (sigma={sigma:.4f})', 2)
+    
+    return {
+        'population': X,
+        'best': X_best[:Nv],
+        'best_tmt': X_best[Nv],
+        'generations': gen,
+        'history': history,
+        'operator_stats': operator_stats,
+        'final_sigma': sigma,
+        'evaluations': GA_Ni + 2 * gen,  # Initial population plus two children per generation
+        'elapsed': time.perf_counter() - start
+    }
+
+def run_genetic_algorithm(scenario_id: str, scenario_data: Dict,
+                          initial_population: Optional[List[List[float]]] = None,
+                          max_generations: int = GA_maxGen,
+                          stall_generations: int = GA_iterno,
+                          init: str = GA_INIT,
+                          crossover: Optional[str] = None,
+                          mutation: Optional[str] = None,
+                          progress: Optional[Callable[[int, float, float], None]] = None) -> Dict[str, Any]:
+    """Run the GA for one scenario and return the full final state
+    
+    The state holds the relay order, optimized relay values, best TMT,
+    generation count and the final population (genes only), which is what
+    incremental re-optimization needs to warm-start a later run. ``init``
+    selects how the slots not covered by ``initial_population`` are filled;
+    ``crossover`` / ``mutation`` override GA_CROSSOVER / GA_MUTATION and
+    ``progress`` receives periodic (generation, best TMT, seconds) reports.
+    """
+    pairs = scenario_data["pairs"]
+    relays = [r for r in scenario_data["relays"] if str(r).strip()]
+    nR = len(relays)
+    
+    if nR == 0:
+        log(f'    ❌ Scenario "{scenario_id}" has no valid relays.', 0)
+        return {}
+
+    # Create relay index mapping
+    idx = {relays[i]: i for i in range(nR)}
+    curves = scenario_curves(scenario_data, relays)
+
+    # Define bounds
+    xmin, xmax = compute_bounds(relays, pairs)
+    Nv = 2 * nR  # Number of variables (TDS + pickup for each relay)
+
+    # Relay indices and fault currents of every pair, resolved once for the fitness loop
+    pair_data = [(idx[p["main_relay"]], idx[p["backup_relay"]], p["Ishc_main"], p["Ishc_backup"]) for p in pairs]
+    time_penalty = MAX_TIME * 10.0
+
+    if curves is None:
+        # Single default curve: constants as locals (same loop as pair_penalty, inlined)
+        A, B, P = CURVES[DEFAULT_CURVE]["A"], CURVES[DEFAULT_CURVE]["B"], CURVES[DEFAULT_CURVE]["p"]
+
+        def fitness(individual: List[float]) -> float:
+            """Calculate fitness function (TMT - Total Miscoordination Time)"""
+            tds = individual[:nR]
+            pu = individual[nR:]
+            tmt = 0.0
+            for mi, bi, Im, Ib in pair_data:
+                PU = pu[mi]
+                if Im <= PU:
+                    tM = time_penalty
+                else:
+                    try:
+                        tM = min(max(tds[mi] * (A / ((Im / PU) ** P - 1.0) + B), 0.0), time_penalty)
+                    except (ZeroDivisionError, OverflowError):
+                        tM = time_penalty
+                PU = pu[bi]
+                if Ib <= PU:
+                    tB = time_penalty
+                else:
+                    try:
+                        tB = min(max(tds[bi] * (A / ((Ib / PU) ** P - 1.0) + B), 0.0), time_penalty)
+                    except (ZeroDivisionError, OverflowError):
+                        tB = time_penalty
+                
+                # CTI violation penalty
+                if (tB - tM) < CTI:
+                    tmt += (CTI - (tB - tM))
+                
+                # Time limit penalty
+                if tM > MAX_TIME:
+                    tmt += (tM - MAX_TIME)
+            return tmt
+    else:
+        # Mixed curves: (A, B, p) of every relay resolved once
+        constants = curve_constants(curves)
+        cA, cB, cP = constants["A"], constants["B"], constants["p"]
+
+        def fitness(individual: List[float]) -> float:
+            """Calculate fitness function (TMT - Total Miscoordination Time)"""
+            tds = individual[:nR]
+            pu = individual[nR:]
+            tmt = 0.0
+            for mi, bi, Im, Ib in pair_data:
+                PU = pu[mi]
+                if Im <= PU:
+                    tM = time_penalty
+                else:
+                    try:
+                        tM = min(max(tds[mi] * (cA[mi] / ((Im / PU) ** cP[mi] - 1.0) + cB[mi]), 0.0), time_penalty)
+                    except (ZeroDivisionError, OverflowError):
+                        tM = time_penalty
+                PU = pu[bi]
+                if Ib <= PU:
+                    tB = time_penalty
+                else:
+                    try:
+                        tB = min(max(tds[bi] * (cA[bi] / ((Ib / PU) ** cP[bi] - 1.0) + cB[bi]), 0.0), time_penalty)
+                    except (ZeroDivisionError, OverflowError):
+                        tB = time_penalty
+                
+                if (tB - tM) < CTI:
+                    tmt += (CTI - (tB - tM))
+                if tM > MAX_TIME:
+                    tmt += (tM - MAX_TIME)
+            return tmt
+    
+    if init != "uniform":
+        seeds = list(initial_population or [])[:GA_Ni]
+        initial_population = seeds + constraint_aware_population(
+            relays, pairs, xmin, xmax, GA_Ni - len(seeds), init, curves
+        )
+
+    evolved = evolve_population(fitness, xmin, xmax, initial_population,
+                                max_generations, stall_generations,
+                                crossover=crossover, mutation=mutation, progress=progress)
     
     # Extract optimized values
-    best = X_best[:Nv]
+    best = evolved['best']
     TDSbest = best[:nR]
     PUbest = best[nR:]
     
@@ -316,29 +702,80 @@ def genetic_algorithm_optimization(scenario_id: str, scenario_data: Dict) -> Dic
         }
         for r in range(nR)
     }
+    if curves:
+        for r in range(nR):
+            optimized[relays[r]]["curve"] = curves[r]
     
-    return optimized
+    return {
+        'scenario_id': scenario_id,
+        'relays': relays,
+        'relay_values': optimized,
+        'best_tmt': evolved['best_tmt'],
+        'generations': evolved['generations'],
+        'history': evolved['history'],
+        'operator_stats': evolved['operator_stats'],
+        'evaluations': evolved['evaluations'],
+        'elapsed': evolved['elapsed'],
+        'population': [ind[:Nv] for ind in evolved['population']]
+    }
 
-def optimize_all_scenarios(paths: Dict) -> Dict[str, Any]:
-    """Optimize all scenarios using GA and return comprehensive results"""
-    print("🚀 Starting comprehensive GA optimization for all scenarios...")
+def ga_backend(name: Optional[str] = None) -> Callable[..., Dict[str, Any]]:
+    """GA runner of a backend; every backend takes run_genetic_algorithm's arguments and returns its state"""
+    name = name or GA_BACKEND
+    if name == "reference":
+        return run_genetic_algorithm
+    if name == "jit":
+        from ga_jit import jit_genetic_algorithm
+        return jit_genetic_algorithm
+    raise ValueError(f"Unknown GA backend '{name}' (expected one of {GA_BACKENDS})")
+
+def genetic_algorithm_optimization(scenario_id: str, scenario_data: Dict) -> Dict[str, Dict]:
+    """Genetic Algorithm optimization for relay coordination"""
+    state = run_genetic_algorithm(scenario_id, scenario_data)
+    return state.get('relay_values', {})
+
+def optimize_all_scenarios(paths: Dict,
+                           scenario_order: Optional[Callable[[Dict[str, Dict]], List[str]]] = None,
+                           seed_population: Optional[Callable[[str, Dict, Dict[str, Dict]], Optional[List[List[float]]]]] = None,
+                           store_state: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                           tracer: Optional[Tracer] = None,
+                           backend: Optional[str] = None) -> Dict[str, Any]:
+    """Optimize all scenarios using GA and return comprehensive results
+    
+    ``scenario_order`` maps the grouped scenarios to the order in which they are
+    solved; ``seed_population(sid, data, ga_states)`` may return individuals to
+    seed a scenario's initial population from the scenarios already solved;
+    ``store_state`` transforms each GA state before it is kept in memory.
+    The load, group, validate and per-scenario GA phases are recorded as
+    spans of ``tracer``; ``backend`` selects the GA engine (GA_BACKEND).
+    """
+    tracer = tracer or Tracer()
+    backend = backend or GA_BACKEND
+    run_ga = ga_backend(backend)
+    log("🚀 Starting comprehensive GA optimization for all scenarios...")
     
     # Load input data
-    print(f"📂 Loading data from: {paths['input_file']}")
-    with open(paths['input_file'], "r", encoding="utf-8") as f:
-        raw_data = json.load(f)
+    log(f"📂 Loading data from: {paths['input_file']}")
+    with tracer.span("load", input_file=str(paths['input_file'])) as span:
+        with open(paths['input_file'], "r", encoding="utf-8") as f:
+            raw_data = json.load(f)
+        span['records'] = len(raw_data) if isinstance(raw_data, list) else None
     
     if not isinstance(raw_data, list):
         raise TypeError("Input JSON must be a list of relay pairs")
     
-    print(f"📊 Loaded {len(raw_data)} relay pairs from JSON")
+    log(f"📊 Loaded {len(raw_data)} relay pairs from JSON")
     
     # Group data by scenario
-    print("🔄 Grouping data by scenario...")
-    scenario_map = group_data_by_scenario(raw_data)
-    scenario_ids = sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+    log("🔄 Grouping data by scenario...")
+    with tracer.span("group") as span:
+        scenario_map = group_data_by_scenario(raw_data)
+        scenario_ids = sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+        if scenario_order is not None:
+            scenario_ids = scenario_order(scenario_map)
+        span['scenarios'] = len(scenario_ids)
     
-    print(f"📋 Found {len(scenario_ids)} scenarios: {', '.join(scenario_ids)}")
+    log(f"📋 Found {len(scenario_ids)} scenarios: {', '.join(scenario_ids)}")
     
     # Initialize results tracking
     results = {
@@ -351,7 +788,8 @@ def optimize_all_scenarios(paths: Dict) -> Dict[str, Any]:
             'skipped_scenarios': 0,
             'processing_time': 0
         },
-        'timestamp': datetime.now(timezone.utc).isoformat()
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'ga_states': {}
     }
     
     start_time = datetime.now()
@@ -359,15 +797,17 @@ def optimize_all_scenarios(paths: Dict) -> Dict[str, Any]:
     # Process each scenario
     for i, sid in enumerate(scenario_ids, 1):
         data = scenario_map[sid]
-        print(f"\n{'='*60}")
-        print(f"🎯 Scenario {i}/{len(scenario_ids)}: {sid}")
-        print(f"   📊 Pairs: {len(data['pairs'])}, Relays: {len(data['relays'])}")
-        print(f"   🔧 Fault types: {data['fault_types']}")
+        log(f"\n{'='*60}")
+        log(f"🎯 Scenario {i}/{len(scenario_ids)}: {sid}")
+        log(f"   📊 Pairs: {len(data['pairs'])}, Relays: {len(data['relays'])}")
+        log(f"   🔧 Fault types: {data['fault_types']}", 2)
         
         # Validate scenario data
-        is_valid, issues = validate_scenario_data(data)
+        with tracer.span("validate", scenario_id=sid) as span:
+            is_valid, issues = validate_scenario_data(data)
+            span.update(valid=is_valid, issues=len(issues))
         if not is_valid:
-            print(f"   ❌ Skipping scenario {sid}: {', '.join(issues)}")
+            log(f"   ❌ Skipping scenario {sid}: {', '.join(issues)}", 0)
             results['optimization_summary']['skipped_scenarios'] += 1
             results['scenario_statistics'][sid] = {
                 'status': 'skipped',
@@ -379,8 +819,15 @@ def optimize_all_scenarios(paths: Dict) -> Dict[str, Any]:
         
         try:
             # Run GA optimization
-            print(f"   🔬 Running GA optimization...")
-            optimized_values = genetic_algorithm_optimization(sid, data)
+            log(f"   🔬 Running GA optimization...")
+            with tracer.span("ga", scenario_id=sid, backend=backend, pairs=len(data['pairs']), relays=len(data['relays'])) as span:
+                seeds = seed_population(sid, data, results['ga_states']) if seed_population else None
+                ga_state = run_ga(sid, data, initial_population=seeds)
+                if ga_state:
+                    span.update(generations=ga_state['generations'], evaluations=ga_state['evaluations'],
+                                evals_per_sec=ga_state['evaluations'] / ga_state['elapsed'] if ga_state['elapsed'] else None,
+                                best_tmt=ga_state['best_tmt'])
+            optimized_values = ga_state.get('relay_values', {})
             
             if optimized_values:
                 results['optimization_results'][sid] = {
@@ -390,8 +837,14 @@ def optimize_all_scenarios(paths: Dict) -> Dict[str, Any]:
                     'initial_settings': data['initial_settings'],
                     'pairs_count': len(data['pairs']),
                     'relays_count': len(data['relays']),
-                    'fault_types': data['fault_types']
+                    'fault_types': data['fault_types'],
+                    'best_tmt': ga_state['best_tmt'],
+                    'generations': ga_state['generations'],
+                    'evaluations': ga_state['evaluations'],
+                    'seconds': ga_state['elapsed']
                 }
+                ga_state = {**ga_state, 'pairs': data['pairs']}
+                results['ga_states'][sid] = store_state(ga_state) if store_state else ga_state
                 
                 results['optimization_summary']['successful_optimizations'] += 1
                 results['scenario_statistics'][sid] = {
@@ -401,9 +854,9 @@ def optimize_all_scenarios(paths: Dict) -> Dict[str, Any]:
                     'optimized_relays': len(optimized_values)
                 }
                 
-                print(f"   ✅ Optimization successful: {len(optimized_values)} relays optimized")
+                log(f"   ✅ Optimization successful: {len(optimized_values)} relays optimized")
             else:
-                print(f"   ❌ Optimization failed: No results produced")
+                log(f"   ❌ Optimization failed: No results produced", 0)
                 results['optimization_summary']['failed_optimizations'] += 1
                 results['scenario_statistics'][sid] = {
                     'status': 'failed',
@@ -413,7 +866,7 @@ def optimize_all_scenarios(paths: Dict) -> Dict[str, Any]:
                 }
                 
         except Exception as e:
-            print(f"   ❌ Optimization failed with error: {str(e)}")
+            log(f"   ❌ Optimization failed with error: {str(e)}", 0)
             results['optimization_summary']['failed_optimizations'] += 1
             results['scenario_statistics'][sid] = {
                 'status': 'error',
@@ -427,183 +880,236 @@ def optimize_all_scenarios(paths: Dict) -> Dict[str, Any]:
     processing_time = (end_time - start_time).total_seconds()
     results['optimization_summary']['processing_time'] = processing_time
     
-    print(f"\n{'='*60}")
-    print("🏁 OPTIMIZATION SUMMARY")
-    print(f"   ⏱️  Total processing time: {processing_time:.2f} seconds")
-    print(f"   ✅ Successful optimizations: {results['optimization_summary']['successful_optimizations']}")
-    print(f"   ❌ Failed optimizations: {results['optimization_summary']['failed_optimizations']}")
-    print(f"   ⏭️  Skipped scenarios: {results['optimization_summary']['skipped_scenarios']}")
-    print(f"   📊 Success rate: {results['optimization_summary']['successful_optimizations']/len(scenario_ids)*100:.1f}%")
+    log(f"\n{'='*60}")
+    log("🏁 OPTIMIZATION SUMMARY")
+    log(f"   ⏱️  Total processing time: {processing_time:.2f} seconds")
+    log(f"   ✅ Successful optimizations: {results['optimization_summary']['successful_optimizations']}")
+    log(f"   ❌ Failed optimizations: {results['optimization_summary']['failed_optimizations']}")
+    log(f"   ⏭️  Skipped scenarios: {results['optimization_summary']['skipped_scenarios']}")
+    log(f"   📊 Success rate: {results['optimization_summary']['successful_optimizations']/len(scenario_ids)*100:.1f}%")
     
     return results
 
 def save_optimization_results(results: Dict[str, Any], paths: Dict) -> Dict[str, str]:
-    """Save optimization results in organized structure"""
+    """Save optimization results in organized structure
+    
+    The results database is the record of every run; the comprehensive JSON
+    and summary are kept for compatibility, per-scenario files only with
+    EXPORT_SCENARIO_FILES.
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     saved_files = {}
     
-    print("💾 Saving optimization results...")
+    log("💾 Saving optimization results...")
     
     # 1. Save comprehensive results file
     comprehensive_file = paths['data_processed'] / f"ga_optimization_all_scenarios_comprehensive_{timestamp}.json"
     with open(comprehensive_file, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        json.dump({k: v for k, v in results.items() if k != 'ga_states'}, f, indent=2, ensure_ascii=False)
     saved_files['comprehensive_results'] = str(comprehensive_file)
-    print(f"   📄 Comprehensive results: {comprehensive_file}")
+    log(f"   📄 Comprehensive results: {comprehensive_file}")
     
-    # 2. Save individual scenario optimization files
-    for scenario_id, scenario_result in results['optimization_results'].items():
-        scenario_file = paths['data_processed'] / f"optimized_relay_values_{scenario_id}_GA_{timestamp}.json"
-        with open(scenario_file, "w", encoding="utf-8") as f:
-            json.dump([scenario_result], f, indent=2, ensure_ascii=False)
-        saved_files[f'scenario_{scenario_id}'] = str(scenario_file)
+    # 2. Save individual scenario optimization files (legacy, see EXPORT_SCENARIO_FILES)
+    if EXPORT_SCENARIO_FILES:
+        for scenario_id, scenario_result in results['optimization_results'].items():
+            scenario_file = paths['data_processed'] / f"optimized_relay_values_{scenario_id}_GA_{timestamp}.json"
+            with open(scenario_file, "w", encoding="utf-8") as f:
+                json.dump([scenario_result], f, indent=2, ensure_ascii=False)
+            saved_files[f'scenario_{scenario_id}'] = str(scenario_file)
+        log(f"   📄 Individual scenario files: {len(results['optimization_results'])} files saved")
     
-    print(f"   📄 Individual scenario files: {len(results['optimization_results'])} files saved")
+    # 3. Save latest GA state per scenario (warm start for incremental re-optimization)
+    for scenario_id, ga_state in results.get('ga_states', {}).items():
+        saved_files[f'ga_state_{scenario_id}'] = str(save_ga_state(ga_state, paths))
     
-    # 3. Save optimization summary as JSON
+    # 4. Save optimization summary as JSON
     summary_file = paths['tables'] / f"ga_optimization_summary_{timestamp}.json"
     with open(summary_file, "w", encoding="utf-8") as f:
         json.dump(results['optimization_summary'], f, indent=2, ensure_ascii=False)
     saved_files['summary_json'] = str(summary_file)
-    print(f"   📊 Summary JSON: {summary_file}")
+    log(f"   📊 Summary JSON: {summary_file}")
+    
+    # 5. Record the run in the results database (one transaction)
+    conn = open_store(paths)
+    try:
+        run_id = record_run(
+            conn, results['optimization_results'],
+            ga_params={'population': GA_Ni, 'max_generations': GA_maxGen, 'stall_generations': GA_iterno,
+                       'mutations': GA_nMut, 'crossover': GA_CROSSOVER, 'mutation': GA_MUTATION, 'init': GA_INIT},
+            summary=results['optimization_summary']
+        )
+    finally:
+        conn.close()
+    saved_files['run_id'] = run_id
+    log(f"   🗄️  Results database run: {run_id}")
     
     return saved_files
 
+def save_ga_state(ga_state: Dict[str, Any], paths: Dict) -> Path:
+    """Save the final GA state of a scenario, overwriting the previous one"""
+    state_file = paths['ga_state'] / f"ga_state_{ga_state['scenario_id']}.json"
+    with open(state_file, "w", encoding="utf-8") as f:
+        # Compact states may hold NumPy population matrices
+        json.dump(ga_state, f, ensure_ascii=False, default=lambda o: o.tolist())
+    return state_file
+
+def load_ga_state(scenario_id: str, paths: Dict) -> Optional[Dict[str, Any]]:
+    """Load the last saved GA state of a scenario, if any"""
+    state_file = paths['ga_state'] / f"ga_state_{scenario_id}.json"
+    if not state_file.exists():
+        return None
+    with open(state_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 def update_relay_pairs_with_optimization(raw_data: List[Dict], results: Dict[str, Any], paths: Dict) -> Dict[str, str]:
     """Update relay pairs with optimized settings and save organized files"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     saved_files = {}
     
-    print("🔄 Updating relay pairs with optimized settings...")
+    log("🔄 Updating relay pairs with optimized settings...")
     
-    # Create optimization mapping by scenario
-    opt_mapping = {}
-    for scenario_id, scenario_result in results['optimization_results'].items():
-        opt_mapping[scenario_id] = {
-            name: (vals["pickup"], vals["TDS"])
-            for name, vals in scenario_result['relay_values'].items()
-        }
+    # Gather settings and compute all Time_out values at once (raw_data is left untouched)
+    settings = {
+        scenario_id: scenario_result['relay_values']
+        for scenario_id, scenario_result in results['optimization_results'].items()
+    }
+    applied = apply_settings(pair_columns(raw_data), settings)
     
-    # Group data by scenario for processing
-    scenario_groups = {}
-    for entry in raw_data:
-        sid = entry.get("scenario_id")
-        if sid not in scenario_groups:
-            scenario_groups[sid] = []
-        scenario_groups[sid].append(entry)
-    
-    # Update each scenario's pairs
-    for scenario_id, scenario_pairs in scenario_groups.items():
-        if scenario_id not in opt_mapping:
-            print(f"   ⚠️  No optimization results for {scenario_id}, skipping...")
+    # Pair indices by scenario (in input order)
+    scenario_index = {}
+    for i, entry in enumerate(raw_data):
+        scenario_index.setdefault(entry.get("scenario_id"), []).append(i)
+    
+    # Build and save each scenario's pairs before the next one (one scenario of new records in memory)
+    for scenario_id, index in scenario_index.items():
+        if scenario_id not in settings:
+            log(f"   ⚠️  No optimization results for {scenario_id}, skipping...")
             continue
             
-        opt_map = opt_mapping[scenario_id]
-        updated_pairs = []
-        
-        for pair in scenario_pairs:
-            # Update main relay
-            main_relay = pair.get("main_relay", {})
-            main_name = main_relay.get("relay")
-            if main_name in opt_map:
-                pu, tds = opt_map[main_name]
-                main_relay["pick_up"] = pu
-                main_relay["TDS"] = tds
-                ishc_m = get_numeric_field(main_relay, ["Ishc", "I_shc", "Isc", "fault_current"])
-                if ishc_m:
-                    main_relay["Time_out"] = time_iec(ishc_m, pu, tds)
-            
-            # Update backup relay
-            backup_relay = pair.get("backup_relay", {})
-            backup_name = backup_relay.get("relay")
-            if backup_name in opt_map:
-                pu, tds = opt_map[backup_name]
-                backup_relay["pick_up"] = pu
-                backup_relay["TDS"] = tds
-                ishc_b = get_numeric_field(backup_relay, ["Ishc", "I_shc", "Isc", "fault_current"])
-                if ishc_b:
-                    backup_relay["Time_out"] = time_iec(ishc_b, pu, tds)
-            
-            updated_pairs.append(pair)
+        scenario_file = pairs_path(paths['data_processed'], f"automation_results_{scenario_id}_optimized_{timestamp}", PAIRS_FORMAT)
+        scenario_pairs = updated_records([raw_data[i] for i in index],
+                                         {name: values[:, index] for name, values in applied.items()})
         
-        # Save updated pairs for this scenario
-        scenario_file = paths['data_processed'] / f"automation_results_{scenario_id}_optimized_{timestamp}.json"
-        with open(scenario_file, "w", encoding="utf-8") as f:
-            json.dump(updated_pairs, f, indent=2, ensure_ascii=False)
+        # Stream updated pairs to disk
+        with PairWriter(scenario_file) as writer:
+            for pair in scenario_pairs:
+                writer.write(pair)
         saved_files[f'optimized_pairs_{scenario_id}'] = str(scenario_file)
         
-        print(f"   ✅ Updated {len(updated_pairs)} pairs for {scenario_id}")
+        log(f"   ✅ Updated {writer.count} pairs for {scenario_id}")
     
-    print(f"   📄 Saved {len(saved_files)} optimized pair files")
+    log(f"   📄 Saved {len(saved_files)} optimized pair files")
     return saved_files
 
-def main():
-    """Main execution function"""
-    print("🚀 INITIALIZING FAST GA OPTIMIZATION")
-    print("="*60)
+def write_trace(tracer: Tracer, paths: Dict, chrome_trace: bool = TRACE_CHROME) -> Dict[str, str]:
+    """Write the run's spans as JSON lines (and optionally as a Chrome trace) to the tables directory"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    trace_files = {'spans': str(tracer.write_jsonl(paths['tables'] / f"ga_spans_{timestamp}.jsonl"))}
+    if chrome_trace:
+        trace_files['chrome_trace'] = str(tracer.write_chrome_trace(paths['tables'] / f"ga_trace_{timestamp}.json"))
+    return trace_files
+
+def main(verbosity: Optional[int] = None, chrome_trace: bool = TRACE_CHROME, backend: Optional[str] = None):
+    """Main execution function
+    
+    ``verbosity`` sets the console level (see instrumentation.VERBOSITY);
+    phase timings are always written as spans, ``chrome_trace`` also exports
+    them for chrome://tracing. ``backend`` selects the GA engine (GA_BACKEND).
+    """
+    if verbosity is not None:
+        set_verbosity(verbosity)
+    tracer = Tracer()
+    print_banner()
+    log("🚀 INITIALIZING FAST GA OPTIMIZATION")
+    log("="*60)
     
     paths = setup_paths()
-    print(f"📁 Project root: {paths['project_root']}")
-    print(f"📂 Input file: {paths['input_file']}")
-    print(f"💾 Output directory: {paths['data_processed']}")
-    print(f"📊 Results directory: {paths['results']}")
+    log(f"📁 Project root: {paths['project_root']}")
+    log(f"📂 Input file: {paths['input_file']}")
+    log(f"💾 Output directory: {paths['data_processed']}")
+    log(f"📊 Results directory: {paths['results']}")
     
     # Check if input file exists
     if not paths['input_file'].exists():
         raise FileNotFoundError(f"Input file not found: {paths['input_file']}")
     
-    print(f"\n✅ All paths validated successfully")
-    print("="*60)
+    log(f"\n✅ All paths validated successfully")
+    log("="*60)
     
     try:
-        # Perform batch optimization
-        optimization_results = optimize_all_scenarios(paths)
-        
-        # Save optimization results
-        print(f"\n{'='*60}")
-        print("💾 SAVING OPTIMIZATION RESULTS")
-        print("="*60)
-        
-        saved_files = save_optimization_results(optimization_results, paths)
-        
-        # Update relay pairs with optimized settings
-        print(f"\n{'='*60}")
-        print("🔄 UPDATING RELAY PAIRS")
-        print("="*60)
-        
-        # Load raw data for updating pairs
-        with open(paths['input_file'], "r", encoding="utf-8") as f:
-            raw_data = json.load(f)
-        
-        updated_files = update_relay_pairs_with_optimization(raw_data, optimization_results, paths)
+        with tracer.span("run"):
+            # Perform batch optimization
+            optimization_results = optimize_all_scenarios(paths, tracer=tracer, backend=backend)
+            
+            # Save optimization results
+            log(f"\n{'='*60}")
+            log("💾 SAVING OPTIMIZATION RESULTS")
+            log("="*60)
+            
+            with tracer.span("save") as span:
+                saved_files = save_optimization_results(optimization_results, paths)
+                span['files'] = len(saved_files) - 1
+            
+            # Update relay pairs with optimized settings
+            log(f"\n{'='*60}")
+            log("🔄 UPDATING RELAY PAIRS")
+            log("="*60)
+            
+            with tracer.span("update") as span:
+                # Load raw data for updating pairs
+                with open(paths['input_file'], "r", encoding="utf-8") as f:
+                    raw_data = json.load(f)
+                
+                updated_files = update_relay_pairs_with_optimization(raw_data, optimization_results, paths)
+                span.update(pairs=len(raw_data), files=len(updated_files))
+            
+            # Record the run's artifacts in the manifest
+            run_id = saved_files.pop('run_id')
+            write_run_manifest(paths['data_processed'], run_id, {**saved_files, **updated_files}, params={
+                'population': GA_Ni, 'max_generations': GA_maxGen, 'stall_generations': GA_iterno,
+                'input_file': str(paths['input_file'])
+            })
+            log(f"📒 Run manifest updated: {run_id}")
         
         # Final summary
-        print(f"\n{'='*60}")
-        print("🎉 OPTIMIZATION COMPLETED SUCCESSFULLY!")
-        print("="*60)
+        log(f"\n{'='*60}")
+        log("🎉 OPTIMIZATION COMPLETED SUCCESSFULLY!")
+        log("="*60)
         
         summary = optimization_results['optimization_summary']
-        print(f"📊 FINAL STATISTICS:")
-        print(f"   • Total scenarios processed: {summary['total_scenarios']}")
-        print(f"   • Successful optimizations: {summary['successful_optimizations']}")
-        print(f"   • Failed optimizations: {summary['failed_optimizations']}")
-        print(f"   • Skipped scenarios: {summary['skipped_scenarios']}")
-        print(f"   • Success rate: {summary['successful_optimizations']/summary['total_scenarios']*100:.1f}%")
-        print(f"   • Processing time: {summary['processing_time']:.2f} seconds")
-        print(f"   • Files generated: {len(saved_files) + len(updated_files)}")
+        log(f"📊 FINAL STATISTICS:")
+        log(f"   • Total scenarios processed: {summary['total_scenarios']}")
+        log(f"   • Successful optimizations: {summary['successful_optimizations']}")
+        log(f"   • Failed optimizations: {summary['failed_optimizations']}")
+        log(f"   • Skipped scenarios: {summary['skipped_scenarios']}")
+        log(f"   • Success rate: {summary['successful_optimizations']/summary['total_scenarios']*100:.1f}%")
+        log(f"   • Processing time: {summary['processing_time']:.2f} seconds")
+        log(f"   • Files generated: {len(saved_files) + len(updated_files)}")
+        
+        log(f"\n⏱️  PHASE TIMING:")
+        for name, total in tracer.totals().items():
+            log(f"   • {name}: {total['seconds']:.2f}s ({total['count']}x)")
         
-        print(f"\n📁 GENERATED FILES:")
+        log(f"\n📁 GENERATED FILES:", 2)
         all_files = {**saved_files, **updated_files}
         for file_type, file_path in all_files.items():
-            print(f"   • {file_type}: {file_path}")
+            log(f"   • {file_type}: {file_path}", 2)
         
-        print(f"\n✅ All operations completed successfully!")
+        log(f"\n✅ All operations completed successfully!")
         
     except Exception as e:
-        print(f"\n❌ ERROR during optimization: {str(e)}")
+        log(f"\n❌ ERROR during optimization: {str(e)}", 0)
         import traceback
         traceback.print_exc()
         raise
+    finally:
+        for file_type, file_path in write_trace(tracer, paths, chrome_trace).items():
+            log(f"📈 Trace ({file_type}): {file_path}")
 
 if __name__ == "__main__":
-    main()
+    # -q: errors only, -v: GA generations and span timings, --trace: Chrome trace export,
+    # --backend=<name>: GA engine (see GA_BACKENDS)
+    args = sys.argv[1:]
+    main(verbosity=0 if "-q" in args else 2 if "-v" in args else None,
+         chrome_trace=TRACE_CHROME or "--trace" in args,
+         backend=next((a.split("=", 1)[1] for a in args if a.startswith("--backend=")), None))
@@ -5,12 +5,22 @@ Script to generate comprehensive report for all 68 scenarios
 Avoids NumPy compatibility issues by using basic Python libraries
 """
 
+import hashlib
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+from pairs_io import find_pairs_file, iter_pairs
+from run_manifest import atomic_write_json, file_sha256
+
+FRAGMENT_DIR = "report_fragments"   # Per-scenario fragment cache under data/processed
+FRAGMENT_VERSION = 1                # Bump when fragment metrics change
+REPORT_CTI = 0.2
+REPORT_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
 def load_data(file_path):
     """Load JSON data from file."""
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -92,12 +102,75 @@ def extract_scenarios(data):
             scenarios.add(pair['scenario_id'])
     return sorted(list(scenarios))
 
-def generate_comprehensive_report():
-    """Generate comprehensive report for all 68 scenarios."""
+def scenario_fragment(scenario, original_pairs, optimized_file, cti=REPORT_CTI):
+    """Before/after metrics of one scenario (one report fragment)."""
+    original_metrics = calculate_tmt_metrics(original_pairs, cti)
+    
+    if optimized_file is not None:
+        try:
+            optimized_pairs = [pair for pair in iter_pairs(optimized_file) if pair.get('scenario_id') == scenario]
+            optimized_metrics = calculate_tmt_metrics(optimized_pairs, cti)
+            
+            # Calculate improvements
+            tmt_improvement = optimized_metrics['tmt_signed'] - original_metrics['tmt_signed']
+            coord_improvement = optimized_metrics['coordination_percentage'] - original_metrics['coordination_percentage']
+            
+            return {
+                'has_optimization': True,
+                'before': original_metrics,
+                'after': optimized_metrics,
+                'improvements': {
+                    'tmt_improvement': tmt_improvement,
+                    'coord_improvement': coord_improvement,
+                    'tmt_improvement_pct': (tmt_improvement / abs(original_metrics['tmt_signed']) * 100) if original_metrics['tmt_signed'] != 0 else 0,
+                    'coord_improvement_pct': coord_improvement
+                }
+            }
+            
+        except Exception as e:
+            print(f"    ⚠️  Error loading optimized data for {scenario}: {e}")
+    
+    return {
+        'has_optimization': False,
+        'before': original_metrics,
+        'after': None,
+        'improvements': None
+    }
+
+def fragment_key(original_pairs, optimized_file, cti=REPORT_CTI):
+    """Hash of everything a scenario fragment depends on (pairs, optimized file, settings)."""
+    digest = hashlib.sha256(f"v{FRAGMENT_VERSION}|cti={cti}|".encode("utf-8"))
+    digest.update(json.dumps(original_pairs, sort_keys=True).encode("utf-8"))
+    if optimized_file is not None:
+        digest.update(f"|{file_sha256(optimized_file)}".encode("utf-8"))
+    return digest.hexdigest()
+
+def load_fragment(fragment_dir, scenario, key):
+    """Cached fragment of a scenario if it was computed for the same key."""
+    fragment_file = fragment_dir / f"{scenario}.json"
+    if not fragment_file.exists():
+        return None
+    try:
+        cached = load_data(fragment_file)
+    except ValueError:
+        return None
+    return cached['fragment'] if cached.get('key') == key else None
+
+def save_fragment(fragment_dir, scenario, key, fragment):
+    """Cache a scenario fragment under its key."""
+    atomic_write_json(fragment_dir / f"{scenario}.json", {'key': key, 'fragment': fragment})
+
+def generate_comprehensive_report(project_root=None, optimized_files=None):
+    """Generate comprehensive report for all 68 scenarios.
+    
+    ``optimized_files`` maps scenario IDs to optimized pair files (e.g. the
+    artifacts of a recorded run); by default they are looked up by name in
+    data/processed. Returns the report and CSV paths.
+    """
     print("🚀 Starting comprehensive analysis of all 68 scenarios...")
     
     # Setup paths
-    project_root = Path.cwd()
+    project_root = Path(project_root) if project_root else Path.cwd()
     data_file = project_root / "data" / "raw" / "automation_results.json"
     processed_dir = project_root / "data" / "processed"
     results_dir = project_root / "results"
@@ -114,62 +187,51 @@ def generate_comprehensive_report():
     original_scenarios = extract_scenarios(original_data)
     print(f"✅ Found {len(original_scenarios)} scenarios in original data")
     
-    # Analyze all scenarios
+    # Analyze all scenarios (per-scenario fragments, cached and computed in parallel)
     all_scenario_results = {}
     scenarios_with_optimization = []
     scenarios_without_optimization = []
     
     print("\n🔍 Analyzing all scenarios...")
     
-    for i, scenario in enumerate(original_scenarios, 1):
-        print(f"  {i:2d}/68: Analyzing {scenario}...")
-        
-        # Get original data for this scenario
-        original_pairs = [pair for pair in original_data if pair.get('scenario_id') == scenario]
-        original_metrics = calculate_tmt_metrics(original_pairs)
-        
+    pairs_by_scenario = defaultdict(list)
+    for pair in original_data:
+        pairs_by_scenario[pair.get('scenario_id')].append(pair)
+    
+    fragment_dir = processed_dir / FRAGMENT_DIR
+    fragment_dir.mkdir(parents=True, exist_ok=True)
+    
+    missing = []
+    for scenario in original_scenarios:
         # Check if optimized data exists
-        optimized_file = processed_dir / f"automation_results_{scenario}_optimized.json"
+        if optimized_files is not None:
+            optimized_file = optimized_files.get(scenario)
+        else:
+            optimized_file = find_pairs_file(processed_dir, f"automation_results_{scenario}_optimized")
         
-        if optimized_file.exists():
-            try:
-                optimized_data = load_data(optimized_file)
-                optimized_pairs = [pair for pair in optimized_data if pair.get('scenario_id') == scenario]
-                optimized_metrics = calculate_tmt_metrics(optimized_pairs)
-                
-                # Calculate improvements
-                tmt_improvement = optimized_metrics['tmt_signed'] - original_metrics['tmt_signed']
-                coord_improvement = optimized_metrics['coordination_percentage'] - original_metrics['coordination_percentage']
-                
-                all_scenario_results[scenario] = {
-                    'has_optimization': True,
-                    'before': original_metrics,
-                    'after': optimized_metrics,
-                    'improvements': {
-                        'tmt_improvement': tmt_improvement,
-                        'coord_improvement': coord_improvement,
-                        'tmt_improvement_pct': (tmt_improvement / abs(original_metrics['tmt_signed']) * 100) if original_metrics['tmt_signed'] != 0 else 0,
-                        'coord_improvement_pct': coord_improvement
-                    }
-                }
-                scenarios_with_optimization.append(scenario)
-                
-            except Exception as e:
-                print(f"    ⚠️  Error loading optimized data: {e}")
-                all_scenario_results[scenario] = {
-                    'has_optimization': False,
-                    'before': original_metrics,
-                    'after': None,
-                    'improvements': None
-                }
-                scenarios_without_optimization.append(scenario)
+        key = fragment_key(pairs_by_scenario[scenario], optimized_file)
+        fragment = load_fragment(fragment_dir, scenario, key)
+        if fragment is None:
+            missing.append((scenario, pairs_by_scenario[scenario], optimized_file, key))
+        else:
+            all_scenario_results[scenario] = fragment
+    
+    print(f"  ♻️  {len(all_scenario_results)} cached fragments, computing {len(missing)}")
+    if len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=REPORT_WORKERS) as pool:
+            computed = list(pool.map(scenario_fragment, *zip(*[m[:3] for m in missing])))
+    else:
+        computed = [scenario_fragment(*m[:3]) for m in missing]
+    for (scenario, _, _, key), fragment in zip(missing, computed):
+        save_fragment(fragment_dir, scenario, key, fragment)
+        all_scenario_results[scenario] = fragment
+    
+    # Merge fragments in scenario order
+    all_scenario_results = {scenario: all_scenario_results[scenario] for scenario in original_scenarios}
+    for scenario, fragment in all_scenario_results.items():
+        if fragment['has_optimization']:
+            scenarios_with_optimization.append(scenario)
         else:
-            all_scenario_results[scenario] = {
-                'has_optimization': False,
-                'before': original_metrics,
-                'after': None,
-                'improvements': None
-            }
             scenarios_without_optimization.append(scenario)
     
     print(f"\n📊 Analysis Summary:")
@@ -188,7 +250,7 @@ def generate_comprehensive_report():
         f.write("=" * 60 + "\n\n")
         f.write(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"Data Source: {data_file.name}\n")
-        f.write(f"CTI Threshold: 0.2 seconds\n")
+        f.write(f"CTI Threshold: {REPORT_CTI} seconds\n")
         f.write(f"Total Scenarios Analyzed: {len(all_scenario_results)}\n")
         f.write(f"Scenarios with Optimization: {len(scenarios_with_optimization)}\n")
         f.write(f"Scenarios without Optimization: {len(scenarios_without_optimization)}\n\n")
@@ -299,6 +361,8 @@ def generate_comprehensive_report():
     if scenarios_with_optimization:
         print(f"  Mean TMT Improvement: {sum(opt_tmt_improvements)/len(opt_tmt_improvements):+.3f}s")
         print(f"  Mean Coord Improvement: {sum(opt_coord_improvements)/len(opt_coord_improvements):+.1f}%")
+    
+    return report_file, csv_file
 
 if __name__ == "__main__":
     generate_comprehensive_report()
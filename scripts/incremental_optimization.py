@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Incremental GA re-optimization for scenarios whose pairs changed
+Diffs each scenario against its last optimized GA state and only re-runs a
+short repair search when the changed pairs break coordination
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple, Optional, Any
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, compute_bounds,
+    pair_penalty, scenario_curves, run_genetic_algorithm, save_ga_state, load_ga_state
+)
+
+# Repair search budget (much shorter than a full GA run)
+GA_REPAIR_MAXGEN = 200
+GA_REPAIR_ITERNO = 100
+
+ISHC_TOLERANCE = 1e-9
+
+def pair_key(pair: Dict) -> Tuple[str, str, str]:
+    """Identity of a relay pair inside a scenario"""
+    return (pair["main_relay"], pair["backup_relay"], str(pair.get("fault", "unknown")))
+
+def diff_scenario_pairs(old_pairs: List[Dict], new_pairs: List[Dict]) -> Dict[str, Any]:
+    """Diff two pair lists by pair key (added, removed, Ishc-changed, unchanged count)"""
+    old_by_key = {pair_key(p): p for p in old_pairs}
+    new_by_key = {pair_key(p): p for p in new_pairs}
+
+    added = [p for k, p in new_by_key.items() if k not in old_by_key]
+    removed = [p for k, p in old_by_key.items() if k not in new_by_key]
+    changed = []
+    unchanged = 0
+    for k, p in new_by_key.items():
+        if k not in old_by_key:
+            continue
+        old = old_by_key[k]
+        if (abs(p["Ishc_main"] - old["Ishc_main"]) > ISHC_TOLERANCE or
+                abs(p["Ishc_backup"] - old["Ishc_backup"]) > ISHC_TOLERANCE):
+            changed.append(p)
+        else:
+            unchanged += 1
+
+    return {'added': added, 'removed': removed, 'changed': changed, 'unchanged': unchanged}
+
+def remap_population(population: List[List[float]], old_relays: List[str], new_relays: List[str],
+                     xmin: List[float], xmax: List[float]) -> Tuple[List[List[float]], List[str]]:
+    """Map a previous population onto a new relay order and bounds
+
+    Relays that did not exist before start at the midpoint of their bounds and
+    genes outside the new bounds are clipped. Returns the remapped population
+    and the relays whose settings in the best individual had to be touched.
+    """
+    nR_old = len(old_relays)
+    nR = len(new_relays)
+    old_idx = {old_relays[i]: i for i in range(nR_old)}
+
+    remapped = []
+    touched = set()
+    for k, ind in enumerate(population):
+        genes = []
+        for j in range(2 * nR):
+            relay = new_relays[j % nR]
+            if relay in old_idx:
+                value = ind[old_idx[relay] + (nR_old if j >= nR else 0)]
+            else:
+                value = 0.5 * (xmin[j] + xmax[j])
+                touched.add(relay)
+            clipped = min(max(value, xmin[j]), xmax[j])
+            if k == 0 and clipped != value:
+                touched.add(relay)
+            genes.append(clipped)
+        remapped.append(genes)
+
+    return remapped, sorted(touched)
+
+def incremental_reoptimize(scenario_id: str, scenario_data: Dict, previous_state: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-optimize a scenario starting from its previous GA state
+
+    Only pairs that were added, changed, or that involve relays whose settings
+    had to be adjusted are re-checked against the previous best settings. If
+    none of them is miscoordinated the previous settings are kept; otherwise a
+    short repair GA is seeded with the previous final population.
+    """
+    pairs = scenario_data["pairs"]
+    relays = [r for r in scenario_data["relays"] if str(r).strip()]
+    nR = len(relays)
+
+    diff = diff_scenario_pairs(previous_state["pairs"], pairs)
+    report = {
+        'added_pairs': len(diff['added']),
+        'removed_pairs': len(diff['removed']),
+        'changed_pairs': len(diff['changed']),
+        'unchanged_pairs': diff['unchanged']
+    }
+
+    xmin, xmax = compute_bounds(relays, pairs)
+    population, touched = remap_population(
+        previous_state["population"], previous_state["relays"], relays, xmin, xmax
+    )
+    touched_set = set(touched)
+
+    # Re-check only the affected pairs with the previous best settings
+    affected = diff['added'] + diff['changed']
+    affected_keys = {pair_key(p) for p in affected}
+    affected += [
+        p for p in pairs
+        if pair_key(p) not in affected_keys and (p["main_relay"] in touched_set or p["backup_relay"] in touched_set)
+    ]
+
+    idx = {relays[i]: i for i in range(nR)}
+    curves = scenario_curves(scenario_data, relays)
+    best = population[0]
+    tds, pu = best[:nR], best[nR:]
+    violations = [p for p in affected if pair_penalty(p, tds, pu, idx, curves) > 0.0]
+
+    report['touched_relays'] = touched
+    report['rechecked_pairs'] = len(affected)
+    report['violated_pairs'] = len(violations)
+
+    if not violations:
+        print(f'    ♻️  {len(affected)} affected pairs still coordinated – reusing previous settings')
+        state = {
+            'scenario_id': scenario_id,
+            'relays': relays,
+            'relay_values': {
+                relays[r]: {"TDS": round(tds[r], 5), "pickup": round(pu[r], 5),
+                            **({"curve": curves[r]} if curves else {})}
+                for r in range(nR)
+            },
+            'best_tmt': sum(pair_penalty(p, tds, pu, idx, curves) for p in pairs),
+            'generations': 0,
+            'population': population
+        }
+        report['mode'] = 'reused'
+    else:
+        print(f'    🔧 {len(violations)}/{len(affected)} affected pairs miscoordinated – running repair search')
+        state = run_genetic_algorithm(
+            scenario_id, scenario_data,
+            initial_population=population,
+            max_generations=GA_REPAIR_MAXGEN,
+            stall_generations=GA_REPAIR_ITERNO
+        )
+        report['mode'] = 'repaired'
+
+    state['incremental'] = report
+    return state
+
+def main():
+    """Incrementally re-optimize every scenario of the input file"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+
+    summary = {}
+    start_time = datetime.now()
+
+    for sid in scenario_ids:
+        data = scenario_map[sid]
+        is_valid, issues = validate_scenario_data(data)
+        if not is_valid:
+            print(f"   ❌ Skipping scenario {sid}: {', '.join(issues)}")
+            continue
+
+        print(f"🎯 {sid}")
+        scenario_start = datetime.now()
+        previous_state = load_ga_state(sid, paths)
+        if previous_state is None:
+            print("    ⚠️  No previous GA state – running full optimization")
+            state = run_genetic_algorithm(sid, data)
+            state['incremental'] = {'mode': 'full'}
+        else:
+            state = incremental_reoptimize(sid, data, previous_state)
+
+        if not state.get('relay_values'):
+            continue
+
+        report = state.pop('incremental')
+        save_ga_state({**state, 'pairs': data['pairs']}, paths)
+        summary[sid] = {
+            **report,
+            'best_tmt': state['best_tmt'],
+            'generations': state['generations'],
+            'processing_time': (datetime.now() - scenario_start).total_seconds()
+        }
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary_file = paths['tables'] / f"ga_incremental_summary_{timestamp}.json"
+    with open(summary_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'processing_time': (datetime.now() - start_time).total_seconds(),
+            'scenarios': summary
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"📊 Incremental summary: {summary_file}")
+    return summary
+
+if __name__ == "__main__":
+    main()
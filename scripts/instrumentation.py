@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Structured timing spans and leveled console output
+A Tracer records named, nested spans (start, duration and attributes) with
+one perf_counter pair per span; spans are written as JSON lines and can be
+exported in the Chrome trace event format (chrome://tracing, Perfetto).
+Console messages go through log() and are shown up to the current verbosity
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Console verbosity: 0 = errors only, 1 = phase and scenario progress, 2 = GA generations and span timings
+VERBOSITY = 1
+
+def set_verbosity(level: int) -> None:
+    """Set the console verbosity level"""
+    global VERBOSITY
+    VERBOSITY = level
+
+def log(message: str, level: int = 1) -> None:
+    """Print a console message if the verbosity level allows it"""
+    if level <= VERBOSITY:
+        print(message)
+
+class Tracer:
+    """Collects timing spans of one run"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.spans: List[Dict[str, Any]] = []
+        self._next_id = 0
+        self._stack: List[int] = []
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block; the yielded dict takes attributes known only at the end"""
+        span_id = self._new_id()
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(span_id)
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            self.add(name, start - self.origin, seconds, parent=parent, span_id=span_id, **attrs)
+            log(f"   ⏱️  {name}: {seconds:.3f}s", 2)
+
+    def _new_id(self) -> int:
+        """Span ids are assigned when a span starts, so parents precede their children"""
+        span_id = self._next_id
+        self._next_id += 1
+        return span_id
+
+    def add(self, name: str, start: float, seconds: float, parent: Optional[int] = None,
+            span_id: Optional[int] = None, **attrs: Any) -> Dict[str, Any]:
+        """Record a span measured elsewhere (``start`` in seconds from the tracer origin)"""
+        record = {
+            'id': self._new_id() if span_id is None else span_id,
+            'name': name,
+            'parent': parent,
+            'start': start,
+            'seconds': seconds,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'attrs': attrs
+        }
+        self.spans.append(record)
+        return record
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Count and total seconds per span name"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span['name'], {'count': 0, 'seconds': 0.0})
+            entry['count'] += 1
+            entry['seconds'] += span['seconds']
+        return totals
+
+    def write_jsonl(self, path: Path) -> Path:
+        """One JSON object per span, in completion order"""
+        with open(path, "w", encoding="utf-8") as f:
+            for span in self.spans:
+                f.write(json.dumps({**span, 'run_started_at': self.started_at}, ensure_ascii=False, default=str) + "\n")
+        return path
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans as complete ("X") events of the Chrome trace event format (microseconds)"""
+        return {
+            'traceEvents': [
+                {
+                    'name': span['name'],
+                    'cat': span['name'],
+                    'ph': "X",
+                    'ts': round(span['start'] * 1e6, 3),
+                    'dur': round(span['seconds'] * 1e6, 3),
+                    'pid': span['pid'],
+                    'tid': span['tid'],
+                    'args': span['attrs']
+                }
+                for span in self.spans
+            ],
+            'displayTimeUnit': "ms",
+            'otherData': {'started_at': self.started_at}
+        }
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        """Chrome trace JSON file"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False, default=str)
+        return path
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Local HTTP job API for GA optimization requests
+Clients submit a scenario payload (automation_results records) with optimizer
+parameters and get a job ID, then poll its status, stream its progress (best
+TMT every N generations) as JSON lines and fetch the result. Jobs run in a
+process pool, one fresh process per job so per-job parameter overrides and
+CPU-time limits cannot leak into other jobs; identical submissions are
+deduplicated by a content hash of payload and parameters
+
+Endpoints:
+    POST /jobs                  {"records": [...], "scenario_id": "...", "params": {...}}
+    GET  /jobs                  all jobs (without results)
+    GET  /jobs/<id>             status
+    GET  /jobs/<id>/progress    progress events, streamed until the job finishes
+    GET  /jobs/<id>/result      optimized settings
+    GET  /health
+
+Usage:
+    python job_api.py [port] [workers]
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import resource
+import signal
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import ga_optimization_fast as ga
+from ga_optimization_fast import setup_paths, group_data_by_scenario, validate_scenario_data
+from results_store import open_store, record_run
+
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+CPU_HARD_MARGIN = 5           # Seconds between the SIGXCPU soft limit and the hard kill
+TERMINAL_STATES = ("succeeded", "failed")
+
+# Optimizer parameters a job may set: name -> (type, minimum, maximum, module constant or None)
+JOB_PARAMS = {
+    'max_generations': (int, 1, 1_000_000, None),
+    'stall_generations': (int, 1, 1_000_000, None),
+    'cti': (float, 0.0, 5.0, 'CTI'),
+    'min_tds': (float, 0.0, 10.0, 'MIN_TDS'),
+    'max_tds': (float, 0.0, 10.0, 'MAX_TDS'),
+    'min_pickup': (float, 0.0, 1e6, 'MIN_PICKUP'),
+    'max_pickup_factor': (float, 0.0, 10.0, 'MAX_PICKUP_FACTOR'),
+    'progress_every': (int, 1, 1_000_000, 'GA_PROGRESS_EVERY'),
+    'seed': (int, 0, 2**32 - 1, None),
+    'cpu_seconds': (int, 1, 86_400, None),
+    'init': (str, None, None, None),
+    'crossover': (str, None, None, None),
+    'mutation': (str, None, None, None)
+}
+PARAM_CHOICES = {
+    'init': ["uniform", "coordinated", "lhs"],
+    'crossover': ga.CROSSOVER_OPERATORS + ["adaptive"],
+    'mutation': ga.MUTATION_OPERATORS + ["adaptive"]
+}
+
+class CpuLimitExceeded(Exception):
+    """A job used up its CPU-time allowance"""
+
+def default_params() -> Dict[str, Any]:
+    """Parameters a job runs with when it does not set them"""
+    return {
+        'max_generations': ga.GA_maxGen,
+        'stall_generations': ga.GA_iterno,
+        'cti': ga.CTI,
+        'min_tds': ga.MIN_TDS,
+        'max_tds': ga.MAX_TDS,
+        'min_pickup': ga.MIN_PICKUP,
+        'max_pickup_factor': ga.MAX_PICKUP_FACTOR,
+        'progress_every': ga.GA_PROGRESS_EVERY,
+        'seed': None,
+        'cpu_seconds': None,
+        'init': ga.GA_INIT,
+        'crossover': ga.GA_CROSSOVER,
+        'mutation': ga.GA_MUTATION
+    }
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated parameters with defaults filled in; raises ValueError on bad input"""
+    unknown = set(params) - set(JOB_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s): {sorted(unknown)}")
+    normalized = default_params()
+    for name, value in params.items():
+        kind, low, high, _ = JOB_PARAMS[name]
+        if value is None:
+            continue
+        if kind is int and (isinstance(value, bool) or not isinstance(value, int)):
+            raise ValueError(f"'{name}' must be an integer")
+        if kind is float and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"'{name}' must be a number")
+        if kind is str and value not in PARAM_CHOICES[name]:
+            raise ValueError(f"'{name}' must be one of {PARAM_CHOICES[name]}")
+        if low is not None and not low <= value <= high:
+            raise ValueError(f"'{name}' must be within [{low}, {high}]")
+        normalized[name] = kind(value)
+    if normalized['min_tds'] > normalized['max_tds']:
+        raise ValueError("'min_tds' must not exceed 'max_tds'")
+    return normalized
+
+def content_hash(scenario_id: str, records: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """Hash identifying a submission (same scenario payload and parameters -> same job)"""
+    canonical = json.dumps({'scenario_id': scenario_id, 'records': records, 'params': params},
+                           sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def raise_cpu_limit(*_) -> None:
+    raise CpuLimitExceeded("CPU time limit exceeded")
+
+def run_job(job_id: str, scenario_id: str, scenario_data: Dict, params: Dict[str, Any], events) -> Dict[str, Any]:
+    """Worker: apply the job's parameters and CPU limit, then run the GA with progress events"""
+    if params['cpu_seconds']:
+        signal.signal(signal.SIGXCPU, raise_cpu_limit)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        limit = params['cpu_seconds'] + CPU_HARD_MARGIN
+        resource.setrlimit(resource.RLIMIT_CPU, (params['cpu_seconds'], limit if hard == resource.RLIM_INFINITY else min(limit, hard)))
+    for name, (_, _, _, constant) in JOB_PARAMS.items():
+        if constant:
+            setattr(ga, constant, params[name])
+    if params['seed'] is not None:
+        random.seed(params['seed'])
+
+    events.put((job_id, {'event': 'started', 'pid': os.getpid()}))
+
+    def progress(generation: int, best_tmt: float, seconds: float) -> None:
+        events.put((job_id, {'event': 'progress', 'generation': generation, 'best_tmt': best_tmt, 'seconds': seconds}))
+
+    state = ga.run_genetic_algorithm(scenario_id, scenario_data,
+                                     max_generations=params['max_generations'],
+                                     stall_generations=params['stall_generations'],
+                                     init=params['init'], crossover=params['crossover'],
+                                     mutation=params['mutation'], progress=progress)
+    if not state.get('relay_values'):
+        raise ValueError("optimization produced no settings")
+    return {
+        'scenario_id': scenario_id,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'relay_values': state['relay_values'],
+        'best_tmt': state['best_tmt'],
+        'generations': state['generations'],
+        'evaluations': state['evaluations'],
+        'seconds': state['elapsed']
+    }
+
+class JobAPI:
+    """Job registry, process pool and HTTP front end"""
+
+    def __init__(self, paths: Dict, workers: int = API_WORKERS):
+        self.paths = paths
+        self.workers = workers
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.changed: Dict[str, asyncio.Event] = {}
+        # One process per job: parameter overrides and RLIMIT_CPU apply to that job only
+        self.pool = ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1)
+        self.manager = multiprocessing.Manager()
+        self.events = self.manager.Queue()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ---- jobs -----------------------------------------------------------
+
+    def submit(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Validate a submission and start (or reuse) its job"""
+        records = payload.get('records')
+        if not isinstance(records, list) or not records:
+            return 400, {'error': "'records' must be a non-empty list of pair records"}
+        try:
+            params = normalize_params(payload.get('params') or {})
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+        scenario_map = group_data_by_scenario(records)
+        scenario_id = payload.get('scenario_id') or (next(iter(scenario_map)) if len(scenario_map) == 1 else None)
+        if scenario_id not in scenario_map:
+            return 400, {'error': f"'scenario_id' must name one of {sorted(scenario_map)}"}
+        is_valid, issues = validate_scenario_data(scenario_map[scenario_id])
+        if not is_valid:
+            return 400, {'error': "invalid scenario", 'issues': issues}
+
+        digest = content_hash(scenario_id, [r for r in records if r.get('scenario_id') == scenario_id], params)
+        job_id = digest[:16]
+        existing = self.jobs.get(job_id)
+        if existing and existing['status'] != "failed":
+            return 200, {**self.status(existing), 'deduplicated': True}
+
+        job = {
+            'job_id': job_id,
+            'content_hash': digest,
+            'scenario_id': scenario_id,
+            'params': params,
+            'status': "queued",
+            'submitted_at': datetime.now(timezone.utc).isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'progress': [],
+            'result': None,
+            'error': None
+        }
+        self.jobs[job_id] = job
+        self.changed[job_id] = asyncio.Event()
+        future = self.loop.run_in_executor(self.pool, run_job, job_id, scenario_id,
+                                           scenario_map[scenario_id], params, self.events)
+        future.add_done_callback(lambda f: self.finish(job_id, f))
+        print(f"📨 Job {job_id}: {scenario_id} ({len(scenario_map[scenario_id]['pairs'])} pairs)")
+        return 202, {**self.status(job), 'deduplicated': False}
+
+    def finish(self, job_id: str, future: asyncio.Future) -> None:
+        """Record the outcome of a job and store successful results"""
+        job = self.jobs[job_id]
+        job['finished_at'] = datetime.now(timezone.utc).isoformat()
+        try:
+            job['result'] = future.result()
+            job['status'] = "succeeded"
+            conn = open_store(self.paths)
+            try:
+                job['result']['run_id'] = record_run(conn, {job['scenario_id']: job['result']}, source="job_api",
+                                                     ga_params=job['params'], summary={'job_id': job_id})
+            finally:
+                conn.close()
+            print(f"   ✅ Job {job_id}: TMT {job['result']['best_tmt']:.6f}")
+        except Exception as e:
+            job['status'] = "failed"
+            job['error'] = f"{type(e).__name__}: {e}"
+            print(f"   ❌ Job {job_id}: {job['error']}")
+        self.notify(job_id)
+
+    def on_event(self, job_id: str, event: Dict[str, Any]) -> None:
+        """Progress event from a worker"""
+        job = self.jobs.get(job_id)
+        if job is None or job['status'] in TERMINAL_STATES:
+            return
+        if event['event'] == "started":
+            job['status'] = "running"
+            job['started_at'] = datetime.now(timezone.utc).isoformat()
+        else:
+            job['progress'].append({k: v for k, v in event.items() if k != 'event'})
+        self.notify(job_id)
+
+    def notify(self, job_id: str) -> None:
+        """Wake progress streams of a job"""
+        self.changed[job_id].set()
+        self.changed[job_id] = asyncio.Event()
+
+    def pump_events(self) -> None:
+        """Thread: forward worker events into the event loop until the sentinel arrives"""
+        while True:
+            try:
+                item = self.events.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            self.loop.call_soon_threadsafe(self.on_event, *item)
+
+    def status(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job status without the result payload"""
+        latest = job['progress'][-1] if job['progress'] else None
+        return {
+            'job_id': job['job_id'],
+            'scenario_id': job['scenario_id'],
+            'status': job['status'],
+            'submitted_at': job['submitted_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at'],
+            'best_tmt': job['result']['best_tmt'] if job['result'] else (latest['best_tmt'] if latest else None),
+            'generation': job['result']['generations'] if job['result'] else (latest['generation'] if latest else None),
+            'params': job['params'],
+            'error': job['error']
+        }
+
+    # ---- HTTP -----------------------------------------------------------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP/1.1 request (connections are not kept alive)"""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return await self.respond(writer, 400, {'error': "malformed request"})
+            method, target = request_line[0], request_line[1].split("?")[0]
+            length = int(headers.get('content-length', 0) or 0)
+            if length > MAX_BODY_BYTES:
+                return await self.respond(writer, 413, {'error': "request body too large"})
+            body = await reader.readexactly(length) if length else b""
+            await self.route(method, [p for p in target.split("/") if p], body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method: str, parts: List[str], body: bytes, writer: asyncio.StreamWriter) -> None:
+        if method == "GET" and parts == ["health"]:
+            return await self.respond(writer, 200, {'status': "ok", 'workers': self.workers, 'jobs': len(self.jobs)})
+        if parts == ["jobs"] and method == "POST":
+            try:
+                payload = json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                return await self.respond(writer, 400, {'error': f"invalid JSON: {e}"})
+            if not isinstance(payload, dict):
+                return await self.respond(writer, 400, {'error': "payload must be a JSON object"})
+            return await self.respond(writer, *self.submit(payload))
+        if parts == ["jobs"] and method == "GET":
+            return await self.respond(writer, 200, {'jobs': [self.status(j) for j in self.jobs.values()]})
+        if len(parts) in (2, 3) and parts[0] == "jobs" and method == "GET":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return await self.respond(writer, 404, {'error': f"unknown job '{parts[1]}'"})
+            view = parts[2] if len(parts) == 3 else None
+            if view is None:
+                return await self.respond(writer, 200, self.status(job))
+            if view == "result":
+                if job['status'] == "failed":
+                    return await self.respond(writer, 422, {'job_id': job['job_id'], 'error': job['error']})
+                if job['status'] != "succeeded":
+                    return await self.respond(writer, 409, {'job_id': job['job_id'], 'status': job['status']})
+                return await self.respond(writer, 200, {'job_id': job['job_id'], **job['result']})
+            if view == "progress":
+                return await self.stream_progress(job, writer)
+        return await self.respond(writer, 404, {'error': "not found"})
+
+    async def respond(self, writer: asyncio.StreamWriter, code: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(self.head(code, "application/json", {'Content-Length': str(len(body))}) + body)
+        await writer.drain()
+
+    def head(self, code: int, content_type: str, extra: Dict[str, str]) -> bytes:
+        reasons = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 409: "Conflict",
+                   413: "Payload Too Large", 422: "Unprocessable Entity"}
+        lines = [f"HTTP/1.1 {code} {reasons.get(code, '')}", f"Content-Type: {content_type}", "Connection: close"]
+        lines += [f"{k}: {v}" for k, v in extra.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def stream_progress(self, job: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        """Chunked JSON lines: every progress event so far, then new ones until the job finishes"""
+        writer.write(self.head(200, "application/x-ndjson", {'Transfer-Encoding': "chunked"}))
+        sent = 0
+
+        async def send(obj: Dict[str, Any]) -> None:
+            data = (json.dumps(obj) + "\n").encode("utf-8")
+            writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+            await writer.drain()
+
+        while True:
+            changed = self.changed[job['job_id']]
+            for event in job['progress'][sent:]:
+                await send({'event': "progress", **event})
+            sent = len(job['progress'])
+            if job['status'] in TERMINAL_STATES:
+                await send({'event': job['status'], **self.status(job)})
+                break
+            await changed.wait()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def serve(self, host: str = API_HOST, port: int = API_PORT) -> None:
+        """Serve until cancelled"""
+        self.loop = asyncio.get_running_loop()
+        pump = threading.Thread(target=self.pump_events, daemon=True)
+        pump.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"🌐 Job API on http://{host}:{port} ({self.workers} worker(s))")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.events.put(None)
+            pump.join(timeout=5)
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.manager.shutdown()
+
+def main():
+    """Serve the job API on localhost"""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else API_PORT
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else API_WORKERS
+    api = JobAPI(setup_paths(), workers)
+    try:
+        asyncio.run(api.serve(port=port))
+    except KeyboardInterrupt:
+        print("\n🛑 Job API stopped")
+
+if __name__ == "__main__":
+    main()
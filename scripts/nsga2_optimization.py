@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+NSGA-II multi-objective relay coordination
+Trades total miscoordination time (TMT) against the sum of main-relay operating
+times, so the planner can pick how much selectivity margin to buy with speed.
+Objectives, non-dominated sorting and crowding distance are evaluated on whole
+populations with the vectorized kernels
+"""
+
+import json
+import random
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, compute_bounds,
+    constraint_aware_population, scenario_curves, GA_SBX_ETA, GA_POLY_ETA
+)
+from relay_kernels import compile_scenario, pair_times, CTI, MAX_TIME
+
+NSGA_POP = 100
+NSGA_GENERATIONS = 300
+NSGA_INIT = "coordinated"   # Initial population method (see constraint_aware_population)
+PARETO_DECIMALS = 5         # Rounding of exported settings and objectives
+
+def objectives(population: np.ndarray, compiled: Dict[str, Any]) -> np.ndarray:
+    """(TMT, sum of main-relay operating times) of every individual, shape (P, 2)"""
+    nR = compiled['n_relays']
+    tM, tB = pair_times(population[:, :nR], population[:, nR:], compiled)
+    tmt = (np.maximum(CTI - (tB - tM), 0.0) + np.maximum(tM - MAX_TIME, 0.0)).sum(axis=1)
+    return np.stack([tmt, tM.sum(axis=1)], axis=1)
+
+def non_dominated_sort(F: np.ndarray) -> np.ndarray:
+    """Pareto rank (0 = non-dominated) of each row of the objective matrix F"""
+    le = np.all(F[:, None, :] <= F[None, :, :], axis=2)
+    lt = np.any(F[:, None, :] < F[None, :, :], axis=2)
+    dominates = le & lt                                   # dominates[i, j]: i dominates j
+    dominated_by = dominates.sum(axis=0)
+    ranks = np.full(len(F), -1, dtype=np.intp)
+    front = np.flatnonzero(dominated_by == 0)
+    rank = 0
+    while front.size:
+        ranks[front] = rank
+        dominated_by = dominated_by - dominates[front].sum(axis=0)
+        dominated_by[ranks >= 0] = -1
+        front = np.flatnonzero(dominated_by == 0)
+        rank += 1
+    return ranks
+
+def crowding_distance(F: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """Crowding distance of each individual within its front (boundary points get inf)"""
+    n, m = F.shape
+    distance = np.zeros(n)
+    for rank in np.unique(ranks):
+        members = np.flatnonzero(ranks == rank)
+        if members.size <= 2:
+            distance[members] = np.inf
+            continue
+        Ff = F[members]
+        order = np.argsort(Ff, axis=0)
+        sorted_F = np.take_along_axis(Ff, order, axis=0)
+        span = sorted_F[-1] - sorted_F[0]
+        span[span == 0] = 1.0
+        gaps = np.zeros_like(Ff)
+        gaps[1:-1] = (sorted_F[2:] - sorted_F[:-2]) / span
+        gaps[0] = gaps[-1] = np.inf
+        contribution = np.zeros_like(Ff)
+        np.put_along_axis(contribution, order, gaps, axis=0)
+        distance[members] = contribution.sum(axis=1)
+    return distance
+
+def tournament(ranks: np.ndarray, crowding: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Binary tournament on (rank, -crowding), returning n parent indices"""
+    a, b = rng.integers(0, len(ranks), size=(2, n))
+    a_wins = (ranks[a] < ranks[b]) | ((ranks[a] == ranks[b]) & (crowding[a] >= crowding[b]))
+    return np.where(a_wins, a, b)
+
+def variation(parents: np.ndarray, xmin: np.ndarray, xmax: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """SBX crossover and polynomial mutation on a whole parent matrix
+
+    With an odd number of parents the last one is mated with a random partner.
+    """
+    n, d = parents.shape
+    if n % 2:
+        parents = np.vstack([parents, parents[rng.integers(0, n - 1)]])
+    P1, P2 = parents[0::2], parents[1::2]
+    u = rng.random(P1.shape)
+    beta = np.where(u <= 0.5, (2.0 * u) ** (1.0 / (GA_SBX_ETA + 1.0)),
+                    (1.0 / (2.0 * (1.0 - u))) ** (1.0 / (GA_SBX_ETA + 1.0)))
+    beta = np.where(rng.random(P1.shape) < 0.5, beta, 1.0)
+    children = np.concatenate([
+        0.5 * ((1.0 + beta) * P1 + (1.0 - beta) * P2),
+        0.5 * ((1.0 - beta) * P1 + (1.0 + beta) * P2)
+    ])[:n]
+
+    mutate = rng.random(children.shape) < 1.0 / d
+    u = rng.random(children.shape)
+    delta = np.where(u < 0.5, (2.0 * u) ** (1.0 / (GA_POLY_ETA + 1.0)) - 1.0,
+                     1.0 - (2.0 * (1.0 - u)) ** (1.0 / (GA_POLY_ETA + 1.0)))
+    children = children + mutate * delta * (xmax - xmin)
+    return np.clip(children, xmin, xmax)
+
+def nsga2_optimization(scenario_id: str, scenario_data: Dict,
+                       initial_population: Optional[List[List[float]]] = None,
+                       pop_size: int = NSGA_POP, generations: int = NSGA_GENERATIONS,
+                       init: str = NSGA_INIT) -> Dict[str, Any]:
+    """NSGA-II over [TDS..., pickup...] minimizing (TMT, sum of main times)
+
+    Returns the final non-dominated set sorted by TMT; its first point is the
+    lowest-TMT solution, comparable with genetic_algorithm_optimization.
+    """
+    compiled = compile_scenario(scenario_data)
+    relays = compiled['relays']
+    nR = compiled['n_relays']
+    if nR == 0:
+        print(f'    ❌ Scenario "{scenario_id}" has no valid relays.')
+        return {}
+
+    pairs = scenario_data["pairs"]
+    lo, hi = compute_bounds(relays, pairs)
+    xmin, xmax = np.array(lo), np.array(hi)
+    rng = np.random.default_rng(random.getrandbits(32))
+
+    seeds = [list(ind)[:2 * nR] for ind in (initial_population or [])][:pop_size]
+    if init != "uniform" and len(seeds) < pop_size:
+        seeds += constraint_aware_population(relays, pairs, lo, hi, pop_size - len(seeds), init,
+                                             scenario_curves(scenario_data, relays))
+    X = xmin + rng.random((pop_size, 2 * nR)) * (xmax - xmin)
+    if seeds:
+        X[:len(seeds)] = np.clip(np.array(seeds, dtype=np.float64), xmin, xmax)
+    F = objectives(X, compiled)
+    ranks = non_dominated_sort(F)
+    crowding = crowding_distance(F, ranks)
+
+    for gen in range(1, generations + 1):
+        children = variation(X[tournament(ranks, crowding, pop_size, rng)], xmin, xmax, rng)
+        X = np.concatenate([X, children])
+        F = np.concatenate([F, objectives(children, compiled)])
+
+        # Environmental selection: by rank, then by crowding distance
+        ranks = non_dominated_sort(F)
+        crowding = crowding_distance(F, ranks)
+        keep = np.lexsort((-crowding, ranks))[:pop_size]
+        X, F, ranks = X[keep], F[keep], ranks[keep]  # Truncation leaves survivor ranks unchanged
+        crowding = crowding_distance(F, ranks)
+
+        if gen % 100 == 0:
+            print(f'    🔄 NSGA-II: generation {gen} – front size {int((ranks == 0).sum())}, '
+                  f'min TMT = {F[:, 0].min():.6f}')
+
+    front = np.flatnonzero(ranks == 0)
+    front = front[np.argsort(F[front, 0])]
+    _, unique = np.unique(np.round(F[front], PARETO_DECIMALS), axis=0, return_index=True)
+    front = front[np.sort(unique)]
+    front = front[np.argsort(F[front, 0])]
+    print(f'    🏁 NSGA-II finished. Pareto front: {len(front)} points – '
+          f'TMT {F[front[0], 0]:.6f}..{F[front[-1], 0]:.6f}, '
+          f'main time {F[front[-1], 1]:.3f}..{F[front[0], 1]:.3f}')
+
+    return {
+        'scenario_id': scenario_id,
+        'relays': relays,
+        'front': X[front],
+        'objectives': F[front],
+        'generations': generations
+    }
+
+def compact_front(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pareto front as column lists: one objective row and one TDS/pickup row per point"""
+    nR = len(state['relays'])
+    front = np.round(state['front'], PARETO_DECIMALS)
+    objs = np.round(state['objectives'], PARETO_DECIMALS)
+    return {
+        'relays': state['relays'],
+        'objective_names': ['TMT', 'sum_main_time'],
+        'objectives': objs.tolist(),
+        'TDS': front[:, :nR].tolist(),
+        'pickup': front[:, nR:].tolist()
+    }
+
+def main():
+    """Compute the TMT / main-time Pareto front of every valid scenario"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+
+    fronts = {}
+    start_time = datetime.now()
+    for sid in scenario_ids:
+        data = scenario_map[sid]
+        if not validate_scenario_data(data)[0]:
+            continue
+        print(f"🎯 {sid} (NSGA-II)")
+        state = nsga2_optimization(sid, data)
+        if state:
+            fronts[sid] = compact_front(state)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['data_processed'] / f"ga_pareto_fronts_{timestamp}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'population': NSGA_POP,
+            'generations': NSGA_GENERATIONS,
+            'processing_time': (datetime.now() - start_time).total_seconds(),
+            'pareto_fronts': fronts
+        }, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"   📄 Pareto fronts: {output_file}")
+    return fronts
+
+if __name__ == "__main__":
+    main()
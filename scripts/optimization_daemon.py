@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Continuous optimization daemon
+Watches an inbox directory (and an in-process queue) for new scenario records
+in JSON Lines, optimizes every complete scenario in a worker process pool and
+writes the settings to the results store. In-flight work is bounded
+(backpressure), queue depth, throughput and per-job latency are written to a
+metrics file, and on shutdown unfinished jobs are checkpointed back into the
+inbox so a restart picks them up
+
+Producers should write a file elsewhere and rename it into the inbox, so the
+daemon never reads a partially written file.
+
+Usage:
+    python optimization_daemon.py [workers] [once]
+"""
+
+import os
+import queue
+import signal
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, run_genetic_algorithm,
+    GA_Ni, GA_maxGen, GA_iterno
+)
+from pairs_io import PairWriter
+from results_store import open_store, record_run
+from run_manifest import atomic_write_json
+from streaming_ingest import stream_scenarios
+
+DAEMON_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+IN_FLIGHT_PER_WORKER = 2      # Jobs submitted to the pool per worker before intake pauses
+POLL_INTERVAL = 2.0           # Seconds between inbox scans when idle
+FLUSH_INTERVAL = 10.0         # Seconds between results-store flushes and metrics updates
+SHUTDOWN_GRACE = 30.0         # Seconds in-flight jobs may finish before they are checkpointed
+THROUGHPUT_WINDOW = 300.0     # Seconds of completions used for the throughput figure
+LATENCY_SAMPLES = 1000        # Completed jobs kept for latency percentiles
+INBOX_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+def optimize_job(scenario_id: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Worker: group, validate and optimize one scenario"""
+    scenario_data = group_data_by_scenario(records).get(scenario_id)
+    if not scenario_data:
+        return {'scenario_id': scenario_id, 'error': "no records for scenario"}
+    is_valid, issues = validate_scenario_data(scenario_data)
+    if not is_valid:
+        return {'scenario_id': scenario_id, 'error': "; ".join(issues)}
+    state = run_genetic_algorithm(scenario_id, scenario_data)
+    if not state.get('relay_values'):
+        return {'scenario_id': scenario_id, 'error': "optimization produced no settings"}
+    return {
+        'scenario_id': scenario_id,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'relay_values': state['relay_values'],
+        'best_tmt': state['best_tmt'],
+        'generations': state['generations'],
+        'evaluations': state['evaluations'],
+        'seconds': state['elapsed'],
+        'worker_pid': os.getpid()
+    }
+
+def ignore_sigint() -> None:
+    """Worker initializer: shutdown is driven by the daemon, not by Ctrl-C in the workers"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """Mean, p50, p95 and max of a sample"""
+    if not values:
+        return {'mean': None, 'p50': None, 'p95': None, 'max': None}
+    ordered = sorted(values)
+    return {
+        'mean': statistics.fmean(ordered),
+        'p50': ordered[len(ordered) // 2],
+        'p95': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        'max': ordered[-1]
+    }
+
+class OptimizationDaemon:
+    """Long-running optimizer fed by an inbox directory and an in-process queue"""
+
+    def __init__(self, paths: Dict, inbox: Optional[Path] = None, workers: int = DAEMON_WORKERS,
+                 max_in_flight: Optional[int] = None):
+        self.paths = paths
+        self.inbox = Path(inbox or paths['data_processed'] / "inbox")
+        for sub in ("processing", "processed", "failed"):
+            (self.inbox / sub).mkdir(parents=True, exist_ok=True)
+        self.metrics_file = paths['data_processed'] / "daemon_metrics.json"
+        self.workers = workers
+        self.max_in_flight = max_in_flight or IN_FLIGHT_PER_WORKER * workers
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=self.max_in_flight)
+        self.stop_event = threading.Event()
+
+        self.in_flight: Dict[Future, Dict[str, Any]] = {}
+        self.unstored: Dict[str, Dict[str, Any]] = {}
+        self.active: Optional[Tuple[Path, Iterator[Tuple[str, List[Dict]]]]] = None
+        self.file_jobs: Dict[Path, int] = {}
+
+        self.started = time.monotonic()
+        self.completed = 0
+        self.failed = 0
+        self.run_ids: List[str] = []
+        self.done_times: Deque[float] = deque()
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.service_times: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    # ---- intake ---------------------------------------------------------
+
+    def submit(self, records: List[Dict[str, Any]], block: bool = True, timeout: Optional[float] = None) -> int:
+        """Queue records from the same process, one job per scenario; blocks while the queue is full"""
+        by_scenario: Dict[str, List[Dict]] = {}
+        for record in records:
+            if record.get("scenario_id"):
+                by_scenario.setdefault(record["scenario_id"], []).append(record)
+        for sid, scenario_records in by_scenario.items():
+            self.queue.put(self.make_job(sid, scenario_records, None), block=block, timeout=timeout)
+        return len(by_scenario)
+
+    def make_job(self, sid: str, records: List[Dict], source: Optional[Path]) -> Dict[str, Any]:
+        return {'scenario_id': sid, 'records': records, 'source': source, 'enqueued': time.monotonic()}
+
+    def inbox_files(self) -> List[Path]:
+        """Unclaimed input files, oldest first"""
+        files = [p for p in self.inbox.iterdir()
+                 if p.is_file() and not p.name.startswith(".") and p.name.endswith(INBOX_SUFFIXES)]
+        return sorted(files, key=lambda p: (p.stat().st_mtime, p.name))
+
+    def claim_next_file(self) -> bool:
+        """Move the oldest inbox file to processing/ and start streaming its scenarios"""
+        for path in self.inbox_files():
+            claimed = self.inbox / "processing" / path.name
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            print(f"📥 Claimed {path.name}")
+            self.active = (claimed, stream_scenarios(claimed, spill_dir=self.inbox / "processing", grouped=False))
+            self.file_jobs[claimed] = 0
+            return True
+        return False
+
+    def next_job(self) -> Optional[Dict[str, Any]]:
+        """Next job from the in-process queue, the active file or a newly claimed file"""
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        while self.active is not None or self.claim_next_file():
+            path, scenarios = self.active
+            try:
+                sid, records = next(scenarios)
+            except StopIteration:
+                self.active = None
+                self.finish_file(path)
+                continue
+            except (ValueError, OSError) as e:
+                print(f"   ❌ {path.name}: {e}")
+                self.active = None
+                self.file_jobs.pop(path, None)
+                os.replace(path, self.inbox / "failed" / path.name)
+                continue
+            self.file_jobs[path] += 1
+            return self.make_job(sid, records, path)
+        return None
+
+    def finish_file(self, path: Path) -> None:
+        """Move a fully dispatched file with no outstanding jobs to processed/"""
+        if self.file_jobs.get(path) == 0 and (self.active is None or self.active[0] != path):
+            del self.file_jobs[path]
+            os.replace(path, self.inbox / "processed" / path.name)
+            print(f"   ✅ {path.name} processed")
+
+    # ---- completion -----------------------------------------------------
+
+    def collect(self, futures) -> None:
+        """Record finished jobs"""
+        now = time.monotonic()
+        for future in futures:
+            job = self.in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'scenario_id': job['scenario_id'], 'error': f"{type(e).__name__}: {e}"}
+            if 'error' in result:
+                self.failed += 1
+                self.write_failed(job, result['error'])
+            else:
+                self.completed += 1
+                self.unstored[job['scenario_id']] = result
+                self.latencies.append(now - job['enqueued'])
+                self.service_times.append(result['seconds'])
+                print(f"   🎯 {job['scenario_id']}: TMT {result['best_tmt']:.6f} ({result['seconds']:.1f}s)")
+            self.done_times.append(now)
+            # Sources that failed mid-stream were already moved to failed/ and are no longer tracked
+            if job['source'] in self.file_jobs:
+                self.file_jobs[job['source']] -= 1
+                self.finish_file(job['source'])
+
+    def write_failed(self, job: Dict[str, Any], error: str) -> None:
+        """Keep the records of a failed job next to the failed input files"""
+        print(f"   ❌ {job['scenario_id']}: {error}")
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        with PairWriter(self.inbox / "failed" / f"{job['scenario_id']}_{stamp}.jsonl") as writer:
+            for record in job['records']:
+                writer.write(record)
+
+    def flush(self) -> None:
+        """Write completed results to the results store and refresh the metrics file"""
+        if self.unstored:
+            conn = open_store(self.paths)
+            try:
+                run_id = record_run(conn, self.unstored, source="optimization_daemon",
+                                    ga_params={'population': GA_Ni, 'max_generations': GA_maxGen,
+                                               'stall_generations': GA_iterno},
+                                    summary={'scenarios': len(self.unstored)})
+            finally:
+                conn.close()
+            self.run_ids.append(run_id)
+            print(f"   🗄️  Stored {len(self.unstored)} scenario(s) as run {run_id}")
+            self.unstored = {}
+        atomic_write_json(self.metrics_file, self.metrics_snapshot())
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Queue depth, throughput and latency figures"""
+        now = time.monotonic()
+        while self.done_times and now - self.done_times[0] > THROUGHPUT_WINDOW:
+            self.done_times.popleft()
+        window = min(THROUGHPUT_WINDOW, now - self.started)
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'uptime_seconds': now - self.started,
+            'workers': self.workers,
+            'queue_depth': self.queue.qsize(),
+            'inbox_files': len(self.inbox_files()),
+            'in_flight': len(self.in_flight),
+            'max_in_flight': self.max_in_flight,
+            'completed': self.completed,
+            'failed': self.failed,
+            'throughput_per_min': len(self.done_times) / window * 60.0 if window > 0 else 0.0,
+            'latency_seconds': percentiles(list(self.latencies)),
+            'service_seconds': percentiles(list(self.service_times)),
+            'runs': self.run_ids[-10:]
+        }
+
+    # ---- lifecycle ------------------------------------------------------
+
+    def recover(self) -> None:
+        """Return files left in processing/ by an interrupted daemon to the inbox"""
+        for path in (self.inbox / "processing").iterdir():
+            if path.is_file() and path.name.endswith(INBOX_SUFFIXES):
+                os.replace(path, self.inbox / path.name)
+                print(f"   ♻️  Requeued {path.name}")
+
+    def checkpoint(self) -> Optional[Path]:
+        """Write the records of all unfinished jobs back into the inbox as one file
+
+        The rest of the active input file is streamed into the checkpoint one
+        scenario at a time, so shutdown keeps the streaming memory bound.
+        """
+        jobs = list(self.in_flight.values())
+        while True:
+            try:
+                jobs.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        staging = self.inbox / "processing" / f".checkpoint_{stamp}.jsonl"
+        n_jobs = len(jobs)
+        with PairWriter(staging) as writer:
+            for job in jobs:
+                for record in job['records']:
+                    writer.write(record)
+            if self.active is not None:
+                path, scenarios = self.active
+                self.active = None
+                try:
+                    for _, records in scenarios:
+                        for record in records:
+                            writer.write(record)
+                        n_jobs += 1
+                except (ValueError, OSError) as e:
+                    print(f"   ❌ {path.name}: {e}")
+                    self.file_jobs.pop(path, None)
+                    os.replace(path, self.inbox / "failed" / path.name)
+        if n_jobs == 0:
+            staging.unlink()
+            return None
+
+        checkpoint_file = self.inbox / f"checkpoint_{stamp}.jsonl"
+        os.replace(staging, checkpoint_file)
+        for path in list(self.file_jobs):
+            os.replace(path, self.inbox / "processed" / path.name)
+        self.file_jobs.clear()
+        print(f"   💾 Checkpointed {n_jobs} unfinished job(s) to {checkpoint_file.name}")
+        return checkpoint_file
+
+    def stop(self, *_) -> None:
+        """Request a graceful shutdown (signal handler)"""
+        if not self.stop_event.is_set():
+            print("\n🛑 Shutdown requested, draining in-flight jobs...")
+        self.stop_event.set()
+
+    def run(self, once: bool = False) -> Dict[str, Any]:
+        """Serve until stopped; ``once`` exits when the inbox and queue are drained"""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+        self.recover()
+        print(f"🚀 Optimization daemon: {self.workers} worker(s), inbox {self.inbox}")
+
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=ignore_sigint)
+        last_flush = time.monotonic()
+        try:
+            while not self.stop_event.is_set():
+                # Backpressure: intake pauses while the pool has max_in_flight jobs
+                while len(self.in_flight) < self.max_in_flight:
+                    job = self.next_job()
+                    if job is None:
+                        break
+                    self.in_flight[pool.submit(optimize_job, job['scenario_id'], job['records'])] = job
+
+                if once and not self.in_flight and self.active is None and self.queue.empty():
+                    break
+                if self.in_flight:
+                    done, _ = wait(list(self.in_flight), timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                    self.collect(done)
+                else:
+                    self.stop_event.wait(POLL_INTERVAL)
+
+                if time.monotonic() - last_flush >= FLUSH_INTERVAL:
+                    self.flush()
+                    last_flush = time.monotonic()
+
+            if self.in_flight:
+                done, _ = wait(list(self.in_flight), timeout=SHUTDOWN_GRACE)
+                self.collect(done)
+            self.checkpoint()
+        finally:
+            # Jobs still running were checkpointed; their results are dropped
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.flush()
+
+        metrics = self.metrics_snapshot()
+        print(f"🏁 Daemon stopped: {self.completed} completed, {self.failed} failed")
+        return metrics
+
+def main():
+    """Run the optimization daemon on the default inbox"""
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else DAEMON_WORKERS
+    return OptimizationDaemon(setup_paths(), workers=workers).run(once="once" in sys.argv[1:])
+
+if __name__ == "__main__":
+    main()
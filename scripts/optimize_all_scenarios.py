@@ -13,9 +13,13 @@ from datetime import datetime, timezone
 from pathlib import Path
 import numpy as np
 
+from relay_curves import CURVES, DEFAULT_CURVE, curve_time, relay_curve
+from apply_settings import apply_optimized_settings
+from run_manifest import write_run_manifest
+
 # ================== CONSTANTS (IEC / GA) ==================
-K = 0.14
-N = 0.02
+K = CURVES[DEFAULT_CURVE]["A"]
+N = CURVES[DEFAULT_CURVE]["p"]
 CTI = 0.20
 MIN_TDS = 0.05
 MAX_TDS = 0.8
@@ -39,16 +43,12 @@ def get_numeric_field(dct, names):
                 pass
     return None
 
-def time_iec(I, PU, TDS):
-    """IEC time calculation."""
+def time_iec(I, PU, TDS, curve=DEFAULT_CURVE):
+    """IEC time calculation (any registry curve)."""
     if I is None or PU is None or TDS is None:
         return float("nan")
     try:
-        M = I/PU
-        denom = (M**N) - 1.0
-        if denom <= 0:
-            return float("inf")
-        return (K*TDS)/denom
+        return curve_time(I, PU, TDS, curve)
     except Exception:
         return float("nan")
 
@@ -73,7 +73,7 @@ def group_data_by_scenario(data_array):
             continue
         
         if sid not in scenario_map:
-            scenario_map[sid] = {"pairs": [], "relays": [], "initial_settings": {}}
+            scenario_map[sid] = {"pairs": [], "relays": [], "initial_settings": {}, "relay_curves": {}}
         
         scenario_map[sid]["pairs"].append({
             "main_relay": mname,
@@ -86,6 +86,12 @@ def group_data_by_scenario(data_array):
             scenario_map[sid]["relays"].append(mname)
         if bname not in scenario_map[sid]["relays"]:
             scenario_map[sid]["relays"].append(bname)
+        
+        # Track relay curve types when the records carry them
+        for name, info in ((mname, m), (bname, b)):
+            curve = relay_curve(info)
+            if curve and name not in scenario_map[sid]["relay_curves"]:
+                scenario_map[sid]["relay_curves"][name] = curve
     
     return scenario_map
 
@@ -100,6 +106,8 @@ def genetic_algorithm(scenarioID, scenarioData):
         return {}
     
     idx = {relays[i]: i for i in range(nR)}
+    relay_curves = scenarioData.get("relay_curves") or {}
+    curves = [relay_curves.get(r, DEFAULT_CURVE) for r in relays] if relay_curves else None
     
     # Calculate minimum Isc for each relay
     IscMin = [float("inf")]*nR
@@ -112,10 +120,10 @@ def genetic_algorithm(scenarioID, scenarioData):
     xmax = ([MAX_TDS]*nR) + ([MAX_PICKUP_FACTOR*IscMin[i] for i in range(nR)])
     Nv = 2*nR
     
-    def relay_time(I, PU, TDS):
+    def relay_time(I, PU, TDS, curve=None):
         if I <= PU:
             return MAX_TIME*10.0
-        t = TDS * (K / ((I/PU)**N - 1.0))
+        t = TDS * (K / ((I/PU)**N - 1.0)) if curve is None else curve_time(I, PU, TDS, curve)
         return min(max(t,0.0), MAX_TIME*10.0)
     
     def fitness(ind):
@@ -126,8 +134,8 @@ def genetic_algorithm(scenarioID, scenarioData):
         for p in pairs:
             mi = idx[p["main_relay"]]
             bi = idx[p["backup_relay"]]
-            tM = relay_time(p["Ishc_main"], pu[mi], tds[mi])
-            tB = relay_time(p["Ishc_backup"], pu[bi], tds[bi])
+            tM = relay_time(p["Ishc_main"], pu[mi], tds[mi], curves[mi] if curves else None)
+            tB = relay_time(p["Ishc_backup"], pu[bi], tds[bi], curves[bi] if curves else None)
             
             if (tB - tM) < CTI:
                 tmt += (CTI - (tB - tM))
@@ -207,6 +215,9 @@ def genetic_algorithm(scenarioID, scenarioData):
             "pickup": round(PUbest[r], 5)
         } for r in range(nR)
     }
+    if curves:
+        for r in range(nR):
+            optimized[relays[r]]["curve"] = curves[r]
     
     return optimized
 
@@ -231,6 +242,10 @@ def optimize_all_scenarios():
     processed_dir = Path("data/processed")
     processed_dir.mkdir(parents=True, exist_ok=True)
     
+    pairs_by_scenario = {}
+    for pair in raw_data:
+        pairs_by_scenario.setdefault(pair.get('scenario_id'), []).append(pair)
+    
     # Optimize each scenario
     all_optimized = {}
     successful_optimizations = 0
@@ -266,27 +281,9 @@ def optimize_all_scenarios():
                         "relay_values": optimized_values
                     }], f, indent=2, ensure_ascii=False)
                 
-                # Update pairs with optimized values
-                updated_pairs = []
-                for pair in raw_data:
-                    if pair.get('scenario_id') == scenario_id:
-                        # Update main relay
-                        main_name = pair['main_relay'].get('relay')
-                        if main_name in optimized_values:
-                            pair['main_relay']['TDS'] = optimized_values[main_name]['TDS']
-                            pair['main_relay']['pick_up'] = optimized_values[main_name]['pickup']
-                            ishc_m = get_numeric_field(pair['main_relay'], ["Ishc","I_shc","Isc","fault_current"])
-                            pair['main_relay']['Time_out'] = time_iec(ishc_m, optimized_values[main_name]['pickup'], optimized_values[main_name]['TDS'])
-                        
-                        # Update backup relay
-                        backup_name = pair['backup_relay'].get('relay')
-                        if backup_name in optimized_values:
-                            pair['backup_relay']['TDS'] = optimized_values[backup_name]['TDS']
-                            pair['backup_relay']['pick_up'] = optimized_values[backup_name]['pickup']
-                            ishc_b = get_numeric_field(pair['backup_relay'], ["Ishc","I_shc","Isc","fault_current"])
-                            pair['backup_relay']['Time_out'] = time_iec(ishc_b, optimized_values[backup_name]['pickup'], optimized_values[backup_name]['TDS'])
-                        
-                        updated_pairs.append(pair)
+                # Apply optimized values to this scenario's pairs (new records, raw_data is untouched)
+                updated_pairs = apply_optimized_settings(pairs_by_scenario.get(scenario_id, []),
+                                                         {scenario_id: optimized_values})
                 
                 # Save optimized pairs for this scenario
                 pairs_file = processed_dir / f"automation_results_{scenario_id}_optimized.json"
@@ -315,6 +312,12 @@ def optimize_all_scenarios():
     with open(comprehensive_file, 'w', encoding='utf-8') as f:
         json.dump(comprehensive_results, f, indent=2, ensure_ascii=False)
     
+    artifacts = {'comprehensive_results': comprehensive_file}
+    for scenario_id in all_optimized:
+        artifacts[f'scenario_{scenario_id}'] = processed_dir / f"optimized_relay_values_{scenario_id}_GA.json"
+        artifacts[f'optimized_pairs_{scenario_id}'] = processed_dir / f"automation_results_{scenario_id}_optimized.json"
+    write_run_manifest(processed_dir, f"all_scenarios_{timestamp}", artifacts, kind="all_scenarios_optimization")
+    
     print(f"\n🎉 Optimization completed!")
     print(f"📊 Summary:")
     print(f"  Total scenarios: {len(scenario_ids)}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Streaming reader/writer for relay pair files
+Pairs are written one record at a time as JSON Lines, optionally gzip- or
+zstd-compressed, so large scenario sets never have to be held as one JSON
+document; readers accept both JSON Lines and the legacy JSON-array files
+"""
+
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Format name -> file suffix (the legacy format is an indented JSON array)
+PAIR_FORMATS = {
+    "json": ".json",
+    "jsonl": ".jsonl",
+    "jsonl.gz": ".jsonl.gz",
+    "jsonl.zst": ".jsonl.zst"
+}
+
+def pairs_format(path: Union[str, Path]) -> str:
+    """Pair file format from its suffix"""
+    name = str(path)
+    for fmt, suffix in sorted(PAIR_FORMATS.items(), key=lambda kv: -len(kv[1])):
+        if name.endswith(suffix):
+            return fmt
+    raise ValueError(f"Unknown pair file format: {path}")
+
+def pairs_path(directory: Path, stem: str, fmt: str) -> Path:
+    """File path for a pair file stem in the given format"""
+    if fmt not in PAIR_FORMATS:
+        raise ValueError(f"Unknown pair format '{fmt}', expected one of {list(PAIR_FORMATS)}")
+    return Path(directory) / f"{stem}{PAIR_FORMATS[fmt]}"
+
+def find_pairs_file(directory: Path, stem: str) -> Optional[Path]:
+    """Existing pair file for a stem in any supported format"""
+    for fmt in PAIR_FORMATS:
+        path = pairs_path(directory, stem, fmt)
+        if path.exists():
+            return path
+    return None
+
+def require_zstandard() -> None:
+    """Fail clearly when a .zst file is used without the optional package"""
+    if zstandard is None:
+        raise RuntimeError("zstd pair files need the 'zstandard' package (pip install zstandard)")
+
+def open_text(path: Path, mode: str) -> IO[str]:
+    """Text stream for a pair file, transparently (de)compressing"""
+    fmt = pairs_format(path)
+    if fmt == "jsonl.gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if fmt == "jsonl.zst":
+        require_zstandard()
+        raw = open(path, mode + "b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+class PairWriter:
+    """Context manager writing pair records one at a time in the format of the path"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.format = pairs_format(self.path)
+        self.count = 0
+        self._f: Optional[IO[str]] = None
+
+    def __enter__(self) -> "PairWriter":
+        self._f = open_text(self.path, "w")
+        if self.format == "json":
+            self._f.write("[")
+        return self
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one record"""
+        if self.format == "json":
+            self._f.write(("," if self.count else "") + "\n  " + json.dumps(record, ensure_ascii=False))
+        else:
+            self._f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.format == "json":
+            self._f.write("\n]\n")
+        self._f.close()
+
+def iter_pairs(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Pair records of a file, streamed for JSON Lines (legacy JSON arrays are loaded whole)"""
+    path = Path(path)
+    if pairs_format(path) == "json":
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+        return
+    with open_text(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def load_pairs(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """All pair records of a file in any supported format"""
+    return list(iter_pairs(path))
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Artifact-caching DAG runner for the optimize → TMT → (report, plot) workflow
+Each stage declares its upstream stages, input files, code modules and
+parameters; its cache key is the hash of all of them (upstream outputs by
+content hash, code modules with every script module they import), so a
+stage only re-executes when something it depends on changed. Ready stages run in parallel in a process pool and every run ends
+with a per-stage timing summary
+
+Usage:
+    python pipeline.py [stage to force ...]
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from run_manifest import atomic_write_json, file_sha256, resolve_run
+
+PIPELINE_CACHE = "pipeline_cache.json"
+PIPELINE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+SCRIPTS_DIR = Path(__file__).parent
+
+def script_imports(module: str) -> List[str]:
+    """Script modules imported anywhere in a module's source (including function-level imports)"""
+    tree = ast.parse((SCRIPTS_DIR / f"{module}.py").read_text(encoding="utf-8"))
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split(".")[0])
+    return sorted(name for name in names if (SCRIPTS_DIR / f"{name}.py").exists())
+
+def code_closure(modules: Iterable[str]) -> List[str]:
+    """The modules plus every script module they import, transitively"""
+    closure = set()
+    pending = list(modules)
+    while pending:
+        module = pending.pop()
+        if module not in closure:
+            closure.add(module)
+            pending.extend(script_imports(module))
+    return sorted(closure)
+
+def make_stage(name: str, func: Callable[[Dict, Dict[str, Path], Dict[str, Any]], Dict[str, Any]],
+               deps: Iterable[str] = (), inputs: Optional[Dict[str, Path]] = None,
+               code: Iterable[str] = (), params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Stage definition
+
+    ``func(paths, inputs, params)`` returns its output artifacts as
+    {name: path}. It receives the declared ``inputs`` plus every output of
+    its ``deps`` as "<dep>.<artifact>". ``code`` lists the script modules the
+    stage runs; their source and that of every script module they import is
+    part of the cache key, as is the source of the module defining ``func``.
+    """
+    return {
+        'name': name,
+        'func': func,
+        'deps': list(deps),
+        'inputs': dict(inputs or {}),
+        'code': code_closure(code) + [Path(inspect.getfile(func)).stem],
+        'params': dict(params or {})
+    }
+
+# ---- stages of the default pipeline ------------------------------------
+
+def stage_optimize(paths: Dict, inputs: Dict[str, Path], params: Dict[str, Any]) -> Dict[str, Any]:
+    """GA optimization of all scenarios; outputs are the artifacts recorded in the run manifest"""
+    import ga_optimization_fast
+
+    ga_optimization_fast.main()
+    entry = resolve_run(paths['data_processed'])
+    return {
+        name: Path(a['path']) if Path(a['path']).is_absolute() else paths['data_processed'] / a['path']
+        for name, a in entry['artifacts'].items()
+    }
+
+def stage_tmt(paths: Dict, inputs: Dict[str, Path], params: Dict[str, Any]) -> Dict[str, Any]:
+    """TMT of every scenario under its optimized settings"""
+    from calculate_ga_tmt import calculate_tmt_from_optimized_settings
+
+    with open(inputs['raw'], "r", encoding="utf-8") as f:
+        raw_pairs_data = json.load(f)
+    with open(inputs['optimize.comprehensive_results'], "r", encoding="utf-8") as f:
+        ga_data = json.load(f)
+
+    by_scenario: Dict[str, List[Dict]] = {}
+    for pair in raw_pairs_data:
+        by_scenario.setdefault(pair.get('scenario_id'), []).append(pair)
+    ga_tmt = {
+        sid: calculate_tmt_from_optimized_settings(sid, result.get('relay_values', {}), by_scenario.get(sid, []))
+        for sid, result in ga_data.get('optimization_results', {}).items()
+    }
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['data_processed'] / f"ga_tmt_by_scenario_{timestamp}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({'timestamp': timestamp, 'ga_tmt': ga_tmt}, f, indent=2)
+    return {'ga_tmt': output_file}
+
+def stage_report(paths: Dict, inputs: Dict[str, Path], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Comprehensive report over the optimized pair files of the run"""
+    from generate_comprehensive_report import generate_comprehensive_report
+
+    prefix = "optimize.optimized_pairs_"
+    optimized_files = {name[len(prefix):]: path for name, path in inputs.items() if name.startswith(prefix)}
+    report_file, csv_file = generate_comprehensive_report(paths['project_root'], optimized_files)
+    return {'report': report_file, 'csv': csv_file}
+
+def stage_plot(paths: Dict, inputs: Dict[str, Path], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Bar chart of the per-scenario TMT of the run"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    with open(inputs['tmt.ga_tmt'], "r", encoding="utf-8") as f:
+        ga_tmt = json.load(f)['ga_tmt']
+    scenario_ids = sorted(ga_tmt, key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+
+    fig, ax = plt.subplots(figsize=(14, 5))
+    ax.bar(range(len(scenario_ids)), [abs(ga_tmt[sid]) for sid in scenario_ids], color="tab:blue")
+    ax.set_xticks(range(len(scenario_ids)))
+    ax.set_xticklabels([sid.split('_')[-1] for sid in scenario_ids], fontsize=7)
+    ax.set_xlabel("Scenario")
+    ax.set_ylabel("|TMT| (s)")
+    ax.set_title("TMT per scenario with GA-optimized settings")
+    fig.tight_layout()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['figures'] / f"ga_tmt_by_scenario_{timestamp}.png"
+    fig.savefig(output_file, dpi=params.get('dpi', 150))
+    plt.close(fig)
+    return {'figure': output_file}
+
+def default_stages(paths: Dict) -> Dict[str, Dict[str, Any]]:
+    """optimize → (TMT → plot, report); the report branch runs in parallel with TMT and plot"""
+    stages = [
+        make_stage("optimize", stage_optimize, inputs={'raw': paths['input_file']},
+                   code=["ga_optimization_fast"]),
+        make_stage("tmt", stage_tmt, deps=["optimize"], inputs={'raw': paths['input_file']},
+                   code=["calculate_ga_tmt"]),
+        make_stage("report", stage_report, deps=["optimize"],
+                   code=["generate_comprehensive_report"]),
+        make_stage("plot", stage_plot, deps=["tmt"], params={'dpi': 150})
+    ]
+    return {stage['name']: stage for stage in stages}
+
+# ---- runner ------------------------------------------------------------
+
+def topological_order(stages: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Stage names with every stage after its dependencies; rejects unknown deps and cycles"""
+    order: List[str] = []
+    state: Dict[str, str] = {}
+
+    def visit(name: str, chain: Tuple[str, ...]) -> None:
+        if name not in stages:
+            raise ValueError(f"Unknown stage '{name}' (required by {chain[-1]})")
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' → '.join(chain + (name,))}")
+        state[name] = "visiting"
+        for dep in stages[name]['deps']:
+            visit(dep, chain + (name,))
+        state[name] = "done"
+        order.append(name)
+
+    for name in stages:
+        visit(name, ())
+    return order
+
+def code_hash(module: str) -> str:
+    """Content hash of a script module's source"""
+    return file_sha256(SCRIPTS_DIR / f"{module}.py")
+
+def stage_key(stage: Dict[str, Any], input_hashes: Dict[str, str]) -> str:
+    """Cache key of a stage for the given input hashes"""
+    material = {
+        'stage': stage['name'],
+        'code': {module: code_hash(module) for module in sorted(set(stage['code']))},
+        'params': stage['params'],
+        'inputs': input_hashes
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def cached_outputs(entry: Optional[Dict[str, Any]], key: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Recorded outputs of a stage if its key matches and every output is unchanged on disk"""
+    if not entry or entry.get('key') != key:
+        return None
+    for output in entry['outputs'].values():
+        path = Path(output['path'])
+        if not path.exists() or file_sha256(path) != output['sha256']:
+            return None
+    return entry['outputs']
+
+def execute_stage(func: Callable, paths: Dict, inputs: Dict[str, Path], params: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+    """Worker: run a stage and time it"""
+    start = time.perf_counter()
+    outputs = func(paths, inputs, params)
+    return outputs, time.perf_counter() - start
+
+def run_pipeline(paths: Dict, stages: Optional[Dict[str, Dict[str, Any]]] = None,
+                 workers: int = PIPELINE_WORKERS, force: Iterable[str] = ()) -> Dict[str, Any]:
+    """Run the stages whose cache keys changed, in dependency order and in parallel where possible"""
+    stages = stages or default_stages(paths)
+    order = topological_order(stages)
+    force = set(force)
+    cache_file = paths['data_processed'] / PIPELINE_CACHE
+    cache: Dict[str, Any] = {}
+    if cache_file.exists():
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+
+    outputs: Dict[str, Dict[str, Dict[str, Any]]] = {}   # stage -> artifact -> {path, sha256}
+    summary: Dict[str, Dict[str, Any]] = {}
+    pending = list(order)
+    running = {}
+    start = time.perf_counter()
+    print(f"🧩 Pipeline: {' → '.join(order)} ({workers} worker(s))")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for name in list(pending):
+                stage = stages[name]
+                if any(summary.get(dep, {}).get('status') in ("failed", "skipped") for dep in stage['deps']):
+                    pending.remove(name)
+                    summary[name] = {'status': "skipped", 'seconds': 0.0}
+                    print(f"   ⏭️  {name}: skipped (upstream failed)")
+                    continue
+                if not all(dep in outputs for dep in stage['deps']):
+                    continue
+                pending.remove(name)
+
+                inputs = {k: Path(v) for k, v in stage['inputs'].items()}
+                input_hashes = {k: file_sha256(v) for k, v in inputs.items()}
+                for dep in stage['deps']:
+                    for artifact, output in outputs[dep].items():
+                        inputs[f"{dep}.{artifact}"] = Path(output['path'])
+                        input_hashes[f"{dep}.{artifact}"] = output['sha256']
+                key = stage_key(stage, input_hashes)
+
+                hit = None if name in force else cached_outputs(cache.get(name), key)
+                if hit is not None:
+                    outputs[name] = hit
+                    summary[name] = {'status': "cached", 'seconds': 0.0, 'key': key}
+                    print(f"   ♻️  {name}: cached ({len(hit)} artifact(s))")
+                    continue
+                print(f"   ▶️  {name}: running")
+                future = pool.submit(execute_stage, stage['func'], paths, inputs, stage['params'])
+                running[future] = (name, key)
+
+            if not running:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, key = running.pop(future)
+                try:
+                    produced, seconds = future.result()
+                except Exception as e:
+                    summary[name] = {'status': "failed", 'seconds': 0.0, 'error': f"{type(e).__name__}: {e}"}
+                    print(f"   ❌ {name}: {summary[name]['error']}")
+                    continue
+                outputs[name] = {
+                    artifact: {'path': str(Path(path).resolve()), 'sha256': file_sha256(path)}
+                    for artifact, path in produced.items()
+                }
+                cache[name] = {'key': key, 'outputs': outputs[name], 'seconds': seconds,
+                               'finished_at': datetime.now(timezone.utc).isoformat()}
+                atomic_write_json(cache_file, cache)
+                summary[name] = {'status': "ran", 'seconds': seconds, 'key': key}
+                print(f"   ✅ {name}: {seconds:.2f}s ({len(produced)} artifact(s))")
+
+    total = time.perf_counter() - start
+    print(f"\n{'='*60}")
+    print("⏱️  PIPELINE TIMING")
+    for name in order:
+        info = summary[name]
+        print(f"   {name:12s} {info['status']:8s} {info['seconds']:8.2f}s")
+    print(f"   {'total':12s} {'':8s} {total:8.2f}s")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary_file = paths['tables'] / f"pipeline_run_{timestamp}.json"
+    with open(summary_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'order': order,
+            'total_seconds': total,
+            'stages': summary,
+            'outputs': outputs
+        }, f, indent=2, ensure_ascii=False)
+    print(f"   📄 Pipeline summary: {summary_file}")
+    return {'stages': summary, 'outputs': outputs, 'summary_file': summary_file}
+
+def main():
+    """Run the default pipeline; stage names given on the command line are forced to re-run"""
+    from ga_optimization_fast import setup_paths
+
+    result = run_pipeline(setup_paths(), force=sys.argv[1:])
+    return 1 if any(s['status'] == "failed" for s in result['stages'].values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
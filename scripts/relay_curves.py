@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Inverse-time overcurrent curve registry (IEC 60255 / IEEE C37.112)
+Every curve is t = TDS * (A / ((I/PU)**p - 1) + B); IEC curves have B = 0
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+CURVES = {
+    "IEC_SI": {"A": 0.14, "B": 0.0, "p": 0.02},      # IEC standard inverse
+    "IEC_VI": {"A": 13.5, "B": 0.0, "p": 1.0},       # IEC very inverse
+    "IEC_EI": {"A": 80.0, "B": 0.0, "p": 2.0},       # IEC extremely inverse
+    "IEC_LTI": {"A": 120.0, "B": 0.0, "p": 1.0},     # IEC long-time inverse
+    "IEEE_MI": {"A": 0.0515, "B": 0.114, "p": 0.02}, # IEEE moderately inverse
+    "IEEE_VI": {"A": 19.61, "B": 0.491, "p": 2.0},   # IEEE very inverse
+    "IEEE_EI": {"A": 28.2, "B": 0.1217, "p": 2.0},   # IEEE extremely inverse
+}
+CURVE_NAMES = list(CURVES.keys())
+CURVE_INDEX = {name: i for i, name in enumerate(CURVE_NAMES)}
+
+# Curve constants by registry index, for gathering per-relay curves in vectorized code
+CURVE_A = np.array([CURVES[c]["A"] for c in CURVE_NAMES])
+CURVE_B = np.array([CURVES[c]["B"] for c in CURVE_NAMES])
+CURVE_P = np.array([CURVES[c]["p"] for c in CURVE_NAMES])
+
+DEFAULT_CURVE = "IEC_SI"
+
+# Aliases accepted in input records
+CURVE_ALIASES = {
+    "SI": "IEC_SI", "NI": "IEC_SI", "IEC_NI": "IEC_SI", "STANDARD_INVERSE": "IEC_SI",
+    "VI": "IEC_VI", "VERY_INVERSE": "IEC_VI",
+    "EI": "IEC_EI", "EXTREMELY_INVERSE": "IEC_EI",
+    "LTI": "IEC_LTI", "LONG_TIME_INVERSE": "IEC_LTI",
+    "MI": "IEEE_MI", "MODERATELY_INVERSE": "IEEE_MI",
+}
+
+def normalize_curve(name: Optional[str]) -> Optional[str]:
+    """Registry name for a curve label, or None when it is unknown"""
+    if name is None:
+        return None
+    key = str(name).strip().upper().replace("-", "_").replace(" ", "_")
+    key = CURVE_ALIASES.get(key, key)
+    return key if key in CURVES else None
+
+def relay_curve(relay_info: Dict) -> Optional[str]:
+    """Curve carried by a relay record (``curve`` / ``curve_type``), if any"""
+    for field in ("curve", "curve_type"):
+        if field in relay_info:
+            return normalize_curve(relay_info[field])
+    return None
+
+def curve_time(I: float, PU: float, TDS: float, curve: str = DEFAULT_CURVE) -> float:
+    """Operating time of one relay on a registry curve (inf at or below pickup)"""
+    c = CURVES[curve]
+    M = I / PU
+    denom = (M ** c["p"]) - 1.0
+    if denom <= 0:
+        return float("inf")
+    return (c["A"] * TDS) / denom + c["B"] * TDS
+
+def curve_constants(curves: List[str]) -> Dict[str, List[float]]:
+    """A, B and p lists for a list of curve names"""
+    return {
+        "A": [CURVES[c]["A"] for c in curves],
+        "B": [CURVES[c]["B"] for c in curves],
+        "p": [CURVES[c]["p"] for c in curves],
+    }
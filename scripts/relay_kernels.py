@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Vectorized relay coordination kernels
+Scenarios are compiled once into flat NumPy pair arrays over a relay index so
+that the TMT of one or many setting vectors is a handful of array operations
+"""
+
+from typing import Dict, List, Tuple, Optional, Any
+
+import numpy as np
+from scipy import sparse
+
+from ga_optimization_fast import CTI, MAX_TIME
+from relay_curves import CURVES, CURVE_NAMES, CURVE_INDEX, DEFAULT_CURVE, CURVE_A, CURVE_B, CURVE_P
+
+def curve_groups(side_curve: np.ndarray) -> List[Tuple[str, np.ndarray]]:
+    """Pair positions of one relay side grouped by curve"""
+    return [(CURVE_NAMES[c], np.flatnonzero(side_curve == c)) for c in np.unique(side_curve)]
+
+def incidence_matrix(relay_idx: np.ndarray, n_relays: int, dtype: Any = np.float64) -> sparse.csr_matrix:
+    """(n_pairs, n_relays) CSR matrix with a single 1 per pair at its relay"""
+    n_pairs = len(relay_idx)
+    return sparse.csr_matrix((np.ones(n_pairs, dtype=dtype), relay_idx, np.arange(n_pairs + 1)),
+                             shape=(n_pairs, n_relays))
+
+def compile_scenario(scenario_data: Dict, relays: Optional[List[str]] = None,
+                     dtype: Any = np.float64, gather: str = "index") -> Dict[str, Any]:
+    """Compile a grouped scenario into pair arrays indexed by relay position
+
+    Relay curves come from ``relay_curves`` (default curve otherwise); pairs
+    are pre-grouped per side by curve so evaluation runs one kernel per curve.
+    ``dtype`` sets the precision of the current arrays, and with it the
+    precision the TMT kernels evaluate in (np.float32 halves pair storage).
+    The main/backup incidence matrices map relays to pairs; ``gather``
+    ("index" or "sparse") selects how relay settings are gathered per pair.
+    """
+    if relays is None:
+        relays = [r for r in scenario_data["relays"] if str(r).strip()]
+    idx = {relays[i]: i for i in range(len(relays))}
+    pairs = scenario_data["pairs"]
+    relay_curves = scenario_data.get("relay_curves") or {}
+
+    main_idx = np.array([idx[p["main_relay"]] for p in pairs], dtype=np.intp)
+    backup_idx = np.array([idx[p["backup_relay"]] for p in pairs], dtype=np.intp)
+    relay_curve = np.array([CURVE_INDEX[relay_curves.get(r, DEFAULT_CURVE)] for r in relays], dtype=np.intp)
+
+    return {
+        'relays': relays,
+        'idx': idx,
+        'n_relays': len(relays),
+        'main_idx': main_idx,
+        'backup_idx': backup_idx,
+        'Ishc_main': np.array([p["Ishc_main"] for p in pairs], dtype=dtype),
+        'Ishc_backup': np.array([p["Ishc_backup"] for p in pairs], dtype=dtype),
+        'relay_curve': relay_curve,
+        'main_curves': curve_groups(relay_curve[main_idx]),
+        'backup_curves': curve_groups(relay_curve[backup_idx]),
+        'main_incidence': incidence_matrix(main_idx, len(relays), dtype),
+        'backup_incidence': incidence_matrix(backup_idx, len(relays), dtype),
+        'gather': gather
+    }
+
+def stack_scenarios(scenario_map: Dict[str, Dict], scenario_ids: List[str],
+                    relays: Optional[List[str]] = None, dtype: Any = np.float64) -> Dict[str, Any]:
+    """Stack several scenarios into one compiled pair set over a global relay index
+
+    ``scenario_index`` gives, for every stacked pair, the position of its
+    scenario in ``scenario_ids`` so per-scenario TMT is a single bincount.
+    ``relays`` fixes the global relay order (it must cover every stacked relay).
+    """
+    build_relays = relays is None
+    relays = [] if build_relays else list(relays)
+    seen = set(relays)
+    pairs = []
+    scenario_index = []
+    for s, sid in enumerate(scenario_ids):
+        for r in scenario_map[sid]["relays"]:
+            if build_relays and str(r).strip() and r not in seen:
+                seen.add(r)
+                relays.append(r)
+        pairs.extend(scenario_map[sid]["pairs"])
+        scenario_index.extend([s] * len(scenario_map[sid]["pairs"]))
+
+    relay_curves = {}
+    for sid in scenario_ids:
+        for r, curve in (scenario_map[sid].get("relay_curves") or {}).items():
+            relay_curves.setdefault(r, curve)
+
+    stacked = compile_scenario({"pairs": pairs, "relays": relays, "relay_curves": relay_curves}, relays, dtype)
+    stacked['pairs'] = pairs
+    stacked['scenario_ids'] = list(scenario_ids)
+    stacked['scenario_index'] = np.array(scenario_index, dtype=np.intp)
+    return stacked
+
+def curve_time_vec(I: np.ndarray, PU: np.ndarray, TDS: np.ndarray, A: Any, B: Any, p: Any) -> np.ndarray:
+    """Vectorized curve time with the same penalty rules as relay_time
+
+    The curve constants may be scalars (one curve) or arrays broadcastable
+    against the pair arrays (per-pair curves).
+    """
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        t = TDS * (A / ((I / PU) ** p - 1.0) + B)
+    t = np.clip(np.nan_to_num(t, nan=MAX_TIME * 10.0, posinf=MAX_TIME * 10.0), 0.0, MAX_TIME * 10.0)
+    return np.where(I <= PU, MAX_TIME * 10.0, t)
+
+def relay_time_vec(I: np.ndarray, PU: np.ndarray, TDS: np.ndarray, curve: str = DEFAULT_CURVE) -> np.ndarray:
+    """Vectorized relay operating time on one registry curve"""
+    c = CURVES[curve]
+    return curve_time_vec(I, PU, TDS, c["A"], c["B"], c["p"])
+
+def side_times(I: np.ndarray, PU: np.ndarray, TDS: np.ndarray, groups: List[Tuple[str, np.ndarray]]) -> np.ndarray:
+    """Operating times of one pair side, one vectorized kernel call per curve present"""
+    if len(groups) == 1:
+        return relay_time_vec(I, PU, TDS, groups[0][0])
+    t = np.empty(np.broadcast_shapes(I.shape, PU.shape, TDS.shape))
+    for curve, pos in groups:
+        t[..., pos] = relay_time_vec(I[pos], PU[..., pos], TDS[..., pos], curve)
+    return t
+
+def gather_relays(values: np.ndarray, incidence: sparse.csr_matrix) -> np.ndarray:
+    """Per-pair copy of per-relay values, (..., n_relays) -> (..., n_pairs), as a sparse product"""
+    if values.ndim == 1:
+        return incidence @ values
+    return (incidence @ values.reshape(-1, values.shape[-1]).T).T.reshape(values.shape[:-1] + (incidence.shape[0],))
+
+def aggregate_pairs(values: np.ndarray, incidence: sparse.csr_matrix) -> np.ndarray:
+    """Per-relay sums of per-pair values, (..., n_pairs) -> (..., n_relays), via the transposed incidence"""
+    if values.ndim == 1:
+        return incidence.T @ values
+    return (incidence.T @ values.reshape(-1, values.shape[-1]).T).T.reshape(values.shape[:-1] + (incidence.shape[1],))
+
+def pair_times(tds: np.ndarray, pu: np.ndarray, compiled: Dict[str, Any],
+               curve_genes: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Main and backup operating times of every pair, each of shape (..., n_pairs)
+
+    ``tds`` and ``pu`` have shape (..., n_relays); any leading batch
+    dimensions are kept. ``curve_genes`` (..., n_relays) overrides the
+    compiled relay curves with registry indices chosen by the optimizer.
+    """
+    mi = compiled['main_idx']
+    bi = compiled['backup_idx']
+    if curve_genes is None and compiled.get('gather') == "sparse":
+        Mm, Mb = compiled['main_incidence'], compiled['backup_incidence']
+        tM = side_times(compiled['Ishc_main'], gather_relays(pu, Mm), gather_relays(tds, Mm), compiled['main_curves'])
+        tB = side_times(compiled['Ishc_backup'], gather_relays(pu, Mb), gather_relays(tds, Mb), compiled['backup_curves'])
+    elif curve_genes is None:
+        tM = side_times(compiled['Ishc_main'], pu[..., mi], tds[..., mi], compiled['main_curves'])
+        tB = side_times(compiled['Ishc_backup'], pu[..., bi], tds[..., bi], compiled['backup_curves'])
+    else:
+        cm = curve_genes[..., mi]
+        cb = curve_genes[..., bi]
+        tM = curve_time_vec(compiled['Ishc_main'], pu[..., mi], tds[..., mi], CURVE_A[cm], CURVE_B[cm], CURVE_P[cm])
+        tB = curve_time_vec(compiled['Ishc_backup'], pu[..., bi], tds[..., bi], CURVE_A[cb], CURVE_B[cb], CURVE_P[cb])
+    return tM, tB
+
+def pair_penalties(tds: np.ndarray, pu: np.ndarray, compiled: Dict[str, Any],
+                   curve_genes: Optional[np.ndarray] = None) -> np.ndarray:
+    """Per-pair miscoordination penalties, shape (..., n_pairs) (see pair_times)"""
+    tM, tB = pair_times(tds, pu, compiled, curve_genes)
+    return np.maximum(CTI - (tB - tM), 0.0) + np.maximum(tM - MAX_TIME, 0.0)
+
+def relay_penalties(individual: np.ndarray, compiled: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Penalty attributed to each relay as main and as backup, each of shape (..., n_relays)"""
+    individual = np.asarray(individual, dtype=compiled['Ishc_main'].dtype)
+    nR = compiled['n_relays']
+    penalties = pair_penalties(individual[..., :nR], individual[..., nR:], compiled)
+    return (aggregate_pairs(penalties, compiled['main_incidence']),
+            aggregate_pairs(penalties, compiled['backup_incidence']))
+
+def tmt_vec(individual: np.ndarray, compiled: Dict[str, Any]) -> np.ndarray:
+    """TMT of one individual [TDS..., pickup...] or a batch of shape (P, 2*n_relays)"""
+    individual = np.asarray(individual, dtype=compiled['Ishc_main'].dtype)
+    nR = compiled['n_relays']
+    return pair_penalties(individual[..., :nR], individual[..., nR:], compiled).sum(axis=-1)
+
+def scenario_tmt(individual: np.ndarray, stacked: Dict[str, Any]) -> np.ndarray:
+    """Per-scenario TMT of one individual over a stacked scenario set"""
+    individual = np.asarray(individual, dtype=stacked['Ishc_main'].dtype)
+    nR = stacked['n_relays']
+    penalties = pair_penalties(individual[:nR], individual[nR:], stacked)
+    return np.bincount(stacked['scenario_index'], weights=penalties, minlength=len(stacked['scenario_ids']))
+
+def scenario_tmt_batch(individuals: np.ndarray, stacked: Dict[str, Any]) -> np.ndarray:
+    """Per-scenario TMT of several individuals at once, shape (n_individuals, n_scenarios)"""
+    individuals = np.atleast_2d(np.asarray(individuals, dtype=stacked['Ishc_main'].dtype))
+    nR = stacked['n_relays']
+    n_ind = individuals.shape[0]
+    n_scen = len(stacked['scenario_ids'])
+    penalties = pair_penalties(individuals[:, :nR], individuals[:, nR:], stacked)
+    bins = (np.arange(n_ind)[:, None] * n_scen + stacked['scenario_index'][None, :]).ravel()
+    return np.bincount(bins, weights=penalties.ravel(), minlength=n_ind * n_scen).reshape(n_ind, n_scen)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Run-oriented SQLite store for GA optimization results
+Each optimization run is written in one transaction, keyed by run ID and
+scenario, with its GA parameters, per-scenario settings, TMT metrics and
+timings; the latest result of a scenario is an indexed lookup instead of a
+directory scan, and any run can be exported in the comprehensive JSON layout
+"""
+
+import json
+import sqlite3
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+RESULTS_DB_NAME = "ga_results.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT UNIQUE NOT NULL,
+    created_at TEXT NOT NULL,
+    source TEXT,
+    ga_params TEXT,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS scenario_results (
+    run_seq INTEGER NOT NULL REFERENCES runs(seq),
+    scenario_id TEXT NOT NULL,
+    best_tmt REAL,
+    generations INTEGER,
+    evaluations INTEGER,
+    seconds REAL,
+    relay_values TEXT NOT NULL,
+    extra TEXT,
+    PRIMARY KEY (run_seq, scenario_id)
+);
+CREATE INDEX IF NOT EXISTS idx_scenario_latest ON scenario_results (scenario_id, run_seq DESC);
+"""
+
+# Per-scenario fields stored in their own columns; the rest go to ``extra``
+SCENARIO_COLUMNS = ('best_tmt', 'generations', 'evaluations', 'seconds', 'relay_values')
+
+def results_db_path(paths: Dict) -> Path:
+    """Location of the results database"""
+    return paths['data_processed'] / RESULTS_DB_NAME
+
+def open_store(paths: Dict) -> sqlite3.Connection:
+    """Open (and create if needed) the results database"""
+    conn = sqlite3.connect(results_db_path(paths))
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def new_run_id(prefix: str = "ga") -> str:
+    """Sortable, unique run ID"""
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+def record_run(conn: sqlite3.Connection, optimization_results: Dict[str, Dict], run_id: Optional[str] = None,
+               source: str = "ga_optimization_fast", ga_params: Optional[Dict[str, Any]] = None,
+               summary: Optional[Dict[str, Any]] = None) -> str:
+    """Store all scenario results of one run in a single transaction and return its run ID
+
+    ``optimization_results`` maps scenario IDs to result dicts holding at
+    least ``relay_values`` (as in optimize_all_scenarios).
+    """
+    run_id = run_id or new_run_id()
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO runs (run_id, created_at, source, ga_params, summary) VALUES (?, ?, ?, ?, ?)",
+            (run_id, datetime.now(timezone.utc).isoformat(), source,
+             json.dumps(ga_params or {}), json.dumps(summary or {}))
+        )
+        run_seq = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO scenario_results (run_seq, scenario_id, best_tmt, generations, evaluations, seconds, "
+            "relay_values, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_seq, sid, result.get('best_tmt'), result.get('generations'), result.get('evaluations'),
+                 result.get('seconds'), json.dumps(result['relay_values']),
+                 json.dumps({k: v for k, v in result.items() if k not in SCENARIO_COLUMNS}, default=str))
+                for sid, result in optimization_results.items()
+            ]
+        )
+    return run_id
+
+def row_result(row: sqlite3.Row) -> Dict[str, Any]:
+    """Scenario result dict of a joined scenario_results/runs row"""
+    return {
+        **json.loads(row['extra'] or "{}"),
+        'run_id': row['run_id'],
+        'scenario_id': row['scenario_id'],
+        'best_tmt': row['best_tmt'],
+        'generations': row['generations'],
+        'evaluations': row['evaluations'],
+        'seconds': row['seconds'],
+        'relay_values': json.loads(row['relay_values'])
+    }
+
+def latest_scenario_result(conn: sqlite3.Connection, scenario_id: str) -> Optional[Dict[str, Any]]:
+    """Most recent stored result of a scenario (index lookup)"""
+    row = conn.execute(
+        "SELECT s.*, r.run_id FROM scenario_results s JOIN runs r ON r.seq = s.run_seq "
+        "WHERE s.scenario_id = ? ORDER BY s.run_seq DESC LIMIT 1", (scenario_id,)
+    ).fetchone()
+    return row_result(row) if row else None
+
+def latest_run_id(conn: sqlite3.Connection) -> Optional[str]:
+    """ID of the most recent run"""
+    row = conn.execute("SELECT run_id FROM runs ORDER BY seq DESC LIMIT 1").fetchone()
+    return row['run_id'] if row else None
+
+def run_results(conn: sqlite3.Connection, run_id: str) -> Dict[str, Dict[str, Any]]:
+    """All scenario results of one run, by scenario ID"""
+    rows = conn.execute(
+        "SELECT s.*, r.run_id FROM scenario_results s JOIN runs r ON r.seq = s.run_seq WHERE r.run_id = ?",
+        (run_id,)
+    ).fetchall()
+    return {row['scenario_id']: row_result(row) for row in rows}
+
+def list_runs(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Stored runs, newest first, with their scenario counts"""
+    rows = conn.execute(
+        "SELECT r.run_id, r.created_at, r.source, COUNT(s.scenario_id) AS scenarios FROM runs r "
+        "LEFT JOIN scenario_results s ON s.run_seq = r.seq GROUP BY r.seq ORDER BY r.seq DESC"
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+def export_run_json(conn: sqlite3.Connection, run_id: str, output_file: Path,
+                    scenario_dir: Optional[Path] = None) -> Path:
+    """Write a run in the comprehensive-results JSON layout (optimization_results by scenario)
+
+    With ``scenario_dir`` the legacy per-scenario files
+    (optimized_relay_values_<scenario>_GA_<timestamp>.json) are written there too.
+    """
+    run = conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+    if run is None:
+        raise KeyError(f"Unknown run '{run_id}'")
+    results = run_results(conn, run_id)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({
+            'run_id': run_id,
+            'timestamp': run['created_at'],
+            'ga_params': json.loads(run['ga_params'] or "{}"),
+            'optimization_results': results,
+            'optimization_summary': json.loads(run['summary'] or "{}")
+        }, f, indent=2, ensure_ascii=False)
+
+    if scenario_dir is not None:
+        timestamp = datetime.fromisoformat(run['created_at']).astimezone().strftime("%Y%m%d_%H%M%S")
+        for scenario_id, result in results.items():
+            with open(Path(scenario_dir) / f"optimized_relay_values_{scenario_id}_GA_{timestamp}.json", "w",
+                      encoding="utf-8") as f:
+                json.dump([result], f, indent=2, ensure_ascii=False)
+    return output_file
+
+def main():
+    """List the stored runs and export the latest one as JSON (with "scenarios": per-scenario files too)"""
+    from ga_optimization_fast import setup_paths
+
+    paths = setup_paths()
+    conn = open_store(paths)
+    runs = list_runs(conn)
+    print(f"🗄️  {len(runs)} runs in {results_db_path(paths)}")
+    for run in runs[:10]:
+        print(f"   • {run['run_id']}  {run['created_at']}  {run['source']}  ({run['scenarios']} scenarios)")
+    if runs:
+        scenario_dir = paths['data_processed'] if "scenarios" in sys.argv[1:] else None
+        output_file = export_run_json(conn, runs[0]['run_id'], paths['data_processed'] / f"{runs[0]['run_id']}.json",
+                                      scenario_dir)
+        print(f"   📄 Latest run exported: {output_file}"
+              + (f" (+{runs[0]['scenarios']} scenario files)" if scenario_dir else ""))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Robust single-setting GA optimization across many scenarios
+One relay setting group is optimized against the worst-case or summed TMT of
+all selected scenarios, evaluated with one stacked vectorized kernel
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple, Optional, Any
+
+import numpy as np
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, compute_bounds,
+    evolve_population, GA_maxGen, GA_iterno
+)
+from relay_kernels import stack_scenarios, scenario_tmt
+
+OBJECTIVES = ("max", "sum")
+
+def robust_objective(per_scenario: np.ndarray, objective: str) -> float:
+    """Aggregate per-scenario TMT into the robust objective"""
+    if objective == "max":
+        return float(per_scenario.max())
+    return float(per_scenario.sum())
+
+def robust_optimization(scenario_map: Dict[str, Dict], scenario_ids: List[str], objective: str = "max",
+                        initial_population: Optional[List[List[float]]] = None,
+                        max_generations: int = GA_maxGen, stall_generations: int = GA_iterno,
+                        relays: Optional[List[str]] = None,
+                        bounds: Optional[Tuple[List[float], List[float]]] = None) -> Dict[str, Any]:
+    """Optimize one setting vector over a global relay index for several scenarios
+
+    ``relays`` and ``bounds`` pin the relay order and search bounds, e.g. so
+    that settings optimized on different scenario subsets stay comparable.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}', expected one of {OBJECTIVES}")
+
+    stacked = stack_scenarios(scenario_map, scenario_ids, relays)
+    relays = stacked['relays']
+    nR = stacked['n_relays']
+    xmin, xmax = bounds if bounds is not None else compute_bounds(relays, stacked['pairs'])
+
+    print(f"    🔗 Stacked {len(scenario_ids)} scenarios: {len(stacked['pairs'])} pairs, {nR} relays "
+          f"(objective: {objective} TMT)")
+
+    def fitness(individual: List[float]) -> float:
+        """Robust TMT over all stacked scenarios"""
+        return robust_objective(scenario_tmt(individual, stacked), objective)
+
+    evolved = evolve_population(fitness, xmin, xmax, initial_population, max_generations, stall_generations)
+
+    best = evolved['best']
+    per_scenario = scenario_tmt(best, stacked)
+    return {
+        'objective': objective,
+        'scenario_ids': list(scenario_ids),
+        'relays': relays,
+        'relay_values': {
+            relays[r]: {"TDS": round(best[r], 5), "pickup": round(best[nR + r], 5)}
+            for r in range(nR)
+        },
+        'best_objective': evolved['best_tmt'],
+        'scenario_tmt': {sid: float(per_scenario[s]) for s, sid in enumerate(scenario_ids)},
+        'generations': evolved['generations'],
+        'population': [ind[:2 * nR] for ind in evolved['population']]
+    }
+
+def main(objective: str = "max"):
+    """Compute one robust setting group for every valid scenario of the input file"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = [
+        sid for sid in sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+        if validate_scenario_data(scenario_map[sid])[0]
+    ]
+
+    start_time = datetime.now()
+    result = robust_optimization(scenario_map, scenario_ids, objective)
+    result.pop('population')
+    result['processing_time'] = (datetime.now() - start_time).total_seconds()
+    result['timestamp'] = datetime.now(timezone.utc).isoformat()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['data_processed'] / f"ga_robust_settings_{objective}_{timestamp}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(f"   ✅ Robust {objective} TMT = {result['best_objective']:.6f}")
+    print(f"   📄 Robust settings: {output_file}")
+    return result
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Append-only run manifest for optimization outputs
+Every optimization entry point records its artifacts (with content hashes),
+parameters and run ID; the manifest log is append-only, while the per-run file
+and the "latest" pointer are replaced atomically, so consumers resolve the
+latest or a named run with a single file read instead of globbing by mtime
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Any, Union
+
+MANIFEST_LOG = "run_manifest.jsonl"
+MANIFEST_RUNS_DIR = "runs"
+DEFAULT_KIND = "ga_optimization"
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def atomic_write_json(path: Path, obj: Any) -> None:
+    """Write JSON to a temporary file in the same directory and rename it over path"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+def append_line(path: Path, obj: Any) -> None:
+    """Append one JSON line with a single O_APPEND write"""
+    line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def latest_pointer(manifest_dir: Path, kind: str) -> Path:
+    """File holding the full entry of the latest run of a kind"""
+    return manifest_dir / f"latest_{kind}.json"
+
+def write_run_manifest(manifest_dir: Path, run_id: str, artifacts: Dict[str, Union[str, Path]],
+                       params: Optional[Dict[str, Any]] = None, kind: str = DEFAULT_KIND) -> Dict[str, Any]:
+    """Record a finished run: per-run file, manifest log line and latest pointer
+
+    Artifact paths inside ``manifest_dir`` are stored relative to it so the
+    processed directory can be moved as a whole.
+    """
+    manifest_dir = Path(manifest_dir)
+    recorded = {}
+    for name, path in artifacts.items():
+        path = Path(path)
+        try:
+            stored = str(path.resolve().relative_to(manifest_dir.resolve()))
+        except ValueError:
+            stored = str(path.resolve())
+        recorded[name] = {'path': stored, 'sha256': file_sha256(path), 'bytes': path.stat().st_size}
+
+    entry = {
+        'run_id': run_id,
+        'kind': kind,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'params': params or {},
+        'artifacts': recorded
+    }
+    atomic_write_json(manifest_dir / MANIFEST_RUNS_DIR / f"{run_id}.json", entry)
+    append_line(manifest_dir / MANIFEST_LOG, entry)
+    atomic_write_json(latest_pointer(manifest_dir, kind), entry)
+    return entry
+
+def resolve_run(manifest_dir: Path, run: str = "latest", kind: str = DEFAULT_KIND) -> Optional[Dict[str, Any]]:
+    """Manifest entry of the latest run of a kind, or of a named run"""
+    manifest_dir = Path(manifest_dir)
+    entry_file = latest_pointer(manifest_dir, kind) if run == "latest" else manifest_dir / MANIFEST_RUNS_DIR / f"{run}.json"
+    if not entry_file.exists():
+        return None
+    with open(entry_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def resolve_artifact(manifest_dir: Path, name: str, run: str = "latest", kind: str = DEFAULT_KIND,
+                     verify: bool = False, fallback_glob: Optional[str] = None) -> Optional[Path]:
+    """Path of a named artifact of a run; ``verify`` checks its content hash
+
+    Outputs written before the manifest existed have no entry: for the latest
+    run, ``fallback_glob`` then selects the newest matching file in manifest_dir.
+    """
+    entry = resolve_run(manifest_dir, run, kind)
+    if entry is None or name not in entry['artifacts']:
+        if fallback_glob is None or run != "latest":
+            return None
+        candidates = list(Path(manifest_dir).glob(fallback_glob))
+        return max(candidates, key=lambda p: p.stat().st_mtime) if candidates else None
+    artifact = entry['artifacts'][name]
+    path = Path(artifact['path'])
+    if not path.is_absolute():
+        path = Path(manifest_dir) / path
+    if verify and file_sha256(path) != artifact['sha256']:
+        raise ValueError(f"Artifact '{name}' of run {entry['run_id']} changed since it was recorded: {path}")
+    return path
+
+def manifest_history(manifest_dir: Path) -> Iterator[Dict[str, Any]]:
+    """All recorded runs, oldest first"""
+    log = Path(manifest_dir) / MANIFEST_LOG
+    if not log.exists():
+        return
+    with open(log, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
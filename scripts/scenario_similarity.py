@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Scenario similarity index for cross-scenario GA solution reuse
+Scenarios of the same network share most relay pairs, so a solved scenario is
+a good starting point for its nearest unsolved neighbours
+"""
+
+from typing import Dict, List, Tuple, Optional, Any
+
+from ga_optimization_fast import (
+    setup_paths, compute_bounds, optimize_all_scenarios, save_optimization_results, GA_Ni
+)
+from incremental_optimization import remap_population
+
+# Distance = (1 - Jaccard of (main, backup) sets) + ISHC_WEIGHT * mean relative Ishc distance
+ISHC_WEIGHT = 0.5
+
+SEED_NEIGHBOURS = 3          # Solved neighbours used to seed a scenario
+SEED_PER_NEIGHBOUR = 10      # Best individuals taken from each neighbour
+SEED_MAX_DISTANCE = 0.5      # Neighbours further away than this are not reused
+N_REPRESENTATIVES = 8        # Scenarios solved first in cluster order
+
+def scenario_signature(scenario_data: Dict) -> Dict[str, Any]:
+    """Pair set and fault currents used to compare scenarios"""
+    return {
+        'pair_set': {(p["main_relay"], p["backup_relay"]) for p in scenario_data["pairs"]},
+        'ishc': {
+            (p["main_relay"], p["backup_relay"], str(p.get("fault", "unknown"))): (p["Ishc_main"], p["Ishc_backup"])
+            for p in scenario_data["pairs"]
+        }
+    }
+
+def scenario_distance(sig_a: Dict[str, Any], sig_b: Dict[str, Any], ishc_weight: float = ISHC_WEIGHT) -> float:
+    """Jaccard distance on (main, backup) pairs plus relative Ishc distance on shared pairs"""
+    union = sig_a['pair_set'] | sig_b['pair_set']
+    if not union:
+        return 0.0
+    jaccard = len(sig_a['pair_set'] & sig_b['pair_set']) / len(union)
+
+    shared = sig_a['ishc'].keys() & sig_b['ishc'].keys()
+    if shared:
+        total = 0.0
+        for key in shared:
+            (am, ab), (bm, bb) = sig_a['ishc'][key], sig_b['ishc'][key]
+            total += abs(am - bm) / max(am, bm) + abs(ab - bb) / max(ab, bb)
+        ishc_distance = total / (2 * len(shared))
+    else:
+        ishc_distance = 1.0
+
+    return (1.0 - jaccard) + ishc_weight * ishc_distance
+
+def build_similarity_index(scenario_map: Dict[str, Dict]) -> Dict[str, List[Tuple[str, float]]]:
+    """Neighbours of every scenario sorted by increasing distance"""
+    sids = list(scenario_map.keys())
+    sigs = {sid: scenario_signature(scenario_map[sid]) for sid in sids}
+
+    distances = {sid: {} for sid in sids}
+    for i, a in enumerate(sids):
+        for b in sids[i + 1:]:
+            d = scenario_distance(sigs[a], sigs[b])
+            distances[a][b] = d
+            distances[b][a] = d
+
+    return {
+        sid: sorted(distances[sid].items(), key=lambda t: t[1])
+        for sid in sids
+    }
+
+def nearest_solved(scenario_id: str, index: Dict[str, List[Tuple[str, float]]], solved: Dict[str, Any],
+                   k: int = SEED_NEIGHBOURS, max_distance: float = SEED_MAX_DISTANCE) -> List[Tuple[str, float]]:
+    """Closest already-solved neighbours of a scenario"""
+    return [
+        (sid, d) for sid, d in index.get(scenario_id, [])
+        if sid in solved and d <= max_distance
+    ][:k]
+
+def cluster_order(scenario_map: Dict[str, Dict], index: Dict[str, List[Tuple[str, float]]],
+                  n_representatives: int = N_REPRESENTATIVES) -> List[str]:
+    """Solve representative scenarios first, then the rest nearest-first
+
+    Representatives are picked by farthest-first traversal starting from the
+    medoid; the remaining scenarios follow in increasing distance to the
+    closest scenario already placed in the order.
+    """
+    sids = list(scenario_map.keys())
+    if not sids:
+        return []
+    dist = {sid: dict(index[sid]) for sid in sids}
+
+    medoid = min(sids, key=lambda s: sum(dist[s].values()))
+    order = [medoid]
+    closest = {s: dist[medoid].get(s, 0.0) for s in sids if s != medoid}
+
+    while closest:
+        if len(order) < n_representatives:
+            nxt = max(closest, key=closest.get)
+        else:
+            nxt = min(closest, key=closest.get)
+        order.append(nxt)
+        del closest[nxt]
+        for s in closest:
+            closest[s] = min(closest[s], dist[nxt][s])
+
+    return order
+
+def neighbour_seeds(scenario_data: Dict, neighbour_states: List[Dict[str, Any]],
+                    per_neighbour: int = SEED_PER_NEIGHBOUR) -> List[List[float]]:
+    """Best individuals of solved neighbours remapped onto this scenario's relays and bounds"""
+    relays = [r for r in scenario_data["relays"] if str(r).strip()]
+    xmin, xmax = compute_bounds(relays, scenario_data["pairs"])
+
+    seeds = []
+    for state in neighbour_states:
+        remapped, _ = remap_population(state["population"][:per_neighbour], state["relays"], relays, xmin, xmax)
+        seeds.extend(remapped)
+    return seeds[:GA_Ni]
+
+def optimize_with_neighbour_reuse(paths: Dict) -> Dict[str, Any]:
+    """Optimize all scenarios in cluster order, seeding each from its nearest solved neighbours"""
+    indexes = {}
+
+    def order(scenario_map: Dict[str, Dict]) -> List[str]:
+        indexes['similarity'] = build_similarity_index(scenario_map)
+        return cluster_order(scenario_map, indexes['similarity'])
+
+    def seed(sid: str, data: Dict, ga_states: Dict[str, Dict]) -> Optional[List[List[float]]]:
+        neighbours = nearest_solved(sid, indexes['similarity'], ga_states)
+        if not neighbours:
+            return None
+        print(f"   🧬 Seeding from: {', '.join(f'{n} (d={d:.3f})' for n, d in neighbours)}")
+        return neighbour_seeds(data, [ga_states[n] for n in neighbours])
+
+    results = optimize_all_scenarios(paths, scenario_order=order, seed_population=seed)
+    results['similarity_index'] = {
+        sid: [{'scenario_id': n, 'distance': d} for n, d in neighbours[:SEED_NEIGHBOURS]]
+        for sid, neighbours in indexes['similarity'].items()
+    }
+    return results
+
+def main():
+    """Run the all-scenario optimization with cross-scenario solution reuse"""
+    paths = setup_paths()
+    results = optimize_with_neighbour_reuse(paths)
+    saved_files = save_optimization_results(results, paths)
+    print(f"📄 Files generated: {len(saved_files)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Adaptive setting-group clustering for all scenarios
+Partitions the scenarios into k relay setting groups (k-means style): each
+group gets one robust setting vector and every scenario is reassigned to the
+group that coordinates it best, evaluated as one batched kernel call
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, compute_bounds
+)
+from relay_kernels import stack_scenarios, scenario_tmt_batch
+from robust_optimization import robust_optimization
+from scenario_similarity import build_similarity_index, cluster_order
+
+N_SETTING_GROUPS = 4
+MAX_ASSIGNMENT_ITERATIONS = 5
+GROUP_GA_MAXGEN = 500        # GA budget per group re-optimization
+GROUP_GA_ITERNO = 250
+GROUP_OBJECTIVE = "max"
+
+def initial_assignment(scenario_map: Dict[str, Dict], scenario_ids: List[str], k: int) -> List[int]:
+    """Assign scenarios to the nearest of k farthest-first representatives (similarity index)"""
+    index = build_similarity_index({sid: scenario_map[sid] for sid in scenario_ids})
+    representatives = cluster_order({sid: scenario_map[sid] for sid in scenario_ids}, index, n_representatives=k)[:k]
+    assignment = []
+    for sid in scenario_ids:
+        if sid in representatives:
+            assignment.append(representatives.index(sid))
+            continue
+        dist = dict(index[sid])
+        assignment.append(min(range(len(representatives)), key=lambda g: dist[representatives[g]]))
+    return assignment
+
+def compute_setting_groups(scenario_map: Dict[str, Dict], scenario_ids: List[str], k: int = N_SETTING_GROUPS,
+                           objective: str = GROUP_OBJECTIVE,
+                           max_iterations: int = MAX_ASSIGNMENT_ITERATIONS) -> Dict[str, Any]:
+    """Alternate group re-optimization and scenario reassignment until the assignment is stable"""
+    k = max(1, min(k, len(scenario_ids)))
+    stacked = stack_scenarios(scenario_map, scenario_ids)
+    relays = stacked['relays']
+    bounds = compute_bounds(relays, stacked['pairs'])
+
+    assignment = np.array(initial_assignment(scenario_map, scenario_ids, k), dtype=np.intp)
+    settings: List[Optional[List[float]]] = [None] * k
+    populations: List[Optional[List[List[float]]]] = [None] * k
+    tmt_matrix = None
+
+    for iteration in range(1, max_iterations + 1):
+        print(f"\n🔁 Setting-group iteration {iteration}: group sizes {np.bincount(assignment, minlength=k).tolist()}")
+
+        # Re-optimize each group on its member scenarios, warm-started from its last population
+        for g in range(k):
+            members = [scenario_ids[s] for s in np.flatnonzero(assignment == g)]
+            if not members:
+                continue
+            print(f"   🎛️  Group {g}: {len(members)} scenarios")
+            result = robust_optimization(
+                scenario_map, members, objective,
+                initial_population=populations[g],
+                max_generations=GROUP_GA_MAXGEN, stall_generations=GROUP_GA_ITERNO,
+                relays=relays, bounds=bounds
+            )
+            populations[g] = result['population']
+            settings[g] = result['population'][0]
+
+        # Evaluate every scenario against every group in one batched call
+        active = [g for g in range(k) if settings[g] is not None]
+        tmt_matrix = np.full((k, len(scenario_ids)), np.inf)
+        tmt_matrix[active] = scenario_tmt_batch(np.array([settings[g] for g in active]), stacked)
+        new_assignment = tmt_matrix.argmin(axis=0)
+
+        # Re-seed empty groups with the worst-served scenario of a group that keeps at least one member
+        for g in range(k):
+            if not np.any(new_assignment == g):
+                sizes = np.bincount(new_assignment, minlength=k)
+                served = tmt_matrix[new_assignment, np.arange(len(scenario_ids))]
+                served[sizes[new_assignment] <= 1] = -np.inf
+                if np.isneginf(served.max()):
+                    continue
+                new_assignment[int(served.argmax())] = g
+
+        if np.array_equal(new_assignment, assignment):
+            print(f"   ✅ Assignment stable after {iteration} iterations")
+            break
+        assignment = new_assignment
+
+    nR = stacked['n_relays']
+    per_scenario = tmt_matrix[assignment, np.arange(len(scenario_ids))]
+    return {
+        'k': k,
+        'objective': objective,
+        'iterations': iteration,
+        'group_settings': {
+            str(g): {
+                relays[r]: {"TDS": round(settings[g][r], 5), "pickup": round(settings[g][nR + r], 5)}
+                for r in range(nR)
+            }
+            for g in range(k) if settings[g] is not None
+        },
+        'scenario_group': {sid: int(assignment[s]) for s, sid in enumerate(scenario_ids)},
+        'scenario_tmt': {sid: float(per_scenario[s]) for s, sid in enumerate(scenario_ids)},
+        'total_tmt': float(per_scenario.sum()),
+        'worst_tmt': float(per_scenario.max())
+    }
+
+def main(k: int = N_SETTING_GROUPS):
+    """Compute k adaptive setting groups for all valid scenarios of the input file"""
+    paths = setup_paths()
+    print(f"📂 Loading data from: {paths['input_file']}")
+    with open(paths['input_file'], "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    scenario_map = group_data_by_scenario(raw_data)
+    scenario_ids = [
+        sid for sid in sorted(scenario_map.keys(), key=lambda x: int(x.split('_')[1]) if x.split('_')[1].isdigit() else 999)
+        if validate_scenario_data(scenario_map[sid])[0]
+    ]
+
+    start_time = datetime.now()
+    result = compute_setting_groups(scenario_map, scenario_ids, k)
+    result['processing_time'] = (datetime.now() - start_time).total_seconds()
+    result['timestamp'] = datetime.now(timezone.utc).isoformat()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = paths['data_processed'] / f"ga_setting_groups_k{result['k']}_{timestamp}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(f"   ✅ {result['k']} setting groups – total TMT = {result['total_tmt']:.6f}, worst = {result['worst_tmt']:.6f}")
+    print(f"   📄 Setting groups: {output_file}")
+    return result
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Streaming ingestion of relay pair records
+Records are parsed incrementally from a JSON array or JSON Lines input,
+spilled to one on-disk partition per scenario and each scenario is dispatched
+to the optimizer as soon as it is complete, so peak memory is bounded by the
+largest scenario instead of the whole input file
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, IO, Iterator, List, Optional, Any, Tuple, Union
+
+from ga_optimization_fast import (
+    setup_paths, group_data_by_scenario, validate_scenario_data, run_genetic_algorithm
+)
+from pairs_io import open_text, pairs_format
+from results_store import open_store, record_run
+
+READ_CHUNK = 1 << 16        # Characters read per chunk while parsing
+MAX_OPEN_SPILLS = 32        # Spill partition files kept open at once
+
+def open_input(path: Path) -> IO[str]:
+    """Text stream of an input file (plain or compressed pair formats)"""
+    try:
+        pairs_format(path)
+        return open_text(path, "r")
+    except ValueError:
+        return open(path, "r", encoding="utf-8")
+
+def iter_json_array(f: IO[str], chunk_size: int = READ_CHUNK) -> Iterator[Dict[str, Any]]:
+    """Elements of a top-level JSON array, decoded one at a time from a text stream"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+    while True:
+        # Skip whitespace and separators between elements
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == "," or (buffer[pos] == "[" and not started)):
+            started = started or buffer[pos] == "["
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        if pos < len(buffer):
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number may be cut at the chunk boundary; only trust it when a separator follows
+                if (end < len(buffer) and buffer[end] in " \t\r\n,]") or eof:
+                    yield obj
+                    pos = end
+                    continue
+        if eof:
+            if buffer[pos:].strip():
+                raise ValueError("Unterminated JSON array in input")
+            return
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+def iter_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Pair records of a JSON array or JSON Lines file, parsed incrementally"""
+    with open_input(Path(path)) as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        if head == "[":
+            yield from iter_json_array(f)
+            return
+        line = head + f.readline()
+        while line:
+            if line.strip():
+                yield json.loads(line)
+            line = f.readline()
+
+class ScenarioSpill:
+    """One append-only JSON Lines spill partition per scenario in a temporary directory"""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(tempfile.mkdtemp(prefix="scenario_spill_", dir=directory))
+        self.counts: Dict[str, int] = {}
+        self._open: "OrderedDict[str, IO[str]]" = OrderedDict()
+
+    def _handle(self, sid: str) -> IO[str]:
+        """Open spill file of a scenario, closing the least recently used beyond MAX_OPEN_SPILLS"""
+        if sid in self._open:
+            self._open.move_to_end(sid)
+            return self._open[sid]
+        if len(self._open) >= MAX_OPEN_SPILLS:
+            _, oldest = self._open.popitem(last=False)
+            oldest.close()
+        handle = open(self.partition(sid), "a", encoding="utf-8")
+        self._open[sid] = handle
+        return handle
+
+    def partition(self, sid: str) -> Path:
+        """Spill file of a scenario"""
+        return self.directory / f"{str(sid).replace('/', '_')}.jsonl"
+
+    def add(self, record: Dict[str, Any]) -> int:
+        """Spill one record and return its scenario's record count"""
+        sid = record.get("scenario_id")
+        self._handle(sid).write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.counts[sid] = self.counts.get(sid, 0) + 1
+        return self.counts[sid]
+
+    def take(self, sid: str) -> List[Dict[str, Any]]:
+        """All spilled records of a scenario; its partition is removed"""
+        handle = self._open.pop(sid, None)
+        if handle is not None:
+            handle.close()
+        path = self.partition(sid)
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        path.unlink()
+        del self.counts[sid]
+        return records
+
+    def pending(self) -> List[str]:
+        """Scenarios spilled but not yet taken, in first-seen order"""
+        return list(self.counts)
+
+    def close(self) -> None:
+        """Close all handles and remove the spill directory"""
+        for handle in self._open.values():
+            handle.close()
+        self._open.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def stream_scenarios(path: Union[str, Path], expected_counts: Optional[Dict[str, int]] = None,
+                     sorted_input: bool = True, spill_dir: Optional[Path] = None,
+                     grouped: bool = True) -> Iterator[Tuple[str, Any]]:
+    """Yield (scenario_id, grouped scenario) as soon as each scenario is complete
+
+    A scenario is complete when it reaches its ``expected_counts`` entry, when
+    the input is ``sorted_input`` and a different scenario starts, or at the
+    end of the stream. Only the dispatched scenario is held in memory. With
+    ``grouped=False`` the scenario's raw records are yielded instead.
+
+    Inputs are expected grouped by scenario (as automation_results.json is);
+    records of an already dispatched scenario raise ValueError. Ungrouped
+    inputs need ``sorted_input=False`` and are then dispatched at the end of
+    the stream unless ``expected_counts`` is given.
+    """
+    spill = ScenarioSpill(spill_dir)
+    dispatched = set()
+    current = None
+
+    def dispatch(sid: str) -> Tuple[str, Any]:
+        dispatched.add(sid)
+        records = spill.take(sid)
+        return sid, group_data_by_scenario(records).get(sid, {}) if grouped else records
+
+    try:
+        for record in iter_records(path):
+            sid = record.get("scenario_id")
+            if not sid:
+                continue
+            if sid in dispatched:
+                raise ValueError(f"Records for {sid} arrived after the scenario was dispatched "
+                                 f"(input not grouped by scenario, use sorted_input=False)")
+            if sorted_input and current is not None and sid != current:
+                yield dispatch(current)
+            current = sid
+            count = spill.add(record)
+            if expected_counts and count >= expected_counts.get(sid, float("inf")):
+                yield dispatch(sid)
+                current = None
+        for sid in spill.pending():
+            yield dispatch(sid)
+    finally:
+        spill.close()
+
+def optimize_streaming(paths: Dict, input_file: Optional[Path] = None, sorted_input: bool = True,
+                       expected_counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Optimize scenarios as they are completed by the stream and record the run"""
+    input_file = Path(input_file or paths['input_file'])
+    print(f"📡 Streaming scenarios from: {input_file}")
+    results = {}
+    start_time = datetime.now()
+    for sid, data in stream_scenarios(input_file, expected_counts, sorted_input, paths['data_processed']):
+        if not data or not validate_scenario_data(data)[0]:
+            print(f"   ❌ Skipping scenario {sid}")
+            continue
+        print(f"🎯 {sid} ready ({len(data['pairs'])} pairs)")
+        state = run_genetic_algorithm(sid, data)
+        if state.get('relay_values'):
+            results[sid] = {
+                'scenario_id': sid,
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'relay_values': state['relay_values'],
+                'best_tmt': state['best_tmt'],
+                'generations': state['generations'],
+                'evaluations': state['evaluations'],
+                'seconds': state['elapsed']
+            }
+
+    conn = open_store(paths)
+    try:
+        run_id = record_run(conn, results, source="streaming_ingest", summary={
+            'input_file': str(input_file),
+            'successful_optimizations': len(results),
+            'processing_time': (datetime.now() - start_time).total_seconds()
+        })
+    finally:
+        conn.close()
+    print(f"   🗄️  Results database run: {run_id}")
+    return {'run_id': run_id, 'optimization_results': results}
+
+def main():
+    """Stream-optimize the scenarios of the input file ("--unsorted" for inputs not grouped by scenario)"""
+    return optimize_streaming(setup_paths(), sorted_input="--unsorted" not in sys.argv[1:])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Synthetic relay coordination scenarios in the automation_results.json schema
+Builds a radial or meshed network of lines with a directional relay at each
+line end, derives main/backup pairs from the topology and emits one record per
+pair and fault position, with fault currents drawn from a configurable
+distribution and a fixed seed so benchmarks are reproducible
+"""
+
+import json
+from typing import Dict, List, Tuple, Optional, Any
+
+import numpy as np
+
+from ga_optimization_fast import setup_paths, MIN_TDS, MAX_TDS
+from relay_curves import curve_time, DEFAULT_CURVE
+
+TOPOLOGIES = ("radial", "meshed")
+CURRENT_DISTRIBUTIONS = ("lognormal", "uniform")
+FAULT_POSITIONS = ("10", "90")   # Fault location along the line (% from the main relay)
+
+SYNTHETIC_SEED = 42
+MESH_RATIO = 0.2            # Extra lines as a fraction of the tree lines (meshed only)
+BACKUP_SHARE = (0.3, 0.95)  # Fraction of the main fault current seen by a backup relay
+PICKUP_RATIO = (0.05, 0.6)  # Initial pickup as a fraction of the relay's minimum fault current
+SCENARIO_SPREAD = 0.2       # Per-bus fault-current variation between scenarios (lognormal sigma)
+
+def build_topology(n_relays: int, topology: str, rng: np.random.Generator) -> List[Tuple[int, int]]:
+    """Lines (bus_a, bus_b) giving about n_relays relays (two per line)"""
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology '{topology}', expected one of {TOPOLOGIES}")
+    n_lines = max(n_relays // 2, 1)
+    n_tree = n_lines if topology == "radial" else max(int(round(n_lines / (1.0 + MESH_RATIO))), 1)
+
+    # Random tree: every new bus hangs off an earlier one
+    lines = [(int(rng.integers(0, b)), b) for b in range(1, n_tree + 1)]
+    existing = set(lines)
+    n_buses = n_tree + 1
+    while len(lines) < n_lines and n_buses > 2:
+        a, b = sorted(int(v) for v in rng.choice(n_buses, size=2, replace=False))
+        if (a, b) not in existing:
+            existing.add((a, b))
+            lines.append((a, b))
+    return lines
+
+def relay_pairs(lines: List[Tuple[int, int]], pairs_per_relay: int,
+                rng: np.random.Generator) -> List[Tuple[int, int]]:
+    """(main, backup) relay indices from the topology
+
+    Relay 2k sits at bus a of line k looking towards b, relay 2k+1 at bus b
+    looking towards a. The backups of a relay at bus x are the relays on the
+    other lines at x's neighbours that look towards x, capped at
+    ``pairs_per_relay`` per main relay.
+    """
+    looking_into = {}   # bus -> relays (at a neighbour) that look towards the bus
+    for k, (a, b) in enumerate(lines):
+        looking_into.setdefault(b, []).append((2 * k, k))
+        looking_into.setdefault(a, []).append((2 * k + 1, k))
+
+    pairs = []
+    for k, (a, b) in enumerate(lines):
+        for main, bus in ((2 * k, a), (2 * k + 1, b)):
+            backups = [r for r, line in looking_into.get(bus, []) if line != k]
+            if len(backups) > pairs_per_relay:
+                backups = list(rng.choice(backups, size=pairs_per_relay, replace=False))
+            pairs.extend((main, int(r)) for r in backups)
+    return pairs
+
+def fault_currents(n: int, distribution: str, params: Dict[str, float], rng: np.random.Generator) -> np.ndarray:
+    """Base fault currents (kA) for n relays"""
+    if distribution == "lognormal":
+        return rng.lognormal(params.get("mean", 0.0), params.get("sigma", 0.6), size=n)
+    if distribution == "uniform":
+        return rng.uniform(params.get("low", 0.2), params.get("high", 5.0), size=n)
+    raise ValueError(f"Unknown distribution '{distribution}', expected one of {CURRENT_DISTRIBUTIONS}")
+
+def relay_record(name: str, line: str, Ishc: float, pick_up: float, TDS: float) -> Dict[str, Any]:
+    """main_relay / backup_relay record with the operating time on the default curve"""
+    return {
+        "relay": name,
+        "line": line,
+        "pick_up": round(pick_up, 5),
+        "Ishc": round(Ishc, 2),
+        "TDS": round(TDS, 5),
+        "Time_out": round(curve_time(round(Ishc, 2), round(pick_up, 5), round(TDS, 5), DEFAULT_CURVE), 4)
+    }
+
+def generate_scenarios(n_scenarios: int = 10, n_relays: int = 74, topology: str = "meshed",
+                       pairs_per_relay: int = 2, distribution: str = "lognormal",
+                       distribution_params: Optional[Dict[str, float]] = None,
+                       seed: int = SYNTHETIC_SEED) -> List[Dict[str, Any]]:
+    """Records in the automation_results.json schema for n_scenarios operating conditions
+
+    All scenarios share the topology; each scales the fault current at every
+    bus by its own random factor and draws fresh initial relay settings.
+    """
+    rng = np.random.default_rng(seed)
+    lines = build_topology(n_relays, topology, rng)
+    pairs = relay_pairs(lines, pairs_per_relay, rng)
+    n_total = 2 * len(lines)
+    names = [f"R{i + 1}" for i in range(n_total)]
+    relay_bus = np.array([bus for a, b in lines for bus in (a, b)])   # Bus of relay 2k (a) and 2k+1 (b)
+    n_buses = int(relay_bus.max()) + 1
+    line_names = [f"L{a + 1}-{b + 1}" for a, b in lines]
+    base_current = fault_currents(n_total, distribution, distribution_params or {}, rng)
+    backup_share = rng.uniform(*BACKUP_SHARE, size=len(pairs))
+
+    records = []
+    for s in range(1, n_scenarios + 1):
+        scale = rng.lognormal(0.0, SCENARIO_SPREAD, size=n_buses)[relay_bus]
+        currents = {}
+        for p, (m, b) in enumerate(pairs):
+            for fault in FAULT_POSITIONS:
+                # Close-in faults (10%) see more current than remote ones (90%)
+                position = 1.0 - 0.5 * int(fault) / 100.0
+                Im = max(base_current[m] * scale[m] * position, 0.01)
+                currents[(p, fault)] = (Im, max(Im * backup_share[p], 0.01))
+
+        # Initial settings per relay, below its smallest fault current
+        min_current = np.full(n_total, np.inf)
+        for (p, _), (Im, Ib) in currents.items():
+            m, b = pairs[p]
+            min_current[m] = min(min_current[m], round(Im, 2))
+            min_current[b] = min(min_current[b], round(Ib, 2))
+        pick_up = np.where(np.isfinite(min_current), min_current, 1.0) * rng.uniform(*PICKUP_RATIO, size=n_total)
+        tds = rng.uniform(MIN_TDS, MAX_TDS, size=n_total)
+
+        for (p, fault), (Im, Ib) in currents.items():
+            m, b = pairs[p]
+            records.append({
+                "scenario_id": f"scenario_{s}",
+                "fault": fault,
+                "main_relay": relay_record(names[m], line_names[m // 2], Im, pick_up[m], tds[m]),
+                "backup_relay": relay_record(names[b], line_names[b // 2], Ib, pick_up[b], tds[b])
+            })
+    return records
+
+def main(n_scenarios: int = 10, n_relays: int = 74, topology: str = "meshed", pairs_per_relay: int = 2,
+         distribution: str = "lognormal", seed: int = SYNTHETIC_SEED):
+    """Write a synthetic scenario file next to the real input data"""
+    paths = setup_paths()
+    records = generate_scenarios(n_scenarios, n_relays, topology, pairs_per_relay, distribution, seed=seed)
+
+    output_file = paths['data_raw'] / f"synthetic_{topology}_{n_relays}r_{n_scenarios}s_seed{seed}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+
+    print(f"🧪 Generated {len(records)} records ({n_scenarios} scenarios, {topology}, ~{n_relays} relays)")
+    print(f"   📄 Synthetic scenarios: {output_file}")
+    return output_file
+
+if __name__ == "__main__":
+    main()
@@ -25,10 +25,12 @@ def test_data_files():
         print(f"❌ Datos originales no encontrados: {raw_data_path}")
         return False
     
-    # Verificar archivo de resultados GA
-    ga_files = list((project_root / "data" / "processed").glob("*ga_optimization_all_scenarios_comprehensive*.json"))
-    if ga_files:
-        latest_ga = max(ga_files, key=os.path.getctime)
+    # Verificar archivo de resultados GA (última ejecución del manifiesto)
+    sys.path.insert(0, str(project_root / "scripts"))
+    from run_manifest import resolve_artifact
+    latest_ga = resolve_artifact(project_root / "data" / "processed", 'comprehensive_results',
+                                 fallback_glob="*ga_optimization_all_scenarios_comprehensive*.json")
+    if latest_ga is not None and latest_ga.exists():
         print(f"✅ Resultados GA encontrados: {latest_ga}")
         with open(latest_ga, 'r') as f:
             ga_data = json.load(f)